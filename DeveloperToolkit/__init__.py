@@ -8,550 +8,2304 @@
     "location": "View 3D > Sidebar > Dev",
 }
 
-import bpy
-import os
-import sys
-import zipfile
-import tempfile
-import datetime
-import pathlib
-
-from bpy.props import (
-    StringProperty,
-    BoolProperty,
-    IntProperty,
-    PointerProperty,
-    CollectionProperty,
-)
-from bpy.types import Operator, Panel, PropertyGroup, UIList
-
-
-# ------------------------- УТИЛИТЫ -------------------------
-
-def force_full_ui_refresh():
-    """Принудительно обновить интерфейс Blender (все области/регионы)."""
-    wm = bpy.context.window_manager
-    if not wm:
-        return
-    for window in wm.windows:
-        screen = window.screen
-        if not screen:
-            continue
-        for area in screen.areas:
-            if area.type in {'VIEW_3D', 'PROPERTIES', 'OUTLINER', 'TEXT_EDITOR'}:
-                area.tag_redraw()
-            for region in area.regions:
-                region.tag_redraw()
-
-
-def get_addon_item(context, index):
-    """Вернуть элемент списка аддонов по индексу или None."""
-    addons = context.scene.dev_toolkit_addons
-    if 0 <= index < len(addons):
-        return addons[index]
-    return None
-
-
-def validate_addon_path(path: str) -> tuple[bool, str]:
-    """Проверить, что путь существует и содержит __init__.py."""
-    if not path:
-        return False, "Путь к исходникам не задан."
-    if not os.path.exists(path):
-        return False, f"Путь не существует: {path}"
-    init_file = os.path.join(path, "__init__.py")
-    if not os.path.exists(init_file):
-        return False, f"Файл __init__.py не найден в {path}"
-    return True, ""
-
-
-class AddonValidator:
-    """Валидатор и фабрика элементов списка аддонов."""
-
-    @staticmethod
-    def validate_addon_data(addon_module: str, addon_path: str, context) -> tuple[bool, str]:
-        """Проверка корректности данных перед добавлением в список."""
-        if not addon_module:
-            return False, "Введите имя модуля аддона."
-        ok, err = validate_addon_path(addon_path)
-        if not ok:
-            return False, err
-        # Проверка на дубликат имени
-        for item in context.scene.dev_toolkit_addons:
-            if item.name == addon_module:
-                return False, f"Аддон {addon_module} уже в списке."
-        return True, ""
-
-    @staticmethod
-    def create_addon_item(context, addon_module: str, addon_path: str):
-        """Создать новый элемент списка аддонов."""
-        item = context.scene.dev_toolkit_addons.add()
-        item.name = addon_module
-        item.path = addon_path
-        item.is_enabled = addon_module in context.preferences.addons
-        item.auto_reload = True
-        item.last_reload = "Еще не перезагружался"
-        force_full_ui_refresh()
-        return item
-
-
-# ------------------------- ДАННЫЕ -------------------------
-
-class AddonDevToolkitSettings(PropertyGroup):
-    """Настройки Developer Toolkit."""
-    autosave_on_reload: BoolProperty(
-        name="Автосохранение",
-        description="Автоматически сохранять файл перед перезагрузкой аддона",
-        default=True,
-    )
-    clear_console: BoolProperty(
-        name="Очистка консоли",
-        description="Очищать консоль Python перед перезагрузкой",
-        default=True,
+try:
+    import bpy
+except ImportError:
+    # Без Blender (процессы пула workers, python -m DeveloperToolkit build) доступны только модули движка
+    bpy = None
+
+if bpy is not None:
+    import addon_utils
+    import os
+    import sys
+    import zipfile
+    import datetime
+    import queue
+    import time
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    from bpy.app.handlers import persistent
+    from bpy.props import (
+        StringProperty,
+        BoolProperty,
+        FloatProperty,
+        IntProperty,
+        EnumProperty,
+        PointerProperty,
+        CollectionProperty,
     )
+    from bpy.types import AddonPreferences, Operator, Panel, PropertyGroup, UIList
 
+    from . import (addon_graph, addon_index, broadcast, bytecode, discovery, hot_reload, leaks, linking, packaging,
+                   profiler, rollback, testing, timing, walker, watcher, workers, workspace)
 
-class AddonItem(PropertyGroup):
-    """Элемент списка аддонов."""
-    name: StringProperty(
-        name="Имя аддона",
-        description="Имя модуля аддона (используется для включения/отключения)",
-        default="",
-    )
-    path: StringProperty(
-        name="Путь к исходникам",
-        description="Полный путь к директории с исходниками аддона",
-        default="",
-        subtype='DIR_PATH',
-    )
-    is_enabled: BoolProperty(
-        name="Активен",
-        description="Аддон активен в Blender",
-        default=False,
-    )
-    auto_reload: BoolProperty(
-        name="Автообновление",
-        description="Включить аддон в массовое обновление",
-        default=True,
-    )
-    last_reload: StringProperty(
-        name="Последняя перезагрузка",
-        description="Время последней перезагрузки аддона",
-        default="",
-    )
 
+    # ------------------------- УТИЛИТЫ -------------------------
 
-# ------------------------- ОПЕРАТОРЫ -------------------------
+    REDRAW_SIDEBAR = 'SIDEBAR'
+    REDRAW_PREFERENCES = 'PREFERENCES'
 
-class DEV_OT_AddAddon(Operator):
-    """Добавить аддон в список для разработки."""
-    bl_idname = "dev.add_addon"
-    bl_label = "Добавить аддон"
-    bl_options = {'REGISTER', 'UNDO'}
-    filepath: StringProperty(
-        name="Файл аддона",
-        description="Выберите __init__.py или папку аддона",
-        default="",
-        subtype='FILE_PATH',
-    )
-    directory: StringProperty(name="Директория", subtype='DIR_PATH')
-    filter_folder: BoolProperty(default=True, options={'HIDDEN'})
-    filter_glob: StringProperty(default="__init__.py;*.py", options={'HIDDEN'})
-
-    def invoke(self, context, event):
-        # Открываем стандартный файловый браузер без промежуточных окон
-        context.window_manager.fileselect_add(self)
-        return {'RUNNING_MODAL'}
-
-    def execute(self, context):
-        # Если пользователь отменил выбор
-        chosen = os.path.normpath(self.filepath or self.directory or "")
-        if not chosen:
-            self.report({'WARNING'}, "Файл не выбран")
-            return {'CANCELLED'}
+    _pending_redraw: set[str] = set()
 
-        # Получаем директорию аддона и его имя
-        addon_dir = chosen if os.path.isdir(chosen) else os.path.dirname(chosen)
-        addon_dir = os.path.normpath(addon_dir)
-        if not os.path.exists(addon_dir):
-            self.report({'ERROR'}, f"Путь не существует: {addon_dir}")
-            return {'CANCELLED'}
-        addon_name = os.path.basename(addon_dir)
 
-        # Здесь при желании можно добавить строгую проверку на __init__.py
-        # init_path = os.path.join(addon_dir, "__init__.py")
-        # if not os.path.exists(init_path): ...
+    def request_redraw(*targets: str):
+        """Запросить перерисовку областей, показывающих состояние тулкита.
 
-        # Проверка на дубликат
-        for item in context.scene.dev_toolkit_addons:
-            if item.name == addon_name:
-                self.report({'ERROR'}, f"Аддон {addon_name} уже в списке.")
-                return {'CANCELLED'}
+        Запросы копятся и выполняются одной отложенной перерисовкой на следующем
+        тике цикла событий. targets — REDRAW_SIDEBAR (вкладка Dev в 3D-виде) и/или
+        REDRAW_PREFERENCES (список аддонов в настройках); по умолчанию только
+        боковая панель.
+        """
+        _pending_redraw.update(targets or (REDRAW_SIDEBAR,))
+        if not bpy.app.timers.is_registered(_flush_redraw):
+            bpy.app.timers.register(_flush_redraw, first_interval=0.0)
+
+
+    def _flush_redraw():
+        """Перерисовать только отмеченные регионы (вызывается таймером один раз)."""
+        targets = set(_pending_redraw)
+        _pending_redraw.clear()
+        wm = bpy.context.window_manager
+        if not wm:
+            return None
+        for window in wm.windows:
+            screen = window.screen
+            if not screen:
+                continue
+            for area in screen.areas:
+                if area.type == 'VIEW_3D' and REDRAW_SIDEBAR in targets:
+                    for region in area.regions:
+                        if region.type == 'UI':
+                            region.tag_redraw()
+                elif area.type == 'PREFERENCES' and REDRAW_PREFERENCES in targets:
+                    area.tag_redraw()
+        return None
+
+
+    def get_user_addons_dir() -> str:
+        """Каталог пользовательских аддонов Blender."""
+        return bpy.utils.user_resource('SCRIPTS', path="addons", create=True)
 
-        AddonValidator.create_addon_item(context, addon_name, addon_dir)
-        force_full_ui_refresh()
-        self.report({'INFO'}, f"Аддон {addon_name} добавлен в список")
-        return {'FINISHED'}
 
+    def get_profiles_dir() -> str:
+        """Каталог для отчётов профилировщика."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "profiles"), create=True)
 
-class DEV_OT_RemoveAddon(Operator):
-    """Удалить аддон из списка."""
-    bl_idname = "dev.remove_addon"
-    bl_label = "Удалить из списка"
-    bl_options = {'REGISTER', 'UNDO'}
 
-    addon_index: IntProperty()
+    def get_workspace_dir() -> str:
+        """Каталог постоянного хранилища рабочего пространства."""
+        return bpy.utils.user_resource('CONFIG', path="dev_toolkit", create=True)
 
-    def execute(self, context):
+
+    def get_bytecode_dir() -> str:
+        """Каталог кэша байткода аддонов."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "bytecode"), create=True)
+
+
+    def get_package_cache_dir() -> str:
+        """Каталог сжатых записей кэша упаковки."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "package_cache"), create=True)
+
+
+    def get_peers_dir() -> str:
+        """Реестр запущенных Blender со службой рассылки."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "peers"), create=True)
+
+
+    def get_shared_dir() -> str:
+        """Общий каталог архивов, которые инициатор рассылки отдаёт другим Blender."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "shared"), create=True)
+
+
+    def get_last_good_dir() -> str:
+        """Каталог, куда откладывается последняя рабочая версия аддона на время переустановки."""
+        return bpy.utils.user_resource('CONFIG', path=os.path.join("dev_toolkit", "last_good"), create=True)
+
+
+    def _addon_versions(context) -> dict:
+        """Версии отслеживаемых аддонов из bl_info загруженных модулей."""
+        versions = {}
+        for item in context.scene.dev_toolkit_addons:
+            mod = sys.modules.get(item.name)
+            info = getattr(mod, "bl_info", None) or {}
+            if "version" in info:
+                versions[item.name] = tuple(info["version"])
+        return versions
+
+
+    def get_addon_item(context, index):
+        """Вернуть элемент списка аддонов по индексу или None."""
         addons = context.scene.dev_toolkit_addons
-        if 0 <= self.addon_index < len(addons):
-            addon_name = addons[self.addon_index].name
-            addons.remove(self.addon_index)
-            self.report({'INFO'}, f"Аддон {addon_name} удален из списка")
-            force_full_ui_refresh()
-            return {'FINISHED'}
-        self.report({'ERROR'}, "Неверный индекс аддона")
-        return {'CANCELLED'}
+        if 0 <= index < len(addons):
+            return addons[index]
+        return None
 
 
-class DEV_OT_ReloadAddon(Operator):
-    """Перезагрузить аддон из исходников."""
-    bl_idname = "dev.reload_addon"
-    bl_label = "Перезагрузить аддон"
-    bl_options = {'REGISTER', 'UNDO'}
+    # сцена (as_pointer) -> индекс её списка аддонов
+    _addon_indexes: dict[int, addon_index.AddonIndex] = {}
 
-    addon_index: IntProperty()
-    skip_unregister: BoolProperty(
-        default=False,
-        description="Пропустить отключение аддона (полезно при ошибках)",
-    )
 
-    # ---- вспомогательные методы ----
+    def get_addon_index(scene) -> addon_index.AddonIndex:
+        """Индекс списка аддонов сцены; перестраивается, если устарел."""
+        index = _addon_indexes.setdefault(scene.as_pointer(), addon_index.AddonIndex())
+        addons = scene.dev_toolkit_addons
+        if not index.valid or len(index) != len(addons):
+            index.rebuild((item.name, item.path) for item in addons)
+        return index
 
-    def create_zip(self, source_dir: str, addon_name: str, zip_path: str) -> bool:
-        """Создать ZIP-архив из директории с исходниками."""
-        src = pathlib.Path(source_dir)
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-            for p in src.rglob("*"):
-                if p.is_dir():
-                    continue
-                if "__pycache__" in p.parts or ".git" in p.parts:
+
+    def invalidate_addon_index(*_args):
+        """Сбросить индексы всех сцен (после правки имени/пути, удаления, отмены)."""
+        for index in _addon_indexes.values():
+            index.invalidate()
+
+
+    def find_addon_position(context, name: str = "", path: str = "") -> int | None:
+        """Позиция аддона в списке по имени или пути, без перебора списка."""
+        index = get_addon_index(context.scene)
+        position = index.find_name(name) if name else index.find_path(path)
+        addons = context.scene.dev_toolkit_addons
+        if position is not None and name and addons[position].name != name:
+            # Коллекцию изменили в обход индекса — перестраиваем и ищем ещё раз
+            index.invalidate()
+            position = get_addon_index(context.scene).find_name(name)
+        return position
+
+
+    def find_addon_item(context, name: str):
+        """Вернуть элемент списка аддонов по имени или None."""
+        position = find_addon_position(context, name)
+        return None if position is None else context.scene.dev_toolkit_addons[position]
+
+
+    def validate_addon_path(path: str) -> tuple[bool, str]:
+        """Проверить, что путь существует и содержит __init__.py."""
+        if not path:
+            return False, "Путь к исходникам не задан."
+        if not os.path.exists(path):
+            return False, f"Путь не существует: {path}"
+        init_file = os.path.join(path, "__init__.py")
+        if not os.path.exists(init_file):
+            return False, f"Файл __init__.py не найден в {path}"
+        return True, ""
+
+
+    class AddonValidator:
+        """Валидатор и фабрика элементов списка аддонов."""
+
+        @staticmethod
+        def validate_addon_data(addon_module: str, addon_path: str, context) -> tuple[bool, str]:
+            """Проверка корректности данных перед добавлением в список."""
+            if not addon_module:
+                return False, "Введите имя модуля аддона."
+            ok, err = validate_addon_path(addon_path)
+            if not ok:
+                return False, err
+            # Проверка на дубликат имени
+            if find_addon_position(context, addon_module) is not None:
+                return False, f"Аддон {addon_module} уже в списке."
+            return True, ""
+
+        @staticmethod
+        def create_addon_item(context, addon_module: str, addon_path: str):
+            """Создать новый элемент списка аддонов."""
+            index = get_addon_index(context.scene)
+            item = context.scene.dev_toolkit_addons.add()
+            item.name = addon_module
+            item.path = addon_path
+            item.is_enabled = addon_module in context.preferences.addons
+            item.auto_reload = True
+            item.last_reload = "Еще не перезагружался"
+            index.append(addon_module, addon_path)
+            request_workspace_save()
+            request_redraw(REDRAW_SIDEBAR)
+            return item
+
+
+    # ------------------------- ПЕРЕЗАГРУЗКА -------------------------
+
+    BATCH_TRACE_NAME = "(пакет)"
+
+
+    class StagedAddon:
+        """Аддон, подготовленный к перезагрузке без обращения к bpy.
+
+        Конструктор (главный поток) копирует из элемента списка и настроек всё,
+        что нужно дальше; build() можно вызывать в фоновом потоке — он снимает
+        отпечатки, проверяет синтаксис и собирает архив.
+        """
+
+        def __init__(self, addon_item, settings, bytecode_cache=None,
+                     memory_cap: int = packaging.DEFAULT_MEMORY_CAP):
+            self.name = addon_item.name
+            self.source_dir = addon_item.path
+            self.patterns = walker.split_patterns(addon_item.ignore_patterns)
+            self.valid, self.invalid_reason = validate_addon_path(self.source_dir)
+            self.previous = hot_reload.get_state(self.name)
+            self.compile_check = settings.compile_check
+            # Архив собирается заранее, только если аддон точно пойдёт через ZIP
+            self.ship_archive = addon_item.install_mode == 'ZIP' and not settings.selective_reload
+            self.level = settings.compression_level
+            self.bytecode_cache = bytecode_cache
+            self.memory_cap = memory_cap
+            self.run_tests = settings.run_tests
+            self.fingerprints = None
+            self.errors: list[str] = []
+            self.archive = None
+            self.tests = None
+            self.failure = None
+
+        def build(self, timer):
+            """Отпечатки, проверка синтаксиса изменившихся файлов, архив и выбор тестов;
+            ошибки — в failure."""
+            if not self.valid:
+                return
+            try:
+                with timer.phase("fingerprint"):
+                    self.fingerprints = hot_reload.fingerprint_tree(self.source_dir, self.patterns)
+                if self.compile_check:
+                    with timer.phase("compile_check"):
+                        self.errors = rollback.compile_check(self.source_dir, rollback.changed_sources(
+                            self.fingerprints, self.previous))
+                if self.ship_archive and not self.errors:
+                    with timer.phase("create_zip"):
+                        self.archive = AddonReloader.pack_archive(
+                            self.source_dir, self.name, self.level, self.patterns,
+                            self.bytecode_cache, self.memory_cap)
+            except Exception as e:
+                self.failure = e
+                return
+            if self.run_tests and not self.errors:
+                with timer.phase("plan_tests"):
+                    self.tests = self.plan_tests()
+
+        def changed_files(self) -> list[str] | None:
+            """Файлы, изменившиеся с прошлой успешной загрузки; None, если её не было."""
+            if self.previous is None:
+                return None
+            return sorted(rel for rel in self.fingerprints.keys() | self.previous.keys()
+                          if self.fingerprints.get(rel) != self.previous.get(rel))
+
+        def plan_tests(self):
+            try:
+                return testing.plan_tests(self.name, self.source_dir, self.changed_files(),
+                                          self.patterns, self.fingerprints)
+            except Exception:
+                # Тесты не должны мешать перезагрузке: без плана просто не запускаем
+                return None
+
+        def discard(self):
+            if self.archive is not None:
+                self.archive.discard()
+                self.archive = None
+
+
+    class AddonReloader:
+        """Перезагрузка аддонов одной транзакцией.
+
+        Общие побочные эффекты — автосохранение (только если файл изменён),
+        очистка консоли и обновление интерфейса — выполняются один раз на
+        транзакцию, сколько бы аддонов в ней ни было. Результаты по аддонам
+        собираются в общий отчёт.
+        """
+
+        def __init__(self, context, skip_unregister: bool = False):
+            self.context = context
+            self.settings = context.scene.dev_toolkit_settings
+            self.skip_unregister = skip_unregister
+            self.messages: list[tuple[str, str]] = []
+            self.results: list[tuple[str, bool, str]] = []
+            self.records: list[timing.ReloadRecord] = []
+            # Каталог общих архивов, если перезагрузку потом разошлют другим Blender
+            self.share_dir = None
+            self.shared: dict[str, str] = {}
+            # Отпечатки прошлых сессий нужны уже при планировании (has_changed, plan_reload)
+            get_store()
+
+        # ---- транзакция ----
+
+        def prepare(self, timer):
+            """Автосохранение и очистка консоли перед перезагрузкой."""
+            context = self.context
+            if self.settings.autosave_on_reload and bpy.data.filepath and bpy.data.is_dirty:
+                with timer.phase("autosave"):
+                    bpy.ops.wm.save_mainfile()
+            if self.settings.clear_console:
+                with timer.phase("clear_console"):
+                    try:
+                        bpy.ops.console.clear({'window': context.window,
+                                               'screen': context.window.screen,
+                                               'area': next(a for a in context.window.screen.areas if a.type == 'CONSOLE'),
+                                               'region': next(r for r in next(a for a in context.window.screen.areas if a.type == 'CONSOLE').regions if r.type == 'WINDOW')})
+                    except Exception:
+                        pass
+
+        def finish(self):
+            """Завершить транзакцию: сохранить результаты в хранилище и один раз
+            запросить перерисовку."""
+            store = get_store()
+            if store is not None:
+                try:
+                    for addon_name in dict.fromkeys(name for name, _, _ in self.results):
+                        store.save_manifest(addon_name, hot_reload.get_state(addon_name))
+                    store.add_records(self.records)
+                except Exception as e:
+                    self.messages.append(('WARNING', f"Не удалось сохранить рабочее пространство: {e}"))
+            if leaks.tracker.active:
+                self.check_leaks()
+            if any(ok for _, ok, _ in self.results):
+                request_workspace_save()
+                request_redraw(REDRAW_SIDEBAR, REDRAW_PREFERENCES)
+
+        def check_leaks(self):
+            """Диагностика: что осталось в памяти от выгруженных версий аддонов."""
+            known = {id(sys.modules): "sys.modules"}
+            for name in dir(bpy.app.handlers):
+                handlers = getattr(bpy.app.handlers, name)
+                if isinstance(handlers, list):
+                    known[id(handlers)] = f"bpy.app.handlers.{name}"
+            for addon_name in dict.fromkeys(name for name, _, _ in self.results):
+                report = leaks.tracker.check(addon_name, known)
+                if report is not None and report.alive:
+                    self.messages.append(('WARNING', f"Аддон {addon_name}: от прошлых версий в памяти осталось "
+                                                     f"объектов: {report.alive} (подробности на панели)"))
+
+        def _record(self, record: timing.ReloadRecord):
+            timing.history.add(record)
+            self.records.append(record)
+
+        def needs_reload(self, addon_item) -> bool:
+            """Нужно ли перезагружать аддон: не включён или исходники изменились."""
+            if addon_item.name not in self.context.preferences.addons:
+                return True
+            patterns = walker.split_patterns(addon_item.ignore_patterns)
+            return hot_reload.has_changed(addon_item.name, addon_item.path, patterns)
+
+        def plan_batch(self, addon_items, only_changed: bool = False) -> list:
+            """Порядок перезагрузки пакета с учётом зависимостей между аддонами.
+
+            Граф строится по всем отслеживаемым аддонам. При only_changed из
+            addon_items берутся только изменившиеся, к ним добавляются зависящие от
+            них аддоны (отмеченные или уже включённые). Зависимости всегда идут
+            раньше зависимых.
+            """
+            by_name = {item.name: item for item in self.context.scene.dev_toolkit_addons}
+            by_name.update((item.name, item) for item in addon_items)
+            return [by_name[name] for name in self.order_batch(*self.batch_inputs(addon_items), only_changed)]
+
+        def batch_inputs(self, addon_items) -> tuple[dict, list, set]:
+            """Данные для order_batch, прочитанные из bpy: (отслеживаемые, запрошенные, включённые)."""
+            tracked = {item.name: (item.path, walker.split_patterns(item.ignore_patterns))
+                       for item in self.context.scene.dev_toolkit_addons
+                       if validate_addon_path(item.path)[0]}
+            enabled = {name for name in tracked if name in self.context.preferences.addons}
+            return tracked, [item.name for item in addon_items], enabled
+
+        @staticmethod
+        def order_batch(tracked: dict, requested: list, enabled: set, only_changed: bool = False) -> list:
+            """Имена аддонов пакета в порядке перезагрузки (см. plan_batch); без bpy."""
+            graph = addon_graph.build_addon_graph(tracked)
+            names = list(dict.fromkeys(requested))
+            if only_changed:
+                changed = {name for name in names
+                           if name not in enabled or hot_reload.has_changed(name, *tracked[name])}
+                affected = addon_graph.downstream(graph, changed)
+                extra = [name for name in tracked
+                         if name in affected and name not in names and name in enabled]
+                names = [name for name in names if name in affected] + extra
+            return addon_graph.reload_order(graph, names)
+
+        def stage(self, addon_item) -> StagedAddon:
+            """Снимок аддона для подготовки без bpy (вызывается в главном потоке)."""
+            leaks.tracker.begin(addon_item.name)
+            ship = addon_item.install_mode == 'ZIP' and not self.settings.selective_reload
+            return StagedAddon(addon_item, self.settings,
+                               self.bytecode_cache(addon_item.name) if ship else None,
+                               self.memory_cap())
+
+        @staticmethod
+        def build_stages(stages: list, timers: dict):
+            """Подготовить аддоны пакета параллельно: обход, хэши, проверка синтаксиса, упаковка.
+
+            Подготовка не трогает bpy, поэтому независимые аддоны готовятся в
+            потоках; установка и включение затем идут в главном потоке по порядку.
+            """
+            if len(stages) < 2:
+                for staged in stages:
+                    staged.build(timers[staged.name])
+                return
+            with ThreadPoolExecutor(max_workers=min(len(stages), packaging.MAX_WORKERS)) as pool:
+                for staged in stages:
+                    pool.submit(staged.build, timers[staged.name])
+
+        def reload_batch(self, addon_items, only_changed: bool = False):
+            """Перезагрузить несколько аддонов одной транзакцией в порядке зависимостей."""
+            batch_timer = timing.ReloadTimer(BATCH_TRACE_NAME)
+            with batch_timer.phase("plan_batch"):
+                items = self.plan_batch(addon_items, only_changed)
+            if not items:
+                return
+            self.prepare(batch_timer)
+            timers = {item.name: timing.ReloadTimer(item.name) for item in items}
+            with batch_timer.phase("prepare_batch"):
+                stages = [self.stage(item) for item in items]
+                self.build_stages(stages, timers)
+            try:
+                for addon_item, staged in zip(items, stages):
+                    self.reload(addon_item, timers[addon_item.name], staged)
+            finally:
+                for staged in stages:
+                    staged.discard()
+            self._record(batch_timer.finish())
+            self.finish()
+
+        def summary(self) -> tuple[str, str]:
+            """Общий отчёт по транзакции: (уровень, сообщение)."""
+            if not self.results:
+                return 'INFO', "Изменённых аддонов нет"
+            reloaded = sum(1 for _, ok, _ in self.results if ok)
+            failed = [(name, message) for name, ok, message in self.results if not ok]
+            if not failed:
+                return 'INFO', f"Обновлено аддонов: {reloaded}"
+            details = "; ".join(f"{name}: {message}" for name, message in failed)
+            return 'ERROR', f"Обновлено аддонов: {reloaded}, с ошибками: {len(failed)} ({details})"
+
+        def _fail(self, addon_name: str, message: str) -> bool:
+            self.results.append((addon_name, False, message))
+            self.messages.append(('ERROR', message))
+            return False
+
+        # ---- один аддон ----
+
+        def reload(self, addon_item, timer=None, staged=None) -> bool:
+            """Перезагрузить один аддон; результат попадает в results и messages.
+
+            staged — заранее подготовленный аддон (см. stage и build_stages);
+            без него подготовка выполняется здесь же.
+            """
+            if timer is None:
+                timer = timing.ReloadTimer(addon_item.name)
+            if staged is None:
+                staged = self.stage(addon_item)
+                staged.build(timer)
+            try:
+                return self.apply(addon_item, staged, timer)
+            finally:
+                staged.discard()
+
+        def apply(self, addon_item, staged: StagedAddon, timer) -> bool:
+            """Перезагрузить подготовленный аддон: всё, что требует bpy (главный поток)."""
+            source_dir = staged.source_dir
+            addon_name = staged.name
+            patterns = staged.patterns
+
+            if not staged.valid:
+                return self._fail(addon_name, staged.invalid_reason)
+            if staged.failure is not None:
+                self._record(timer.finish(ok=False))
+                return self._fail(addon_name, f"Ошибка при подготовке аддона: {staged.failure}")
+            # Работающую версию не трогаем, пока изменившиеся файлы не компилируются
+            errors = staged.errors
+            if errors:
+                self._record(timer.finish(ok=False))
+                more = f" (и ещё {len(errors) - 1})" if len(errors) > 1 else ""
+                return self._fail(addon_name, f"Синтаксическая ошибка, аддон {addon_name} не тронут: "
+                                              f"{errors[0]}{more}")
+
+            if self.share_dir is not None and staged.archive is not None:
+                with timer.phase("share_archive"):
+                    self.share(addon_name, staged.archive)
+
+            reloaded_modules = None
+            try:
+                if self.settings.selective_reload:
+                    reloaded_modules = self.reload_selective(source_dir, addon_name, timer, patterns)
+                if reloaded_modules is None:
+                    if addon_item.install_mode == 'LINK':
+                        self.install_linked(source_dir, addon_name, timer)
+                    elif not self.install_zip(source_dir, addon_name, timer, patterns, staged.archive):
+                        self._record(timer.finish(ok=False))
+                        return self._fail(addon_name, "ZIP-архив не был создан")
+                    hot_reload.remember_state(addon_name, staged.fingerprints)
+                addon_item.is_enabled = True
+
+            except rollback.RolledBack as e:
+                # Работает предыдущая версия, её отпечатки остаются актуальными
+                self._record(timer.finish(ok=False))
+                addon_item.is_enabled = True
+                return self._fail(addon_name, f"Ошибка при перезагрузке аддона: {e.__cause__}. "
+                                              f"Восстановлена предыдущая версия")
+
+            except Exception as e:
+                self._record(timer.finish(ok=False))
+                hot_reload.forget_state(addon_name)
+                addon_item.is_enabled = False
+                return self._fail(addon_name, f"Ошибка при перезагрузке аддона: {e}")
+
+            self._record(timer.finish())
+            addon_item.last_reload = datetime.datetime.now().strftime("%H:%M:%S")
+            if reloaded_modules is not None:
+                message = f"Аддон {addon_name} перезагружен выборочно (модулей: {reloaded_modules})"
+            else:
+                message = f"Аддон {addon_name} перезагружен"
+            self.results.append((addon_name, True, message))
+            self.messages.append(('INFO', message))
+            if staged.tests is not None:
+                self.run_tests(staged.tests, source_dir)
+            return True
+
+        def run_tests(self, plan: testing.TestPlan, source_dir: str) -> testing.TestRun:
+            """Прогнать выбранные тесты аддона в этом процессе; итог — в messages."""
+            run = testing.run_tests(plan, source_dir)
+            if run.selected:
+                level = 'INFO' if run.ok else 'WARNING'
+                self.messages.append((level, f"Тесты {plan.addon_name}: прошло {run.count('passed')}, "
+                                             f"упало {run.count(*testing.FAILED)} "
+                                             f"(файлов {run.selected} из {run.total}, {run.duration * 1000:.0f} мс)"))
+            request_redraw(REDRAW_SIDEBAR)
+            return run
+
+        # ---- рассылка ----
+
+        def share(self, addon_name: str, archive):
+            """Положить архив аддона в общий каталог для других Blender."""
+            try:
+                self.shared[addon_name] = broadcast.share_archive(archive, self.share_dir, addon_name)
+            except OSError as e:
+                self.messages.append(('WARNING', f"Аддон {addon_name}: не удалось положить архив "
+                                                 f"в общий каталог: {e}"))
+
+        def broadcast_entries(self) -> list[dict]:
+            """Что разослать другим Blender: успешно перезагруженные аддоны и их общие архивы."""
+            entries = []
+            for addon_name in dict.fromkeys(name for name, ok, _ in self.results if ok):
+                addon_item = find_addon_item(self.context, addon_name)
+                if addon_item is None:
                     continue
-                if p.suffix in {".pyc", ".tmp"}:
+                entry = {"name": addon_name, "source": addon_item.path,
+                         "fingerprints": hot_reload.get_state(addon_name) or {}}
+                if addon_item.install_mode == 'ZIP':
+                    if addon_name not in self.shared:
+                        # Выборочная перезагрузка архив не собирает — собираем здесь, из тёплого кэша
+                        archive = self.pack_archive(addon_item.path, addon_name, self.settings.compression_level,
+                                                    walker.split_patterns(addon_item.ignore_patterns),
+                                                    self.bytecode_cache(addon_name), self.memory_cap())
+                        if archive is not None:
+                            self.share(addon_name, archive)
+                            archive.discard()
+                    if addon_name not in self.shared:
+                        continue
+                    entry["archive"] = self.shared[addon_name]
+                entries.append(entry)
+            return entries
+
+        def reload_shared(self, entry: dict) -> bool:
+            """Перезагрузить аддон по запросу другого Blender: из общего архива или по ссылке.
+
+            Ставятся только аддоны из списка этого Blender, и исходники берутся
+            по его собственному пути, а не по пути из запроса.
+            """
+            addon_name = str(entry.get("name", ""))
+            archive_path = entry.get("archive")
+            if not addon_name.isidentifier():
+                return self._fail(addon_name, f"Недопустимое имя аддона: {addon_name!r}")
+            addon_item = find_addon_item(self.context, addon_name)
+            if addon_item is None:
+                return self._fail(addon_name, f"Аддона {addon_name} нет в списке, установка отклонена")
+            source_dir = addon_item.path
+            if archive_path and not broadcast.is_shared(archive_path, get_shared_dir()):
+                return self._fail(addon_name, "Архив лежит вне общего каталога, установка отклонена")
+            if not archive_path:
+                ok, err = validate_addon_path(source_dir)
+                if not ok:
+                    return self._fail(addon_name, err)
+
+            timer = timing.ReloadTimer(addon_name)
+            leaks.tracker.begin(addon_name)
+            fingerprints = {rel: tuple(fp) for rel, fp in entry.get("fingerprints", {}).items()}
+            try:
+                if archive_path:
+                    # Общий архив принадлежит инициатору: после установки он остаётся на месте
+                    self.install_zip(source_dir, addon_name, timer,
+                                     archive=packaging.Archive(path=archive_path, owned=False))
+                else:
+                    self.install_linked(source_dir, addon_name, timer)
+                if fingerprints:
+                    hot_reload.remember_state(addon_name, fingerprints)
+                else:
+                    hot_reload.forget_state(addon_name)
+
+            except rollback.RolledBack as e:
+                self._record(timer.finish(ok=False))
+                return self._fail(addon_name, f"Ошибка при перезагрузке аддона: {e.__cause__}. "
+                                              f"Восстановлена предыдущая версия")
+
+            except Exception as e:
+                self._record(timer.finish(ok=False))
+                hot_reload.forget_state(addon_name)
+                addon_item.is_enabled = False
+                return self._fail(addon_name, f"Ошибка при перезагрузке аддона: {e}")
+
+            self._record(timer.finish())
+            addon_item.is_enabled = True
+            addon_item.last_reload = datetime.datetime.now().strftime("%H:%M:%S")
+            message = f"Аддон {addon_name} перезагружен по запросу другого Blender"
+            self.results.append((addon_name, True, message))
+            self.messages.append(('INFO', message))
+            return True
+
+        # ---- этапы ----
+
+        @staticmethod
+        def create_zip(source_dir: str, addon_name: str, zip_path: str,
+                       level: int = packaging.DEFAULT_LEVEL, patterns=(), bytecode_cache=None) -> bool:
+            """Создать ZIP-архив из директории с исходниками.
+
+            Сжатые записи берутся из кэша упаковки аддона, заново сжимаются только
+            изменившиеся файлы. Файлы отбираются с учётом .gitignore,
+            .devtoolkitignore и шаблонов аддона. С bytecode_cache рядом с модулями
+            кладутся готовые .pyc. Если архив не помещается в ZIP32, он собирается
+            штатным zipfile без кэшей.
+            """
+            cache = packaging.get_package_cache(addon_name)
+            cache.level = level
+            try:
+                packaging.build_archive(source_dir, addon_name, zip_path, cache, patterns, bytecode_cache)
+            except ValueError:
+                AddonReloader.write_zip64(source_dir, addon_name, zip_path, level, patterns)
+            return os.path.exists(zip_path)
+
+        @staticmethod
+        def pack_archive(source_dir: str, addon_name: str, level: int = packaging.DEFAULT_LEVEL,
+                         patterns=(), bytecode_cache=None,
+                         memory_cap: int = packaging.DEFAULT_MEMORY_CAP):
+            """Собрать архив аддона в памяти (сверх memory_cap — во временном файле).
+
+            Кэши те же, что у create_zip; архив сверх ZIP32 собирается штатным
+            zipfile во временный файл. Возвращает packaging.Archive или None.
+            """
+            cache = packaging.get_package_cache(addon_name)
+            cache.level = level
+            try:
+                return packaging.pack(source_dir, addon_name, cache, patterns, bytecode_cache, memory_cap)
+            except ValueError:
+                archive = packaging.Archive(path=packaging.temp_archive_path(addon_name))
+                try:
+                    AddonReloader.write_zip64(source_dir, addon_name, archive.path, level, patterns)
+                except Exception:
+                    archive.discard()
+                    return None
+                return archive
+
+        @staticmethod
+        def write_zip64(source_dir: str, addon_name: str, zip_path: str,
+                        level: int = packaging.DEFAULT_LEVEL, patterns=()):
+            """Собрать ZIP64 штатным zipfile, без кэшей (для архивов больше 4 ГБ)."""
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED,
+                                 allowZip64=True, compresslevel=level) as zf:
+                for path, rel, _ in walker.iter_source(source_dir, patterns):
+                    stored = level == 0 or os.path.splitext(rel)[1].lower() in packaging.INCOMPRESSIBLE_SUFFIXES
+                    zf.write(path, f"{addon_name}/{rel}",
+                             compress_type=zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED)
+
+        def memory_cap(self) -> int:
+            """Лимит размера архива в памяти в байтах (0 — всегда через временный файл)."""
+            return self.settings.memory_cap * 1024 * 1024
+
+        def bytecode_cache(self, addon_name: str):
+            """Кэш байткода аддона, если поставка .pyc включена и поддерживается."""
+            if not self.settings.ship_bytecode or not bytecode.is_supported():
+                return None
+            return bytecode.get_bytecode_cache(addon_name, get_bytecode_dir())
+
+        @staticmethod
+        def clean_addon_modules(addon_name: str):
+            """Удалить модули аддона из sys.modules, аккуратно вызвав unregister()."""
+            names = [n for n in list(sys.modules.keys())
+                     if n == addon_name or n.startswith(addon_name + ".")]
+
+            for n in names:
+                mod = sys.modules.get(n)
+                if not mod:
                     continue
-                rel = p.relative_to(src)
-                arc = os.path.join(addon_name, str(rel))
-                zf.write(str(p), arc)
-        return os.path.exists(zip_path)
-
-    def clean_addon_modules(self, addon_name: str):
-        """Удалить модули аддона из sys.modules, аккуратно вызвав unregister()."""
-        names = [n for n in list(sys.modules.keys())
-                 if n == addon_name or n.startswith(addon_name + ".")]
-
-        for n in names:
-            mod = sys.modules.get(n)
-            if not mod:
+                try:
+                    unregister = getattr(mod, "unregister", None)
+                    if callable(unregister):
+                        unregister()
+                except Exception:
+                    pass
+
+            if leaks.tracker.active:
+                leaks.tracker.track(addon_name, {n: sys.modules[n] for n in names if sys.modules.get(n)})
+            for n in names:
+                sys.modules.pop(n, None)
+
+        def disable_addon(self, addon_name: str, timer):
+            """Отключить аддон (если не просили пропустить) и вычистить его модули."""
+            if addon_name in self.context.preferences.addons:
+                if not self.skip_unregister:
+                    with timer.phase("addon_disable"):
+                        try:
+                            bpy.ops.preferences.addon_disable(module=addon_name)
+                        except Exception:
+                            pass
+            # Чистка модулей всегда
+            with timer.phase("clean_addon_modules"):
+                self.clean_addon_modules(addon_name)
+
+        def install_zip(self, source_dir: str, addon_name: str, timer, patterns=(), archive=None) -> bool:
+            """Перезагрузка через ZIP: упаковать (если архив не собран заранее),
+            распаковать в каталог аддонов и включить.
+
+            Архив собирается в памяти и распаковывается напрямую, без промежуточного
+            файла и без addon_install, который перечитывал бы его с диска.
+            """
+            if archive is None:
+                with timer.phase("create_zip"):
+                    archive = self.pack_archive(source_dir, addon_name,
+                                                self.settings.compression_level, patterns,
+                                                self.bytecode_cache(addon_name), self.memory_cap())
+                if archive is None:
+                    return False
+
+            try:
+                was_enabled = addon_name in self.context.preferences.addons
+                self.disable_addon(addon_name, timer)
+
+                addons_dir = get_user_addons_dir()
+                # Ссылку от связанной установки снимаем сразу: откладывать нечего, это сами исходники
+                linking.remove_link(addons_dir, addon_name)
+                aside = None
+                if was_enabled and self.settings.rollback_on_failure:
+                    with timer.phase("set_aside"):
+                        aside = rollback.set_aside(addons_dir, addon_name, get_last_good_dir())
+                try:
+                    with timer.phase("addon_install"):
+                        packaging.extract_archive(archive, addons_dir, addon_name)
+                        addon_utils.modules_refresh()
+                    self.enable_addon(addon_name, timer)
+                    if addon_name not in self.context.preferences.addons:
+                        raise RuntimeError(f"аддон {addon_name} не включился")
+                except Exception as e:
+                    if aside is None:
+                        raise
+                    self.restore_last_good(aside, addons_dir, addon_name, timer)
+                    raise rollback.RolledBack(addon_name) from e
+                rollback.discard(aside)
+            finally:
+                archive.discard()
+            return True
+
+        def restore_last_good(self, aside: str, addons_dir: str, addon_name: str, timer):
+            """Вернуть отложенную рабочую версию аддона и включить её."""
+            with timer.phase("rollback"):
+                if addon_name in self.context.preferences.addons:
+                    try:
+                        bpy.ops.preferences.addon_disable(module=addon_name)
+                    except Exception:
+                        pass
+                self.clean_addon_modules(addon_name)
+                rollback.restore(aside, addons_dir, addon_name)
+                bpy.ops.preferences.addon_enable(module=addon_name)
+
+        def install_linked(self, source_dir: str, addon_name: str, timer):
+            """Перезагрузка связанной установки: без архива, только перевключение."""
+            self.disable_addon(addon_name, timer)
+
+            addons_dir = get_user_addons_dir()
+            if not linking.is_linked(addons_dir, addon_name, source_dir):
+                with timer.phase("link"):
+                    linking.ensure_link(addons_dir, addon_name, source_dir)
+                    addon_utils.modules_refresh()
+            self.enable_addon(addon_name, timer)
+
+        def enable_addon(self, addon_name: str, timer):
+            """Включить аддон, при необходимости под профилировщиком."""
+            with timer.phase("addon_enable"):
+                if not self.settings.profile_reload:
+                    bpy.ops.preferences.addon_enable(module=addon_name)
+                    return
+                with profiler.profile(addon_name, bpy.utils) as report:
+                    bpy.ops.preferences.addon_enable(module=addon_name)
+            self.save_profile(report)
+
+        def save_profile(self, report):
+            """Сохранить отчёт профилировщика на диск для сравнения между запусками."""
+            try:
+                profiler.save_report(report, get_profiles_dir())
+            except OSError as e:
+                self.messages.append(('WARNING', f"Не удалось сохранить отчёт профилировщика: {e}"))
+
+        def reload_selective(self, source_dir: str, addon_name: str, timer, patterns=()):
+            """Выборочная перезагрузка изменившихся модулей.
+
+            Возвращает число перезагруженных модулей или None, если нужна
+            полная перезагрузка.
+            """
+            if addon_name not in self.context.preferences.addons:
+                return None
+            with timer.phase("plan_reload"):
+                plan = hot_reload.plan_reload(addon_name, source_dir, patterns)
+            if plan is None:
+                return None
+            report = None
+            try:
+                with timer.phase("selective_reload"):
+                    if self.settings.profile_reload:
+                        with profiler.profile(addon_name, bpy.utils) as report:
+                            hot_reload.apply_plan(plan, self.skip_unregister)
+                    else:
+                        hot_reload.apply_plan(plan, self.skip_unregister)
+            except Exception:
+                hot_reload.forget_state(addon_name)
+                return None
+            if report is not None:
+                self.save_profile(report)
+            return len(plan.modules)
+
+
+    # ------------------------- ФОНОВАЯ ПЕРЕЗАГРУЗКА -------------------------
+
+    MODAL_INTERVAL = 0.05
+
+    _reload_job = None
+
+
+    class ReloadJob:
+        """Перезагрузка пакета, не блокирующая интерфейс.
+
+        Планирование и подготовка аддонов (обход исходников, хэши, проверка
+        синтаксиса, сжатие, байткод) идут в пуле потоков. step() вызывается в
+        главном потоке и за один вызов перезагружает не больше одного готового
+        аддона, поэтому между вызовами интерфейс отвечает, а отмена срабатывает
+        между аддонами.
+        """
+
+        def __init__(self, reloader: AddonReloader, addon_items, only_changed: bool = False):
+            self.reloader = reloader
+            self.batch_timer = timing.ReloadTimer(BATCH_TRACE_NAME)
+            self.pool = ThreadPoolExecutor(max_workers=packaging.MAX_WORKERS)
+            self.stages: list[StagedAddon] = []
+            self.timers: dict[str, timing.ReloadTimer] = {}
+            self.futures = []
+            self.position = 0
+            self.cancelled = False
+            self.done = False
+            # Таймер событий модального оператора (None при ожидании на месте)
+            self.timer = None
+            self._plan = self.pool.submit(self._order, reloader.batch_inputs(addon_items), only_changed)
+
+        def _order(self, inputs, only_changed):
+            with self.batch_timer.phase("plan_batch"):
+                return AddonReloader.order_batch(*inputs, only_changed)
+
+        def progress(self) -> tuple[int, int, str]:
+            """(перезагружено, всего, текущий аддон); всего 0 — ещё идёт планирование."""
+            current = self.stages[self.position].name if self.position < len(self.stages) else ""
+            return self.position, len(self.stages), current
+
+        def skipped(self) -> list[str]:
+            return [staged.name for staged in self.stages[self.position:]]
+
+        def cancel(self):
+            """Не начинать следующие аддоны; начатый доводится до конца."""
+            self.cancelled = True
+
+        def abort(self):
+            """Прервать перезагрузку сразу, сохранив результаты уже перезагруженных аддонов."""
+            if not self.done:
+                self.cancelled = True
+                self._finish()
+
+        def step(self, context) -> bool:
+            """Продвинуть перезагрузку (главный поток); True, когда всё закончено."""
+            if self.done:
+                return True
+            # Контекст оператора живёт только на время вызова
+            self.reloader.context = context
+            self.reloader.settings = context.scene.dev_toolkit_settings
+            if self.cancelled:
+                self._finish()
+            elif self._plan is not None:
+                if self._plan.done():
+                    self._start(context)
+            elif self.position >= len(self.stages):
+                self._finish()
+            elif self.futures[self.position].done():
+                staged = self.stages[self.position]
+                self.position += 1
+                addon_item = find_addon_item(context, staged.name)
+                if addon_item is None:
+                    # Аддон убрали из списка, пока он готовился
+                    staged.discard()
+                else:
+                    self.reloader.reload(addon_item, self.timers[staged.name], staged)
+                if self.position >= len(self.stages):
+                    self._finish()
+            return self.done
+
+        def _start(self, context):
+            plan, self._plan = self._plan, None
+            try:
+                names = plan.result()
+            except Exception as e:
+                self.reloader.messages.append(('ERROR', f"Не удалось спланировать перезагрузку: {e}"))
+                names = []
+            items = [item for item in (find_addon_item(context, name) for name in names) if item is not None]
+            if not items:
+                self._finish()
+                return
+            self.reloader.prepare(self.batch_timer)
+            self.timers = {item.name: timing.ReloadTimer(item.name) for item in items}
+            self.stages = [self.reloader.stage(item) for item in items]
+            self.futures = [self.pool.submit(staged.build, self.timers[staged.name]) for staged in self.stages]
+
+        def _finish(self):
+            self.close()
+            if self.stages:
+                self.reloader._record(self.batch_timer.finish(ok=not self.cancelled))
+                self.reloader.finish()
+
+        def close(self):
+            """Остановить пул и освободить архивы аддонов, до которых не дошла очередь."""
+            self.done = True
+            for staged, future in zip(self.stages[self.position:], self.futures[self.position:]):
+                if not future.cancel():
+                    future.add_done_callback(lambda _future, staged=staged: staged.discard())
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+    def drop_reload_job(window_manager=None):
+        """Прервать фоновую перезагрузку, до которой не дойдёт finish оператора.
+
+        Так бывает, когда Blender отменил модальный оператор (загрузка файла,
+        закрытие окна) или step() упал с исключением. Без этого тулкит навсегда
+        считал бы перезагрузку идущей.
+        """
+        global _reload_job
+        job, _reload_job = _reload_job, None
+        if job is None:
+            return
+        if job.timer is not None:
+            (window_manager or bpy.context.window_manager).event_timer_remove(job.timer)
+            job.timer = None
+        job.abort()
+
+
+    # ------------------------- НАБЛЮДЕНИЕ -------------------------
+
+    WATCH_INTERVAL = 0.25
+    WATCH_TICK_BUDGET = 0.004
+
+    _watchers: dict[str, watcher.TreeWatcher] = {}
+    _watch_order: list[str] = []
+    # Фоновая перезагрузка, начатая наблюдателем; её продвигает сам таймер наблюдения
+    _watch_job = None
+
+
+    def _stop_watching():
+        """Забыть наблюдателей и прервать перезагрузку, начатую наблюдателем."""
+        global _watch_job
+        if _watch_job is not None and _watch_job is _reload_job:
+            drop_reload_job()
+        _watch_job = None
+        _watchers.clear()
+        _watch_order.clear()
+
+
+    def _step_watch_job() -> bool:
+        """Перезагрузить следующий готовый аддон наблюдателя; True, когда пакет закончен."""
+        global _reload_job, _watch_job
+        try:
+            finished = _watch_job.step(bpy.context)
+        except BaseException:
+            _watch_job = None
+            drop_reload_job()
+            raise
+        if finished:
+            _watch_job = _reload_job = None
+        request_redraw(REDRAW_SIDEBAR)
+        return finished
+
+
+    def _watch_tick():
+        """Тик наблюдателя: порция обхода исходников и перезагрузка изменившихся.
+
+        Созревшие аддоны перезагружаются через ReloadJob, как кнопкой
+        «Обновить»: подготовка идёт в потоках, а таймер перезагружает по одному
+        готовому аддону за тик, не подвешивая интерфейс на весь пакет.
+        """
+        global _reload_job, _watch_job
+        scene = getattr(bpy.context, "scene", None)
+        if scene is None or not scene.dev_toolkit_settings.watch_enabled:
+            _stop_watching()
+            return None
+
+        if _watch_job is not None and _watch_job is not _reload_job:
+            # Перезагрузку прервали снаружи (загружен другой файл)
+            _watch_job = None
+        if _reload_job is not None:
+            if _reload_job is not _watch_job:
+                # Идёт перезагрузка оператора: изменения подхватим после неё
+                return WATCH_INTERVAL
+            return WATCH_INTERVAL if _step_watch_job() else MODAL_INTERVAL
+
+        settings = scene.dev_toolkit_settings
+        tracked = {addon.name: (index, addon.path, tuple(walker.split_patterns(addon.ignore_patterns)))
+                   for index, addon in enumerate(scene.dev_toolkit_addons)
+                   if addon.auto_reload and addon.path}
+        for name in list(_watchers):
+            w = _watchers[name]
+            if name not in tracked or (w.source_dir, w.patterns) != tracked[name][1:]:
+                del _watchers[name]
+        for name, (_, path, patterns) in tracked.items():
+            if name not in _watchers:
+                _watchers[name] = watcher.TreeWatcher(path, patterns)
+        _watch_order[:] = [n for n in _watch_order if n in _watchers]
+        _watch_order.extend(n for n in _watchers if n not in _watch_order)
+
+        # Бюджет делится по кругу: тот, кто начал тик первым, в следующий раз будет последним
+        deadline = time.perf_counter() + WATCH_TICK_BUDGET
+        due = []
+        for name in list(_watch_order):
+            w = _watchers[name]
+            w.debounce = settings.watch_debounce
+            if w.poll(deadline):
+                due.append(scene.dev_toolkit_addons[tracked[name][0]])
+        if _watch_order:
+            _watch_order.append(_watch_order.pop(0))
+
+        # Все созревшие аддоны — одной транзакцией
+        if due:
+            _watch_job = _reload_job = ReloadJob(AddonReloader(bpy.context), due, only_changed=True)
+            request_redraw(REDRAW_SIDEBAR)
+            return MODAL_INTERVAL
+        return WATCH_INTERVAL
+
+
+    def sync_watch_timer(scene=None):
+        """Запустить или остановить таймер наблюдения по настройке сцены."""
+        scene = scene or getattr(bpy.context, "scene", None)
+        enabled = scene is not None and scene.dev_toolkit_settings.watch_enabled
+        registered = bpy.app.timers.is_registered(_watch_tick)
+        if enabled and not registered:
+            bpy.app.timers.register(_watch_tick, first_interval=WATCH_INTERVAL, persistent=True)
+        elif not enabled and registered:
+            bpy.app.timers.unregister(_watch_tick)
+            _stop_watching()
+
+
+    # ------------------------- РАССЫЛКА -------------------------
+
+    BROADCAST_INTERVAL = 0.2
+
+    _service: broadcast.BroadcastService | None = None
+    # Запросы других Blender: поток службы кладёт, таймер главного потока выполняет
+    _incoming: queue.SimpleQueue = queue.SimpleQueue()
+    _outgoing: Future | None = None
+    _service_error = ""
+    _broadcast_replies: list[tuple[str, bool, str]] = []
+
+
+    def _instance_label() -> str:
+        name = os.path.basename(bpy.data.filepath) if bpy.data.filepath else "без имени"
+        return f"{name} (PID {os.getpid()})"
+
+
+    def _queue_request(request: dict) -> Future:
+        """Передать запрос в главный поток (вызывается в потоке службы)."""
+        future = Future()
+        _incoming.put((request, future))
+        return future
+
+
+    def _serve_tick():
+        """Выполнить запросы других Blender, накопившиеся с прошлого тика."""
+        if _service is None:
+            return None
+        if _reload_job is not None:
+            return BROADCAST_INTERVAL
+        while True:
+            try:
+                request, future = _incoming.get_nowait()
+            except queue.Empty:
+                break
+            if not future.set_running_or_notify_cancel():
                 continue
             try:
-                unregister = getattr(mod, "unregister", None)
-                if callable(unregister):
-                    unregister()
+                future.set_result(handle_broadcast(request))
+            except Exception as e:
+                future.set_exception(e)
+        return BROADCAST_INTERVAL
+
+
+    def handle_broadcast(request: dict) -> dict:
+        """Перезагрузить аддоны по запросу другого Blender и собрать ответ с замерами."""
+        if request.get("type") != "reload":
+            return {"ok": False, "error": f"неизвестный запрос {request.get('type')!r}"}
+        # Без prepare(): чужой запрос не сохраняет .blend и не чистит консоль этого Blender
+        reloader = AddonReloader(bpy.context, bool(request.get("skip_unregister")))
+        for entry in request.get("addons", ()):
+            reloader.reload_shared(entry)
+        reloader.finish()
+        return {
+            "ok": all(ok for _, ok, _ in reloader.results),
+            "label": _instance_label(),
+            "results": [{"name": name, "ok": ok, "message": message} for name, ok, message in reloader.results],
+            "records": [{"addon": r.addon_name, "started": r.started, "total": r.total, "ok": r.ok,
+                         "phases": [(p.name, p.offset, p.duration) for p in r.phases]}
+                        for r in reloader.records],
+        }
+
+
+    def sync_broadcast_service():
+        """Запустить или остановить службу рассылки по настройкам аддона.
+
+        Служба одна на весь Blender, поэтому её включает настройка аддона, а не
+        сцены: открытие другого .blend её не останавливает.
+        """
+        global _service, _service_error
+        preferences = get_preferences()
+        enabled = preferences is not None and preferences.broadcast_service
+        if enabled and _service is None:
+            try:
+                service = broadcast.BroadcastService(get_peers_dir(), _queue_request, _instance_label())
+                service.start()
+            except OSError as e:
+                _service_error = str(e)
+                return
+            _service, _service_error = service, ""
+            bpy.app.timers.register(_serve_tick, first_interval=BROADCAST_INTERVAL, persistent=True)
+        elif not enabled and _service is not None:
+            stop_broadcast_service()
+
+
+    def stop_broadcast_service():
+        global _service
+        if _service is not None:
+            _service.stop()
+            _service = None
+        if bpy.app.timers.is_registered(_serve_tick):
+            bpy.app.timers.unregister(_serve_tick)
+        while True:
+            try:
+                _, future = _incoming.get_nowait()
+            except queue.Empty:
+                break
+            future.cancel()
+
+
+    def start_broadcast(peers, message: dict):
+        """Разослать запрос в фоне; ответы соберёт таймер _collect_broadcast."""
+        global _outgoing
+        _broadcast_replies.clear()
+        pool = ThreadPoolExecutor(max_workers=1)
+        _outgoing = pool.submit(broadcast.broadcast, peers, message)
+        pool.shutdown(wait=False)
+        if not bpy.app.timers.is_registered(_collect_broadcast):
+            # persistent: ответы должны дойти и после загрузки другого файла
+            bpy.app.timers.register(_collect_broadcast, first_interval=BROADCAST_INTERVAL, persistent=True)
+
+
+    def _collect_broadcast():
+        """Разобрать ответы других Blender: результаты — на панель, замеры — в историю."""
+        global _outgoing
+        if _outgoing is None:
+            return None
+        if not _outgoing.done():
+            return BROADCAST_INTERVAL
+        future, _outgoing = _outgoing, None
+        try:
+            replies = future.result()
+        except Exception as e:
+            _broadcast_replies.append(("рассылка", False, str(e)))
+            replies = []
+        for peer, reply in replies:
+            label = reply.get("label") or peer.label
+            if "error" in reply:
+                _broadcast_replies.append((label, False, reply["error"]))
+                continue
+            for result in reply.get("results", ()):
+                _broadcast_replies.append((label, bool(result.get("ok")), result.get("message", "")))
+            for data in reply.get("records", ()):
+                # Отдельная дорожка на каждый Blender: в экспорте видно, кто сколько ставил
+                timing.history.add(timing.ReloadRecord(
+                    f"{data['addon']} @ {label}", data["started"],
+                    [timing.PhaseTiming(*phase) for phase in data["phases"]],
+                    data["total"], bool(data["ok"]),
+                ))
+        request_redraw(REDRAW_SIDEBAR)
+        return None
+
+
+    # ------------------------- РАБОЧЕЕ ПРОСТРАНСТВО -------------------------
+
+    _store: workspace.WorkspaceStore | None = None
+    _store_opened = False
+    # Сцены (as_pointer), список которых уже объединён с хранилищем
+    _workspace_synced: set[int] = set()
+
+
+    def get_store() -> workspace.WorkspaceStore | None:
+        """Хранилище рабочего пространства; открывается при первом обращении.
+
+        При открытии в память подгружаются отпечатки исходников и история
+        замеров прошлых сессий.
+        """
+        global _store, _store_opened
+        if not _store_opened:
+            _store_opened = True
+            _store = workspace.open_store(get_workspace_dir())
+            if _store is not None:
+                try:
+                    hot_reload.restore_states(_store.load_manifests())
+                    for record in _store.load_history():
+                        timing.history.add(record)
+                except Exception:
+                    pass
+        return _store
+
+
+    def close_store():
+        global _store, _store_opened
+        if _store is not None:
+            _store.close()
+        _store = None
+        _store_opened = False
+        _workspace_synced.clear()
+
+
+    def _addon_row(item) -> dict:
+        return {name: getattr(item, name) for name in workspace.ADDON_FIELDS}
+
+
+    def sync_workspace(scene):
+        """Объединить список аддонов сцены с хранилищем и сохранить результат.
+
+        Аддоны из хранилища, которых нет в сцене (по имени и пути), добавляются
+        в конец списка; дальше хранилище повторяет список этой сцены.
+        """
+        store = get_store()
+        if store is None:
+            return
+        pointer = scene.as_pointer()
+        if pointer not in _workspace_synced:
+            _workspace_synced.add(pointer)
+            context = bpy.context
+            for row in store.load_addons():
+                if (find_addon_position(context, row["name"]) is not None
+                        or find_addon_position(context, path=row["path"]) is not None):
+                    continue
+                item = AddonValidator.create_addon_item(context, row["name"], row["path"])
+                for name in ("auto_reload", "ignore_patterns", "install_mode", "last_reload"):
+                    setattr(item, name, row[name])
+        store.save_addons([_addon_row(item) for item in scene.dev_toolkit_addons])
+
+
+    def _flush_workspace():
+        """Таймер: объединить/сохранить список аддонов текущей сцены."""
+        scene = getattr(bpy.context, "scene", None)
+        if scene is not None:
+            try:
+                sync_workspace(scene)
             except Exception:
                 pass
+        return None
+
+
+    def request_workspace_save(*_args):
+        """Отложенно сохранить список аддонов в хранилище (один раз на пачку правок)."""
+        if not bpy.app.timers.is_registered(_flush_workspace):
+            bpy.app.timers.register(_flush_workspace, first_interval=0.0)
+
+
+    def ensure_workspace(scene):
+        """Первое обращение к панели в сцене: подгрузить рабочее пространство.
+
+        Из draw() менять данные нельзя, поэтому загрузка идёт через таймер.
+        """
+        if scene.as_pointer() not in _workspace_synced:
+            request_workspace_save()
+
+
+    def sync_leak_diagnostics(scene=None):
+        """Включить или выключить диагностику утечек по настройке сцены."""
+        scene = scene or getattr(bpy.context, "scene", None)
+        enabled = scene is not None and scene.dev_toolkit_settings.leak_diagnostics
+        if enabled and not leaks.tracker.active:
+            leaks.tracker.enable()
+        elif not enabled and leaks.tracker.active:
+            leaks.tracker.disable()
+
+
+    def _on_item_changed(self, context):
+        invalidate_addon_index()
+        request_workspace_save()
+
+
+    @persistent
+    def _on_load_post(_dummy):
+        # Модальный оператор перезагрузки не переживает загрузку файла
+        drop_reload_job()
+        _addon_indexes.clear()
+        _workspace_synced.clear()
+        sync_watch_timer()
+        sync_leak_diagnostics()
+        sync_broadcast_service()
+
+
+    @persistent
+    def _on_undo_redo(_dummy):
+        invalidate_addon_index()
+
+
+    # ------------------------- ДАННЫЕ -------------------------
+
+    class AddonDevToolkitSettings(PropertyGroup):
+        """Настройки Developer Toolkit."""
+        autosave_on_reload: BoolProperty(
+            name="Автосохранение",
+            description="Автоматически сохранять файл перед перезагрузкой аддона",
+            default=True,
+        )
+        clear_console: BoolProperty(
+            name="Очистка консоли",
+            description="Очищать консоль Python перед перезагрузкой",
+            default=True,
+        )
+        compression_level: IntProperty(
+            name="Уровень сжатия",
+            description="Уровень deflate при упаковке в ZIP (0 — без сжатия, 9 — максимальное)",
+            default=packaging.DEFAULT_LEVEL,
+            min=0,
+            max=9,
+        )
+        watch_enabled: BoolProperty(
+            name="Следить за изменениями",
+            description="Автоматически перезагружать отмеченные аддоны при изменении их исходников",
+            default=False,
+            update=lambda self, context: sync_watch_timer(context.scene),
+        )
+        watch_debounce: FloatProperty(
+            name="Задержка, с",
+            description="Сколько секунд исходники должны оставаться неизменными перед перезагрузкой",
+            default=0.5,
+            min=0.1,
+            max=10.0,
+        )
+        run_tests: BoolProperty(
+            name="Тесты после перезагрузки",
+            description="Запускать тесты аддона (tests/test_*.py) прямо в этом Blender; "
+                        "выбираются только тесты, затронутые изменившимися файлами",
+            default=False,
+        )
+        profile_reload: BoolProperty(
+            name="Профилирование",
+            description="Замерять импорт модулей, register() и register_class при включении аддона; "
+                        "отчёт сохраняется на диск",
+            default=False,
+        )
+        memory_cap: IntProperty(
+            name="Лимит памяти, МБ",
+            description="Архивы не больше этого размера собираются в памяти и распаковываются напрямую; "
+                        "более крупные — через временный файл (0 — всегда через файл)",
+            default=packaging.DEFAULT_MEMORY_CAP // (1024 * 1024),
+            min=0,
+            max=4096,
+        )
+        ship_bytecode: BoolProperty(
+            name="Поставлять байткод",
+            description="Класть в ZIP готовые .pyc (проверяемые по хэшу исходника), чтобы при включении "
+                        "аддона Python не компилировал модули; компилируются только изменившиеся",
+            default=True,
+        )
+        compile_check: BoolProperty(
+            name="Проверка синтаксиса",
+            description="Перед перезагрузкой компилировать изменившиеся файлы; "
+                        "при ошибке работающая версия аддона не отключается",
+            default=True,
+        )
+        rollback_on_failure: BoolProperty(
+            name="Откат при ошибке",
+            description="Если установка или включение новой версии не удались, "
+                        "вернуть и включить предыдущую рабочую версию (для установки через ZIP)",
+            default=True,
+        )
+        leak_diagnostics: BoolProperty(
+            name="Диагностика утечек",
+            description="Следить, какие модули, классы и функции прошлых версий аддона остаются в памяти "
+                        "после перезагрузки, и замерять рост памяти (tracemalloc замедляет Blender)",
+            default=False,
+            update=lambda self, context: sync_leak_diagnostics(context.scene),
+        )
+        selective_reload: BoolProperty(
+            name="Выборочная перезагрузка",
+            description="Перезагружать только изменившиеся модули и зависящие от них; "
+                        "при невозможности выполняется полная перезагрузка",
+            default=False,
+        )
+
+
+    class AddonItem(PropertyGroup):
+        """Элемент списка аддонов."""
+        name: StringProperty(
+            name="Имя аддона",
+            description="Имя модуля аддона (используется для включения/отключения)",
+            default="",
+            update=_on_item_changed,
+        )
+        path: StringProperty(
+            name="Путь к исходникам",
+            description="Полный путь к директории с исходниками аддона",
+            default="",
+            subtype='DIR_PATH',
+            update=_on_item_changed,
+        )
+        is_enabled: BoolProperty(
+            name="Активен",
+            description="Аддон активен в Blender",
+            default=False,
+        )
+        auto_reload: BoolProperty(
+            name="Автообновление",
+            description="Включить аддон в массовое обновление и в наблюдение за изменениями",
+            default=True,
+            update=request_workspace_save,
+        )
+        last_reload: StringProperty(
+            name="Последняя перезагрузка",
+            description="Время последней перезагрузки аддона",
+            default="",
+        )
+        ignore_patterns: StringProperty(
+            name="Исключения",
+            description="Дополнительные шаблоны в стиле .gitignore через запятую "
+                        "(например: tests/, *.blend1, docs/)",
+            default="",
+            update=request_workspace_save,
+        )
+        install_mode: EnumProperty(
+            name="Способ установки",
+            description="Как аддон попадает в Blender при перезагрузке",
+            items=[
+                ('ZIP', "ZIP", "Упаковать в ZIP и распаковать в каталог аддонов (как релиз)"),
+                ('LINK', "Ссылка", "Подключить исходники ссылкой один раз, дальше только перевключать"),
+            ],
+            default='ZIP',
+            update=request_workspace_save,
+        )
+
+
+    class DevToolkitPreferences(AddonPreferences):
+        """Настройки на весь запущенный Blender: не зависят от открытого .blend."""
+        bl_idname = __package__
+
+        broadcast_service: BoolProperty(
+            name="Принимать рассылку",
+            description="Слушать локальный порт (только 127.0.0.1) и перезагружать аддоны по запросу "
+                        "других Blender на этой машине",
+            default=False,
+            update=lambda self, context: sync_broadcast_service(),
+        )
+
+        def draw(self, context):
+            draw_broadcast_service(self.layout, self)
+
+
+    def get_preferences(context=None) -> DevToolkitPreferences | None:
+        """Настройки тулкита из настроек Blender; None, если аддон там не найден."""
+        addon = (context or bpy.context).preferences.addons.get(__package__)
+        return getattr(addon, "preferences", None)
+
+
+    # ------------------------- ОПЕРАТОРЫ -------------------------
+
+    class DEV_OT_AddAddon(Operator):
+        """Добавить аддон в список для разработки."""
+        bl_idname = "dev.add_addon"
+        bl_label = "Добавить аддон"
+        bl_options = {'REGISTER', 'UNDO'}
+        filepath: StringProperty(
+            name="Файл аддона",
+            description="Выберите __init__.py или папку аддона",
+            default="",
+            subtype='FILE_PATH',
+        )
+        directory: StringProperty(name="Директория", subtype='DIR_PATH')
+        filter_folder: BoolProperty(default=True, options={'HIDDEN'})
+        filter_glob: StringProperty(default="__init__.py;*.py", options={'HIDDEN'})
+
+        def invoke(self, context, event):
+            # Открываем стандартный файловый браузер без промежуточных окон
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+
+        def execute(self, context):
+            # Если пользователь отменил выбор
+            chosen = os.path.normpath(self.filepath or self.directory or "")
+            if not chosen:
+                self.report({'WARNING'}, "Файл не выбран")
+                return {'CANCELLED'}
 
-        for n in names:
-            sys.modules.pop(n, None)
+            # Получаем директорию аддона и его имя
+            addon_dir = chosen if os.path.isdir(chosen) else os.path.dirname(chosen)
+            addon_dir = os.path.normpath(addon_dir)
+            if not os.path.exists(addon_dir):
+                self.report({'ERROR'}, f"Путь не существует: {addon_dir}")
+                return {'CANCELLED'}
+            addon_name = os.path.basename(addon_dir)
 
-    # ---- основной execute ----
+            # Здесь при желании можно добавить строгую проверку на __init__.py
+            # init_path = os.path.join(addon_dir, "__init__.py")
+            # if not os.path.exists(init_path): ...
 
-    def execute(self, context):
-        addon_item = get_addon_item(context, self.addon_index)
-        if addon_item is None:
-            self.report({'ERROR'}, "Неверный индекс аддона")
-            return {'CANCELLED'}
+            # Проверка на дубликат
+            if find_addon_position(context, addon_name) is not None:
+                self.report({'ERROR'}, f"Аддон {addon_name} уже в списке.")
+                return {'CANCELLED'}
 
-        source_dir = addon_item.path
-        addon_name = addon_item.name
+            AddonValidator.create_addon_item(context, addon_name, addon_dir)
+            self.report({'INFO'}, f"Аддон {addon_name} добавлен в список")
+            return {'FINISHED'}
 
-        ok, err = validate_addon_path(source_dir)
-        if not ok:
-            self.report({'ERROR'}, err)
-            return {'CANCELLED'}
 
-        # Автосохранение и очистка консоли
-        settings = context.scene.dev_toolkit_settings
-        if settings.autosave_on_reload and bpy.data.filepath:
-            bpy.ops.wm.save_mainfile()
-        if settings.clear_console:
-            try:
-                bpy.ops.console.clear({'window': context.window,
-                                       'screen': context.window.screen,
-                                       'area': next(a for a in context.window.screen.areas if a.type == 'CONSOLE'),
-                                       'region': next(r for r in next(a for a in context.window.screen.areas if a.type == 'CONSOLE').regions if r.type == 'WINDOW')})
-            except Exception:
-                pass
+    class DEV_OT_DiscoverAddons(Operator):
+        """Найти аддоны в папке (монорепозитории) и добавить их в список."""
+        bl_idname = "dev.discover_addons"
+        bl_label = "Найти аддоны"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        directory: StringProperty(name="Директория", subtype='DIR_PATH')
+        filter_folder: BoolProperty(default=True, options={'HIDDEN'})
+        max_depth: IntProperty(
+            name="Глубина поиска",
+            description="На сколько уровней вложенности спускаться в поисках аддонов",
+            default=discovery.DEFAULT_DEPTH,
+            min=1,
+            max=16,
+        )
+
+        def invoke(self, context, event):
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+
+        def execute(self, context):
+            root = os.path.normpath(self.directory or "")
+            if not self.directory or not os.path.isdir(root):
+                self.report({'ERROR'}, f"Папка не существует: {root}")
+                return {'CANCELLED'}
 
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        zip_path = os.path.join(tempfile.gettempdir(), f"{addon_name}_{timestamp}.zip")
+            added = skipped = 0
+            for found in discovery.find_addons(root, self.max_depth):
+                if (find_addon_position(context, found.name) is not None
+                        or find_addon_position(context, path=found.path) is not None):
+                    skipped += 1
+                    continue
+                AddonValidator.create_addon_item(context, found.name, found.path)
+                added += 1
 
-        try:
-            if not self.create_zip(source_dir, addon_name, zip_path):
-                self.report({'ERROR'}, "ZIP-архив не был создан")
+            if not added and not skipped:
+                self.report({'WARNING'}, f"Аддоны не найдены в {root}")
                 return {'CANCELLED'}
+            if not added:
+                self.report({'INFO'}, f"Новых аддонов нет, уже в списке: {skipped}")
+                return {'FINISHED'}
+            message = f"Добавлено аддонов: {added}"
+            if skipped:
+                message += f", уже в списке: {skipped}"
+            self.report({'INFO'}, message)
+            return {'FINISHED'}
 
-            # Отключение
-            if addon_name in context.preferences.addons:
-                if not self.skip_unregister:
+
+    class DEV_OT_RemoveAddon(Operator):
+        """Удалить аддон из списка."""
+        bl_idname = "dev.remove_addon"
+        bl_label = "Удалить из списка"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        addon_index: IntProperty()
+
+        def execute(self, context):
+            addons = context.scene.dev_toolkit_addons
+            if 0 <= self.addon_index < len(addons):
+                addon_name = addons[self.addon_index].name
+                addons.remove(self.addon_index)
+                invalidate_addon_index()
+                packaging.drop_package_cache(addon_name)
+                bytecode.drop_bytecode_cache(addon_name)
+                hot_reload.forget_state(addon_name)
+                timing.history.forget(addon_name)
+                testing.forget(addon_name)
+                leaks.tracker.forget(addon_name)
+                store = get_store()
+                if store is not None:
                     try:
-                        bpy.ops.preferences.addon_disable(module=addon_name)
+                        store.forget(addon_name)
                     except Exception:
                         pass
-            # Чистка модулей всегда
-            self.clean_addon_modules(addon_name)
+                request_workspace_save()
+                self.report({'INFO'}, f"Аддон {addon_name} удален из списка")
+                request_redraw(REDRAW_SIDEBAR)
+                return {'FINISHED'}
+            self.report({'ERROR'}, "Неверный индекс аддона")
+            return {'CANCELLED'}
 
-            # Установка и включение
-            bpy.ops.preferences.addon_install(filepath=zip_path, overwrite=True)
-            bpy.ops.preferences.addon_enable(module=addon_name)
-            addon_item.is_enabled = True
 
-        except Exception as e:
-            addon_item.is_enabled = False
-            self.report({'ERROR'}, f"Ошибка при перезагрузке аддона: {e}")
-            return {'CANCELLED'}
-        finally:
+    class DEV_OT_ReloadAddon(Operator):
+        """Перезагрузить аддон из исходников."""
+        bl_idname = "dev.reload_addon"
+        bl_label = "Перезагрузить аддон"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        addon_index: IntProperty()
+        skip_unregister: BoolProperty(
+            default=False,
+            description="Пропустить отключение аддона (полезно при ошибках)",
+        )
+
+        # ---- вспомогательные методы ----
+
+        def create_zip(self, source_dir: str, addon_name: str, zip_path: str,
+                       level: int = packaging.DEFAULT_LEVEL, patterns=()) -> bool:
+            """Создать ZIP-архив из директории с исходниками (см. AddonReloader.create_zip)."""
+            return AddonReloader.create_zip(source_dir, addon_name, zip_path, level, patterns)
+
+        def clean_addon_modules(self, addon_name: str):
+            """Удалить модули аддона из sys.modules (см. AddonReloader.clean_addon_modules)."""
+            AddonReloader.clean_addon_modules(addon_name)
+
+        # ---- основной execute ----
+
+        def execute(self, context):
+            addon_item = get_addon_item(context, self.addon_index)
+            if addon_item is None:
+                self.report({'ERROR'}, "Неверный индекс аддона")
+                return {'CANCELLED'}
+
+            ok, err = validate_addon_path(addon_item.path)
+            if not ok:
+                self.report({'ERROR'}, err)
+                return {'CANCELLED'}
+
+            reloader = AddonReloader(context, self.skip_unregister)
+            timer = timing.ReloadTimer(addon_item.name)
+            reloader.prepare(timer)
+            ok = reloader.reload(addon_item, timer)
+            reloader.finish()
+            for level, message in reloader.messages:
+                self.report({level}, message)
+            return {'FINISHED'} if ok else {'CANCELLED'}
+
+
+    class DEV_OT_ReloadSelectedAddons(Operator):
+        """Перезагрузить все отмеченные аддоны."""
+        bl_idname = "dev.reload_selected_addons"
+        bl_label = "Обновить выбранные"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        skip_unregister: BoolProperty(
+            default=False,
+            description="Пропустить отключение аддонов (если стандартная перезагрузка глючит).",
+        )
+        only_changed: BoolProperty(
+            default=True,
+            description="Перезагружать только изменившиеся аддоны и зависящие от них",
+        )
+
+        @classmethod
+        def description(cls, context, properties):
+            if properties.skip_unregister:
+                text = ("Перезагрузка без отключения: полезно, если unregister падает "
+                        "или нужно сохранить состояние в памяти.")
+            else:
+                text = ("Полная перезагрузка: отключить → установить из ZIP → включить. "
+                        "Рекомендуемый способ.")
+            if properties.only_changed:
+                text += " Только изменившиеся аддоны и зависящие от них, зависимости — первыми."
+            else:
+                text += " Все отмеченные аддоны, зависимости — первыми."
+            return text
+
+        def execute(self, context):
+            items = [addon for addon in context.scene.dev_toolkit_addons if addon.auto_reload]
+            reloader = AddonReloader(context, self.skip_unregister)
+            reloader.reload_batch(items, self.only_changed)
+            level, message = reloader.summary()
+            self.report({level}, message)
+            return {'FINISHED'}
+
+
+    class DEV_OT_ReloadAddonsModal(Operator):
+        """Перезагрузить аддоны, не блокируя Blender: прогресс в строке состояния, Esc — отмена."""
+        bl_idname = "dev.reload_addons_modal"
+        bl_label = "Перезагрузить в фоне"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        addon_index: IntProperty(
+            default=-1,
+            description="Индекс аддона в списке; -1 — все отмеченные",
+        )
+        skip_unregister: BoolProperty(
+            default=False,
+            description="Пропустить отключение аддонов (если стандартная перезагрузка глючит).",
+        )
+        only_changed: BoolProperty(
+            default=True,
+            description="Перезагружать только изменившиеся аддоны и зависящие от них",
+        )
+
+        @classmethod
+        def poll(cls, context):
+            return _reload_job is None
+
+        def start_job(self, context) -> ReloadJob | None:
+            global _reload_job
+            if self.addon_index >= 0:
+                addon_item = get_addon_item(context, self.addon_index)
+                if addon_item is None:
+                    self.report({'ERROR'}, "Неверный индекс аддона")
+                    return None
+                items, only_changed = [addon_item], False
+            else:
+                items = [addon for addon in context.scene.dev_toolkit_addons if addon.auto_reload]
+                only_changed = self.only_changed
+            _reload_job = ReloadJob(AddonReloader(context, self.skip_unregister), items, only_changed)
+            return _reload_job
+
+        def invoke(self, context, event):
+            job = self.start_job(context)
+            if job is None:
+                return {'CANCELLED'}
+            wm = context.window_manager
+            job.timer = wm.event_timer_add(MODAL_INTERVAL, window=context.window)
+            wm.modal_handler_add(self)
+            self.show_progress(context)
+            return {'RUNNING_MODAL'}
+
+        def modal(self, context, event):
+            if _reload_job is None:
+                # Перезагрузку прервали снаружи (загружен другой файл)
+                self.clear_status(context)
+                return {'CANCELLED'}
+            if event.type == 'ESC' and event.value == 'PRESS':
+                _reload_job.cancel()
+            elif event.type != 'TIMER':
+                return {'PASS_THROUGH'}
             try:
-                if os.path.exists(zip_path):
-                    os.remove(zip_path)
-            except Exception:
-                pass
+                finished = _reload_job.step(context)
+            except BaseException:
+                self.cancel(context)
+                raise
+            if not finished:
+                self.show_progress(context)
+                return {'RUNNING_MODAL'}
+            return self.finish(context)
+
+        def cancel(self, context):
+            # Blender отменяет модальные операторы при загрузке файла и закрытии окна
+            drop_reload_job(context.window_manager)
+            self.clear_status(context)
+
+        def execute(self, context):
+            # Без окна (скрипты, фоновый режим) — тот же конвейер, но с ожиданием на месте
+            job = self.start_job(context)
+            if job is None:
+                return {'CANCELLED'}
+            try:
+                while not job.step(context):
+                    time.sleep(MODAL_INTERVAL / 5)
+            except BaseException:
+                drop_reload_job(context.window_manager)
+                raise
+            return self.finish(context)
+
+        def show_progress(self, context):
+            done, total, current = _reload_job.progress()
+            if total:
+                text = f"Перезагрузка аддонов: {done}/{total} — {current} (Esc — отмена)"
+            else:
+                text = "Планирование перезагрузки… (Esc — отмена)"
+            if context.workspace is not None:
+                context.workspace.status_text_set(text)
+            request_redraw(REDRAW_SIDEBAR)
+
+        @staticmethod
+        def clear_status(context):
+            if context.workspace is not None:
+                context.workspace.status_text_set(None)
+            request_redraw(REDRAW_SIDEBAR)
+
+        def finish(self, context):
+            global _reload_job
+            job, _reload_job = _reload_job, None
+            if job.timer is not None:
+                context.window_manager.event_timer_remove(job.timer)
+                job.timer = None
+                self.clear_status(context)
+            level, message = job.reloader.summary()
+            if job.cancelled and not job.stages:
+                level, message = 'WARNING', "Перезагрузка отменена"
+            elif job.cancelled:
+                message = f"Отменено, пропущено аддонов: {len(job.skipped())}. {message}"
+                level = 'WARNING' if level == 'INFO' else level
+            self.report({level}, message)
+            request_redraw(REDRAW_SIDEBAR)
+            return {'CANCELLED'} if job.cancelled else {'FINISHED'}
+
+
+    class DEV_OT_BroadcastReload(Operator):
+        """Перезагрузить отмеченные аддоны здесь и разослать их другим запущенным Blender."""
+        bl_idname = "dev.broadcast_reload"
+        bl_label = "Обновить во всех Blender"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        skip_unregister: BoolProperty(
+            default=False,
+            description="Пропустить отключение аддонов (если стандартная перезагрузка глючит).",
+        )
+        only_changed: BoolProperty(
+            default=True,
+            description="Перезагружать только изменившиеся аддоны и зависящие от них",
+        )
+
+        @classmethod
+        def poll(cls, context):
+            return _reload_job is None and _outgoing is None
+
+        def execute(self, context):
+            items = [addon for addon in context.scene.dev_toolkit_addons if addon.auto_reload]
+            reloader = AddonReloader(context, self.skip_unregister)
+            reloader.share_dir = get_shared_dir()
+            broadcast.prune_shared(reloader.share_dir)
+            reloader.reload_batch(items, self.only_changed)
+            level, message = reloader.summary()
+
+            entries = reloader.broadcast_entries()
+            peers = broadcast.list_peers(get_peers_dir())
+            if entries and peers:
+                start_broadcast(peers, {"type": "reload", "skip_unregister": self.skip_unregister,
+                                        "addons": entries})
+                message += f". Отправлено в другие Blender: {len(peers)}"
+            elif entries:
+                message += ". Других Blender с включённой рассылкой не найдено"
+            self.report({level}, message)
+            return {'FINISHED'}
 
-        addon_item.last_reload = datetime.datetime.now().strftime("%H:%M:%S")
-        self.report({'INFO'}, f"Аддон {addon_name} перезагружен")
-        force_full_ui_refresh()
-        return {'FINISHED'}
 
+    class DEV_OT_RunAddonTests(Operator):
+        """Прогнать все тесты аддона в этом Blender, без перезагрузки."""
+        bl_idname = "dev.run_addon_tests"
+        bl_label = "Запустить тесты"
 
-class DEV_OT_ReloadSelectedAddons(Operator):
-    """Перезагрузить все отмеченные аддоны."""
-    bl_idname = "dev.reload_selected_addons"
-    bl_label = "Обновить выбранные"
-    bl_options = {'REGISTER', 'UNDO'}
+        addon_index: IntProperty()
 
-    skip_unregister: BoolProperty(
-        default=False,
-        description="Пропустить отключение аддонов (если стандартная перезагрузка глючит).",
-    )
+        def execute(self, context):
+            addon_item = get_addon_item(context, self.addon_index)
+            if addon_item is None:
+                self.report({'ERROR'}, "Неверный индекс аддона")
+                return {'CANCELLED'}
+            plan = testing.plan_tests(addon_item.name, addon_item.path, None,
+                                      walker.split_patterns(addon_item.ignore_patterns))
+            if plan is None:
+                self.report({'WARNING'}, f"Тесты не найдены (ожидаются в {testing.TESTS_DIR}/test_*.py)")
+                return {'CANCELLED'}
+            reloader = AddonReloader(context)
+            run = reloader.run_tests(plan, addon_item.path)
+            level, message = reloader.messages[-1] if reloader.messages else ('INFO', "Тестов, зависящих от аддона, нет")
+            self.report({level}, message)
+            return {'FINISHED'} if run.ok else {'CANCELLED'}
+
+
+    class DEV_OT_ExportReloadTimings(Operator):
+        """Сохранить замеры перезагрузок в JSON (формат Chrome Trace)."""
+        bl_idname = "dev.export_reload_timings"
+        bl_label = "Экспорт замеров"
+        bl_options = {'REGISTER'}
+
+        filepath: StringProperty(
+            name="Файл",
+            description="Куда сохранить замеры (открываются в chrome://tracing или Perfetto)",
+            default="",
+            subtype='FILE_PATH',
+        )
+        filter_glob: StringProperty(default="*.json", options={'HIDDEN'})
+
+        def invoke(self, context, event):
+            if not self.filepath:
+                timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+                self.filepath = f"reload_trace_{timestamp}.json"
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+
+        def execute(self, context):
+            records = timing.history.records()
+            if not records:
+                self.report({'WARNING'}, "Замеров пока нет")
+                return {'CANCELLED'}
+            path = bpy.path.ensure_ext(self.filepath, ".json")
+            try:
+                timing.export_chrome_trace(path, records, {
+                    "blender": bpy.app.version_string,
+                    "addons": {name: list(version) for name, version in _addon_versions(context).items()},
+                })
+            except OSError as e:
+                self.report({'ERROR'}, f"Не удалось сохранить замеры: {e}")
+                return {'CANCELLED'}
+            self.report({'INFO'}, f"Замеры сохранены: {path}")
+            return {'FINISHED'}
 
-    @classmethod
-    def description(cls, context, properties):
-        if properties.skip_unregister:
-            return ("Перезагрузка без отключения: полезно, если unregister падает "
-                    "или нужно сохранить состояние в памяти.")
-        else:
-            return ("Полная перезагрузка: отключить → установить из ZIP → включить. "
-                    "Рекомендуемый способ.")
-
-    def execute(self, context):
-        reloaded = 0
-        for index, addon in enumerate(context.scene.dev_toolkit_addons):
-            if addon.auto_reload:
-                bpy.ops.dev.reload_addon(addon_index=index, skip_unregister=self.skip_unregister)
-                reloaded += 1
-        self.report({'INFO'}, f"Обновлено аддонов: {reloaded}")
-        return {'FINISHED'}
-
-
-class DEV_OT_ChangeAddonPath(Operator):
-    """Изменить путь к исходникам аддона."""
-    bl_idname = "dev.change_addon_path"
-    bl_label = "Изменить путь"
-    bl_options = {'REGISTER', 'UNDO'}
-
-    addon_index: IntProperty()
-
-    # Используем filepath/directory для диалога
-    filepath: StringProperty(
-        name="Путь к исходникам",
-        description="Полный путь к директории с исходниками аддона",
-        default="",
-        subtype='DIR_PATH',
-    )
-    directory: StringProperty(name="Директория", subtype='DIR_PATH')
-    filter_folder: BoolProperty(default=True, options={'HIDDEN'})
-
-    def invoke(self, context, event):
-        addon = get_addon_item(context, self.addon_index)
-        if addon:
-            self.filepath = addon.path
-            self.directory = addon.path
-        context.window_manager.fileselect_add(self)
-        return {'RUNNING_MODAL'}
-
-    def execute(self, context):
-        new_path = os.path.normpath(self.filepath or self.directory or "")
-        ok, err = validate_addon_path(new_path)
-        if not ok:
-            self.report({'ERROR'}, err)
-            return {'CANCELLED'}
-        addon = get_addon_item(context, self.addon_index)
-        if not addon:
-            self.report({'ERROR'}, "Неверный индекс аддона")
-            return {'CANCELLED'}
-        addon.path = new_path
-        self.report({'INFO'}, f"Путь к исходникам аддона {addon.name} обновлён")
-        force_full_ui_refresh()
-        return {'FINISHED'}
 
+    class DEV_OT_ChangeAddonPath(Operator):
+        """Изменить путь к исходникам аддона."""
+        bl_idname = "dev.change_addon_path"
+        bl_label = "Изменить путь"
+        bl_options = {'REGISTER', 'UNDO'}
+
+        addon_index: IntProperty()
+
+        # Используем filepath/directory для диалога
+        filepath: StringProperty(
+            name="Путь к исходникам",
+            description="Полный путь к директории с исходниками аддона",
+            default="",
+            subtype='DIR_PATH',
+        )
+        directory: StringProperty(name="Директория", subtype='DIR_PATH')
+        filter_folder: BoolProperty(default=True, options={'HIDDEN'})
+
+        def invoke(self, context, event):
+            addon = get_addon_item(context, self.addon_index)
+            if addon:
+                self.filepath = addon.path
+                self.directory = addon.path
+            context.window_manager.fileselect_add(self)
+            return {'RUNNING_MODAL'}
+
+        def execute(self, context):
+            new_path = os.path.normpath(self.filepath or self.directory or "")
+            ok, err = validate_addon_path(new_path)
+            if not ok:
+                self.report({'ERROR'}, err)
+                return {'CANCELLED'}
+            addon = get_addon_item(context, self.addon_index)
+            if not addon:
+                self.report({'ERROR'}, "Неверный индекс аддона")
+                return {'CANCELLED'}
+            addon.path = new_path
+            self.report({'INFO'}, f"Путь к исходникам аддона {addon.name} обновлён")
+            request_redraw(REDRAW_SIDEBAR)
+            return {'FINISHED'}
 
-class DEV_OT_ChangeAddonName(Operator):
-    """Изменить имя аддона."""
-    bl_idname = "dev.change_addon_name"
-    bl_label = "Изменить имя"
-    bl_options = {'REGISTER', 'UNDO'}
 
-    addon_index: IntProperty()
-    new_name: StringProperty(name="Новое имя", description="Новое имя аддона", default="")
+    class DEV_OT_ChangeAddonName(Operator):
+        """Изменить имя аддона."""
+        bl_idname = "dev.change_addon_name"
+        bl_label = "Изменить имя"
+        bl_options = {'REGISTER', 'UNDO'}
 
-    def invoke(self, context, event):
-        addon_item = get_addon_item(context, self.addon_index)
-        if not addon_item:
-            self.report({'ERROR'}, "Неверный индекс аддона")
-            return {'CANCELLED'}
-        self.new_name = addon_item.name
-        return context.window_manager.invoke_props_dialog(self)
+        addon_index: IntProperty()
+        new_name: StringProperty(name="Новое имя", description="Новое имя аддона", default="")
 
-    def execute(self, context):
-        addon_item = get_addon_item(context, self.addon_index)
-        if not addon_item:
-            self.report({'ERROR'}, "Неверный индекс аддона")
-            return {'CANCELLED'}
-        new_name = (self.new_name or "").strip()
-        if not new_name:
-            self.report({'ERROR'}, "Введите новое имя аддона")
-            return {'CANCELLED'}
-        # Проверка на коллизию имён
-        for i, it in enumerate(context.scene.dev_toolkit_addons):
-            if it.name == new_name and i != self.addon_index:
+        def invoke(self, context, event):
+            addon_item = get_addon_item(context, self.addon_index)
+            if not addon_item:
+                self.report({'ERROR'}, "Неверный индекс аддона")
+                return {'CANCELLED'}
+            self.new_name = addon_item.name
+            return context.window_manager.invoke_props_dialog(self)
+
+        def execute(self, context):
+            addon_item = get_addon_item(context, self.addon_index)
+            if not addon_item:
+                self.report({'ERROR'}, "Неверный индекс аддона")
+                return {'CANCELLED'}
+            new_name = (self.new_name or "").strip()
+            if not new_name:
+                self.report({'ERROR'}, "Введите новое имя аддона")
+                return {'CANCELLED'}
+            # Проверка на коллизию имён
+            position = find_addon_position(context, new_name)
+            if position is not None and position != self.addon_index:
                 self.report({'ERROR'}, f"Аддон с именем {new_name} уже существует")
                 return {'CANCELLED'}
-        addon_item.name = new_name
-        self.report({'INFO'}, f"Имя аддона изменено на {new_name}")
-        force_full_ui_refresh()
-        return {'FINISHED'}
-
-
-# ------------------------- UI -------------------------
-
-class DEV_UL_AddonsList(UIList):
-    """Список аддонов для разработки."""
-
-    def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
-        if self.layout_type in {'DEFAULT', 'COMPACT'}:
-            row = layout.row(align=True)
-            row.prop(item, "auto_reload", text="")
-            main_row = row.row()
-            main_row.prop(item, "name", text="", emboss=False, icon='PLUGIN')
-            edit_op = row.operator("dev.change_addon_name", text="", icon='GREASEPENCIL', emboss=False)
-            edit_op.addon_index = index
-            if item.is_enabled:
-                main_row.label(text="", icon='CHECKMARK')
-            remove_op = row.operator("dev.remove_addon", text="", icon='X', emboss=False)
-            remove_op.addon_index = index
-        elif self.layout_type in {'GRID'}:
-            layout.alignment = 'CENTER'
-            layout.label(text=item.name)
-
-
-class DEV_PT_DevToolkitPanel(Panel):
-    """Панель инструментов разработчика."""
-    bl_label = "Developer Toolkit"
-    bl_idname = "DEV_PT_DevToolkitPanel"
-    bl_space_type = 'VIEW_3D'
-    bl_region_type = 'UI'
-    bl_category = 'Dev'
-    bl_options = {'DEFAULT_CLOSED'}
-
-    def draw(self, context):
-        layout = self.layout
-        scene = context.scene
-
-        main_box = layout.box()
-
-        row = main_box.row(align=True)
-        row.operator("dev.add_addon", text="Добавить аддон", icon='ADD')
-
-        if len(scene.dev_toolkit_addons) > 0:
-            row = main_box.row()
-            row.template_list(
-                "DEV_UL_AddonsList", "",
-                scene, "dev_toolkit_addons",
-                scene, "dev_toolkit_addon_index",
-                rows=3
-            )
-
-        if 0 <= scene.dev_toolkit_addon_index < len(scene.dev_toolkit_addons):
-            addon = scene.dev_toolkit_addons[scene.dev_toolkit_addon_index]
-            info_box = main_box.box()
-
-            path_row = info_box.row(align=True)
-            path_row.label(text="", icon='FILE_FOLDER')
-            path_row.label(text=addon.path or "(путь не задан)")
-            path_op = path_row.operator("dev.change_addon_path", text="", icon='FILEBROWSER', emboss=False)
-            path_op.addon_index = scene.dev_toolkit_addon_index
-
-            time_row = info_box.row(align=True)
-            time_row.label(text="", icon='TIME')
-            if addon.last_reload and addon.last_reload != "Еще не перезагружался":
-                time_row.label(text=f"Обновлён в {addon.last_reload}")
-            else:
-                time_row.label(text="Еще не обновлялся", icon='ERROR')
-
-        box = main_box.box()
-        row = box.row(align=True)
-        row.operator("dev.reload_selected_addons", text="Обновить", icon='FILE_REFRESH')
-        op = row.operator("dev.reload_selected_addons", text="Обновить без отключения", icon='LOOP_BACK')
-        op.skip_unregister = True
-
-        settings_box = layout.box()
-        row = settings_box.row()
-        row.label(text="Настройки:", icon='PREFERENCES')
-        row = settings_box.row(align=True)
-        split = row.split(factor=0.5, align=True)
-        split.prop(scene.dev_toolkit_settings, "autosave_on_reload")
-        split.prop(scene.dev_toolkit_settings, "clear_console")
-
-
-# ------------------------- РЕГИСТРАЦИЯ -------------------------
-
-classes = [
-    AddonDevToolkitSettings,
-    AddonItem,
-    DEV_OT_AddAddon,
-    DEV_OT_RemoveAddon,
-    DEV_OT_ReloadAddon,
-    DEV_OT_ReloadSelectedAddons,
-    DEV_OT_ChangeAddonPath,
-    DEV_OT_ChangeAddonName,
-    DEV_UL_AddonsList,
-    DEV_PT_DevToolkitPanel,
-]
-
-
-def register():
-    for cls in classes:
-        bpy.utils.register_class(cls)
-    bpy.types.Scene.dev_toolkit_settings = PointerProperty(type=AddonDevToolkitSettings)
-    bpy.types.Scene.dev_toolkit_addons = CollectionProperty(type=AddonItem)
-    bpy.types.Scene.dev_toolkit_addon_index = IntProperty(default=0)
-
-
-def unregister():
-    del bpy.types.Scene.dev_toolkit_addon_index
-    del bpy.types.Scene.dev_toolkit_addons
-    del bpy.types.Scene.dev_toolkit_settings
-    for cls in reversed(classes):
-        bpy.utils.unregister_class(cls)
-
-
-if __name__ == "__main__":
-    register()
+            addon_item.name = new_name
+            self.report({'INFO'}, f"Имя аддона изменено на {new_name}")
+            request_redraw(REDRAW_SIDEBAR)
+            return {'FINISHED'}
+
+
+    # ------------------------- UI -------------------------
+
+    class DEV_UL_AddonsList(UIList):
+        """Список аддонов для разработки."""
+
+        def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
+            if self.layout_type in {'DEFAULT', 'COMPACT'}:
+                row = layout.row(align=True)
+                row.prop(item, "auto_reload", text="")
+                main_row = row.row()
+                main_row.prop(item, "name", text="", emboss=False, icon='PLUGIN')
+                edit_op = row.operator("dev.change_addon_name", text="", icon='GREASEPENCIL', emboss=False)
+                edit_op.addon_index = index
+                if item.is_enabled:
+                    main_row.label(text="", icon='CHECKMARK')
+                remove_op = row.operator("dev.remove_addon", text="", icon='X', emboss=False)
+                remove_op.addon_index = index
+            elif self.layout_type in {'GRID'}:
+                layout.alignment = 'CENTER'
+                layout.label(text=item.name)
+
+        def filter_items(self, context, data, propname):
+            # Фильтр и сортировка по индексу: без обращения к каждому элементу коллекции
+            index = get_addon_index(data)
+            flags = index.filter_flags(self.filter_name, self.bitflag_filter_item)
+            order = index.sort_order() if self.use_filter_sort_alpha else []
+            return flags, order
+
+
+    class DEV_PT_DevToolkitPanel(Panel):
+        """Панель инструментов разработчика."""
+        bl_label = "Developer Toolkit"
+        bl_idname = "DEV_PT_DevToolkitPanel"
+        bl_space_type = 'VIEW_3D'
+        bl_region_type = 'UI'
+        bl_category = 'Dev'
+        bl_options = {'DEFAULT_CLOSED'}
+
+        def draw(self, context):
+            layout = self.layout
+            scene = context.scene
+            ensure_workspace(scene)
+
+            main_box = layout.box()
+
+            row = main_box.row(align=True)
+            row.operator("dev.add_addon", text="Добавить аддон", icon='ADD')
+            row.operator("dev.discover_addons", text="Найти в папке", icon='VIEWZOOM')
+
+            if len(scene.dev_toolkit_addons) > 0:
+                row = main_box.row()
+                row.template_list(
+                    "DEV_UL_AddonsList", "",
+                    scene, "dev_toolkit_addons",
+                    scene, "dev_toolkit_addon_index",
+                    rows=3
+                )
+
+            if 0 <= scene.dev_toolkit_addon_index < len(scene.dev_toolkit_addons):
+                addon = scene.dev_toolkit_addons[scene.dev_toolkit_addon_index]
+                info_box = main_box.box()
+
+                path_row = info_box.row(align=True)
+                path_row.label(text="", icon='FILE_FOLDER')
+                path_row.label(text=addon.path or "(путь не задан)")
+                path_op = path_row.operator("dev.change_addon_path", text="", icon='FILEBROWSER', emboss=False)
+                path_op.addon_index = scene.dev_toolkit_addon_index
+
+                mode_row = info_box.row(align=True)
+                mode_row.prop(addon, "install_mode", expand=True)
+                info_box.prop(addon, "ignore_patterns", text="", icon='FILTER')
+
+                time_row = info_box.row(align=True)
+                time_row.label(text="", icon='TIME')
+                if addon.last_reload and addon.last_reload != "Еще не перезагружался":
+                    time_row.label(text=f"Обновлён в {addon.last_reload}")
+                else:
+                    time_row.label(text="Еще не обновлялся", icon='ERROR')
+                summary = timing.history.summary(addon.name)
+                if summary:
+                    p50, p95 = summary["total"]
+                    time_row.label(text=f"p50 {p50 * 1000:.0f} мс · p95 {p95 * 1000:.0f} мс")
+                time_row.operator("dev.export_reload_timings", text="", icon='EXPORT', emboss=False)
+                test_run = testing.last_runs.get(addon.name)
+                if test_run is not None:
+                    test_row = info_box.row(align=True)
+                    if not test_run.selected:
+                        test_row.label(text="Тесты: изменения их не затронули", icon='CHECKMARK')
+                    else:
+                        test_row.label(text=f"Тесты: {test_run.count('passed')}/{len(test_run.results)} "
+                                            f"за {test_run.duration * 1000:.0f} мс "
+                                            f"(файлов {test_run.selected} из {test_run.total})",
+                                       icon='CHECKMARK' if test_run.ok else 'ERROR')
+                    tests_op = test_row.operator("dev.run_addon_tests", text="", icon='PLAY', emboss=False)
+                    tests_op.addon_index = scene.dev_toolkit_addon_index
+                    failures_col = info_box.column(align=True)
+                    failures_col.scale_y = 0.8
+                    for failure in test_run.failures()[:5]:
+                        failures_col.label(text=f"{failure.name.rpartition('.')[2]}: {failure.message}")
+                elif scene.dev_toolkit_settings.run_tests:
+                    tests_op = info_box.operator("dev.run_addon_tests", icon='PLAY')
+                    tests_op.addon_index = scene.dev_toolkit_addon_index
+                if summary:
+                    phases_col = info_box.column(align=True)
+                    phases_col.scale_y = 0.8
+                    for name, (p50, p95) in sorted(summary["phases"].items(), key=lambda kv: -kv[1][0]):
+                        phases_col.label(text=f"{name}: {p50 * 1000:.1f} / {p95 * 1000:.1f} мс")
+
+                report = profiler.last_reports.get(addon.name)
+                if scene.dev_toolkit_settings.profile_reload and report:
+                    prof_col = info_box.column(align=True)
+                    prof_col.label(text=f"Включение: {report.total * 1000:.0f} мс, медленнее всего:", icon='SORTTIME')
+                    for label, seconds in report.top():
+                        prof_col.label(text=f"{seconds * 1000:.1f} мс  {label}")
+
+                leak_report = leaks.tracker.reports.get(addon.name)
+                if scene.dev_toolkit_settings.leak_diagnostics and leak_report:
+                    leak_col = info_box.column(align=True)
+                    leak_col.label(text=f"Цикл {leak_report.cycle}: осталось объектов {leak_report.alive}, "
+                                        f"память {leak_report.growth / 1024:+.0f} КБ",
+                                   icon='ERROR' if leak_report.alive else 'CHECKMARK')
+                    for survivor in leak_report.survivors[:5]:
+                        holder = survivor.referrers[0] if survivor.referrers else "удерживается Blender (таймер, draw handler?)"
+                        leak_col.label(text=f"{survivor.kind} {survivor.name} (цикл {survivor.cycle}) ← {holder}")
+                    for location, size in leak_report.top_allocations[:3]:
+                        leak_col.label(text=f"+{size / 1024:.0f} КБ  {location}")
+
+                stats = packaging.get_package_cache(addon.name).stats()
+                if stats["hits"] or stats["misses"] or stats["restored"]:
+                    cache_row = info_box.row(align=True)
+                    cache_row.label(text="", icon='PACKAGE')
+                    cache_row.label(text=f"Кэш упаковки: попаданий {stats['hits']}, "
+                                         f"с диска {stats['restored']}, "
+                                         f"промахов {stats['misses']}, "
+                                         f"{stats['bytes'] // 1024} КБ")
+                pyc_cache = bytecode.find_bytecode_cache(addon.name)
+                if pyc_cache is not None and scene.dev_toolkit_settings.ship_bytecode:
+                    pyc_stats = pyc_cache.stats()
+                    pyc_row = info_box.row(align=True)
+                    pyc_row.label(text="", icon='SCRIPT')
+                    pyc_row.label(text=f"Байткод: модулей {pyc_stats['entries']}, "
+                                       f"скомпилировано {pyc_stats['compiled']}")
+
+            box = main_box.box()
+            if _reload_job is not None:
+                done, total, current = _reload_job.progress()
+                box.label(text=f"Перезагрузка: {done}/{total} {current}" if total else "Планирование…",
+                          icon='SORTTIME')
+            row = box.row(align=True)
+            row.operator("dev.reload_addons_modal", text="Обновить", icon='FILE_REFRESH')
+            op = row.operator("dev.reload_addons_modal", text="Обновить без отключения", icon='LOOP_BACK')
+            op.skip_unregister = True
+            op = row.operator("dev.reload_addons_modal", text="", icon='RECOVER_LAST')
+            op.only_changed = False
+            row.operator("dev.broadcast_reload", text="", icon='WORLD')
+            if _outgoing is not None:
+                box.label(text="Ждём ответа других Blender…", icon='SORTTIME')
+            elif _broadcast_replies:
+                replies_col = box.column(align=True)
+                replies_col.scale_y = 0.8
+                for label, ok, message in _broadcast_replies:
+                    replies_col.label(text=f"{label}: {message}", icon='CHECKMARK' if ok else 'ERROR')
+
+            settings_box = layout.box()
+            row = settings_box.row()
+            row.label(text="Настройки:", icon='PREFERENCES')
+            row = settings_box.row(align=True)
+            split = row.split(factor=0.5, align=True)
+            split.prop(scene.dev_toolkit_settings, "autosave_on_reload")
+            split.prop(scene.dev_toolkit_settings, "clear_console")
+            row = settings_box.row(align=True)
+            split = row.split(factor=0.5, align=True)
+            split.prop(scene.dev_toolkit_settings, "compile_check")
+            split.prop(scene.dev_toolkit_settings, "rollback_on_failure")
+            settings_box.prop(scene.dev_toolkit_settings, "selective_reload")
+            row = settings_box.row(align=True)
+            row.prop(scene.dev_toolkit_settings, "compression_level")
+            row.prop(scene.dev_toolkit_settings, "ship_bytecode", text="", icon='SCRIPT')
+            settings_box.prop(scene.dev_toolkit_settings, "memory_cap")
+            settings_box.prop(scene.dev_toolkit_settings, "run_tests")
+            settings_box.prop(scene.dev_toolkit_settings, "profile_reload")
+            settings_box.prop(scene.dev_toolkit_settings, "leak_diagnostics")
+            preferences = get_preferences(context)
+            if preferences is not None:
+                draw_broadcast_service(settings_box, preferences)
+            row = settings_box.row(align=True)
+            row.prop(scene.dev_toolkit_settings, "watch_enabled")
+            sub = row.row(align=True)
+            sub.active = scene.dev_toolkit_settings.watch_enabled
+            sub.prop(scene.dev_toolkit_settings, "watch_debounce")
+
+
+    def draw_broadcast_service(layout, preferences):
+        """Переключатель службы рассылки с портом или ошибкой запуска."""
+        row = layout.row(align=True)
+        row.prop(preferences, "broadcast_service")
+        if _service is not None:
+            row.label(text=f"порт {_service.port}")
+        elif _service_error and preferences.broadcast_service:
+            row.label(text=_service_error, icon='ERROR')
+
+
+    # ------------------------- РЕГИСТРАЦИЯ -------------------------
+
+    classes = [
+        AddonDevToolkitSettings,
+        AddonItem,
+        DevToolkitPreferences,
+        DEV_OT_AddAddon,
+        DEV_OT_DiscoverAddons,
+        DEV_OT_RemoveAddon,
+        DEV_OT_ReloadAddon,
+        DEV_OT_ReloadSelectedAddons,
+        DEV_OT_ReloadAddonsModal,
+        DEV_OT_BroadcastReload,
+        DEV_OT_RunAddonTests,
+        DEV_OT_ExportReloadTimings,
+        DEV_OT_ChangeAddonPath,
+        DEV_OT_ChangeAddonName,
+        DEV_UL_AddonsList,
+        DEV_PT_DevToolkitPanel,
+    ]
+
+
+    def register():
+        for cls in classes:
+            bpy.utils.register_class(cls)
+        bpy.types.Scene.dev_toolkit_settings = PointerProperty(type=AddonDevToolkitSettings)
+        bpy.types.Scene.dev_toolkit_addons = CollectionProperty(type=AddonItem)
+        bpy.types.Scene.dev_toolkit_addon_index = IntProperty(default=0)
+        bpy.app.handlers.load_post.append(_on_load_post)
+        bpy.app.handlers.undo_post.append(_on_undo_redo)
+        bpy.app.handlers.redo_post.append(_on_undo_redo)
+        # Кэши упаковки создаются и в потоках сборки, поэтому каталог задаём здесь, без bpy там
+        packaging.cache_root = get_package_cache_dir()
+        # Настройки аддона появляются после register(): службу поднимаем на следующем тике
+        bpy.app.timers.register(sync_broadcast_service, first_interval=0.0)
+
+
+    def unregister():
+        global _reload_job, _watch_job
+        if _on_load_post in bpy.app.handlers.load_post:
+            bpy.app.handlers.load_post.remove(_on_load_post)
+        for handlers in (bpy.app.handlers.undo_post, bpy.app.handlers.redo_post):
+            if _on_undo_redo in handlers:
+                handlers.remove(_on_undo_redo)
+        if bpy.app.timers.is_registered(_watch_tick):
+            bpy.app.timers.unregister(_watch_tick)
+        if bpy.app.timers.is_registered(_flush_redraw):
+            bpy.app.timers.unregister(_flush_redraw)
+        if bpy.app.timers.is_registered(_flush_workspace):
+            bpy.app.timers.unregister(_flush_workspace)
+        for timer in (_collect_broadcast, sync_broadcast_service):
+            if bpy.app.timers.is_registered(timer):
+                bpy.app.timers.unregister(timer)
+        stop_broadcast_service()
+        if _reload_job is not None:
+            _reload_job.close()
+            _reload_job = _watch_job = None
+        close_store()
+        leaks.tracker.disable()
+        _pending_redraw.clear()
+        _addon_indexes.clear()
+        packaging.shutdown_executor()
+        packaging.cache_root = None
+        workers.shutdown_pool()
+        del bpy.types.Scene.dev_toolkit_addon_index
+        del bpy.types.Scene.dev_toolkit_addons
+        del bpy.types.Scene.dev_toolkit_settings
+        for cls in reversed(classes):
+            bpy.utils.unregister_class(cls)
+
+
+    if __name__ == "__main__":
+        register()
@@ -0,0 +1,8 @@
+"""Командная строка тулкита без Blender: python -m DeveloperToolkit build ..."""
+
+import sys
+
+from .release import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Граф зависимостей между отслеживаемыми аддонами.
+
+Зависимости находятся статически: абсолютные импорты в исходниках аддона,
+верхний уровень которых совпадает с именем другого отслеживаемого аддона.
+Разобранные импорты кэшируются по (размер, mtime) файла. Модуль не зависит
+от bpy.
+"""
+
+import ast
+
+from . import walker
+
+
+# путь файла -> ((размер, mtime), верхние уровни абсолютных импортов)
+_imports_cache: dict[str, tuple[tuple[int, int], frozenset]] = {}
+
+
+def top_level_imports(path: str, fingerprint) -> frozenset:
+    """Имена верхнего уровня абсолютных импортов файла (с кэшем по отпечатку)."""
+    cached = _imports_cache.get(path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    names = set()
+    try:
+        with open(path, "rb") as f:
+            tree = ast.parse(f.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        tree = None
+    if tree is not None:
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names.update(alias.name.partition(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names.add(node.module.partition(".")[0])
+    result = frozenset(names)
+    _imports_cache[path] = (fingerprint, result)
+    return result
+
+
+def build_addon_graph(addons: dict) -> dict[str, set[str]]:
+    """Граф аддон -> отслеживаемые аддоны, которые он импортирует.
+
+    addons — {имя: (путь к исходникам, шаблоны игнорирования)}.
+    """
+    known = set(addons)
+    graph = {}
+    for name, (source_dir, patterns) in addons.items():
+        deps = set()
+        for path, rel, st in walker.iter_source(source_dir, patterns):
+            if rel.endswith(".py"):
+                deps.update(top_level_imports(path, (st.st_size, st.st_mtime_ns)) & known)
+        deps.discard(name)
+        graph[name] = deps
+    return graph
+
+
+def downstream(graph: dict[str, set[str]], changed) -> set[str]:
+    """Изменившиеся аддоны и все, кто от них (транзитивно) зависит."""
+    dependents: dict[str, set[str]] = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents.setdefault(dep, set()).add(name)
+    result = set()
+    stack = list(changed)
+    while stack:
+        name = stack.pop()
+        if name not in result:
+            result.add(name)
+            stack.extend(dependents.get(name, ()))
+    return result
+
+
+def reload_order(graph: dict[str, set[str]], names) -> list[str]:
+    """Упорядочить аддоны так, чтобы зависимости шли раньше зависимых.
+
+    Среди независимых аддонов сохраняется исходный порядок names. Аддоны,
+    попавшие в цикл импортов, добавляются в конец в исходном порядке.
+    """
+    names = list(dict.fromkeys(names))
+    selected = set(names)
+    pending = {name: len(graph.get(name, set()) & selected) for name in names}
+    order = []
+    while True:
+        ready = [name for name in names if pending.get(name) == 0]
+        if not ready:
+            break
+        for name in ready:
+            order.append(name)
+            del pending[name]
+        for name in pending:
+            pending[name] -= len(graph.get(name, set()) & set(ready))
+    order.extend(name for name in names if name in pending)
+    return order
@@ -0,0 +1,104 @@
+"""Хэш-индекс отслеживаемых аддонов по имени и пути.
+
+Коллекция сцены в Blender — это список свойств, поиск по ней линейный, а
+каждое обращение к элементу идёт через RNA. Индекс хранит копию имён и путей
+в словарях и списках Python: поиск, фильтрация и сортировка списка в UI не
+трогают коллекцию. Индекс перестраивается лениво после инвалидации.
+Модуль не зависит от bpy.
+"""
+
+import fnmatch
+import os
+import re
+
+
+def normalize_path(path: str) -> str:
+    """Ключ пути для индекса: абсолютный, нормализованный, без учёта регистра на Windows.
+
+    Ссылки не разрешаются: индекс строится на каждой перерисовке после правок,
+    и системные вызовы на каждый элемент здесь слишком дороги.
+    """
+    return os.path.normcase(os.path.abspath(path)) if path else ""
+
+
+class AddonIndex:
+    """Индекс имён и путей одной коллекции аддонов."""
+
+    def __init__(self):
+        self.names: list[str] = []
+        self.by_name: dict[str, int] = {}
+        self.by_path: dict[str, int] = {}
+        self.valid = False
+        self._lowered: list[str] | None = None
+        self._order: list[int] | None = None
+        self._filter: tuple[str, int, list[int]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rebuild(self, entries):
+        """Перестроить индекс по парам (имя, путь) в порядке коллекции."""
+        self.names = []
+        self.by_name = {}
+        self.by_path = {}
+        for name, path in entries:
+            self._add(name, path)
+        self.valid = True
+
+    def invalidate(self):
+        self.valid = False
+
+    def append(self, name: str, path: str):
+        """Учесть элемент, добавленный в конец коллекции.
+
+        Вызывать, только если индекс был актуален до добавления: установка
+        имени и пути нового элемента сама сбрасывает valid через update.
+        """
+        self._add(name, path)
+        self.valid = True
+
+    def _add(self, name: str, path: str):
+        position = len(self.names)
+        self.names.append(name)
+        # При дубликатах (имя правят прямо в списке) побеждает первый элемент, как при линейном поиске
+        self.by_name.setdefault(name, position)
+        key = normalize_path(path)
+        if key:
+            self.by_path.setdefault(key, position)
+        self._lowered = None
+        self._order = None
+        self._filter = None
+
+    def find_name(self, name: str) -> int | None:
+        return self.by_name.get(name)
+
+    def find_path(self, path: str) -> int | None:
+        return self.by_path.get(normalize_path(path))
+
+    def filter_flags(self, pattern: str, flag: int) -> list[int]:
+        """Флаги видимости для UIList.filter_items (как фильтр по имени в Blender)."""
+        if not pattern:
+            return [flag] * len(self.names)
+        if self._filter is not None and self._filter[:2] == (pattern, flag):
+            return self._filter[2]
+        wildcard = pattern if "*" in pattern else f"*{pattern}*"
+        match = re.compile(fnmatch.translate(wildcard.lower())).match
+        flags = [flag if match(name) else 0 for name in self._lowered_names()]
+        self._filter = (pattern, flag, flags)
+        return flags
+
+    def sort_order(self) -> list[int]:
+        """Новый порядок для UIList.filter_items: сортировка по имени без учёта регистра."""
+        if self._order is None:
+            lowered = self._lowered_names()
+            ranked = sorted(range(len(lowered)), key=lowered.__getitem__)
+            order = [0] * len(ranked)
+            for position, index in enumerate(ranked):
+                order[index] = position
+            self._order = order
+        return self._order
+
+    def _lowered_names(self) -> list[str]:
+        if self._lowered is None:
+            self._lowered = [name.lower() for name in self.names]
+        return self._lowered
@@ -0,0 +1,267 @@
+"""Рассылка перезагрузки другим запущенным Blender на этой машине.
+
+Blender с включённой службой слушает локальный TCP-порт (только 127.0.0.1)
+и записывает порт и случайный токен в файл реестра, доступный только
+владельцу. В POSIX это права 0600 на файл и 0700 на каталог реестра; в
+Windows права POSIX не действуют, и файл защищает ACL профиля пользователя,
+в котором лежит каталог настроек Blender (реестр не стоит переносить в
+общедоступную папку). Инициатор упаковывает аддоны один раз, кладёт архивы в общий
+каталог и рассылает остальным запрос; получатель ставит аддоны из готовых
+архивов и отвечает результатами и замерами. Протокол — одна строка JSON в
+каждую сторону, поэтому его можно проверить обычным клиентом на Python:
+
+    peer = broadcast.list_peers(registry_dir)[0]
+    broadcast.send(peer, {"type": "ping"})
+
+Модуль не зависит от bpy.
+"""
+
+import hashlib
+import json
+import os
+import secrets
+import socket
+import socketserver
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import NamedTuple
+
+PROTOCOL_VERSION = 1
+HOST = "127.0.0.1"
+DEFAULT_TIMEOUT = 120.0
+CONNECT_TIMEOUT = 2.0
+MAX_MESSAGE = 16 * 1024 * 1024
+# Общие архивы старше этого возраста (секунды) удаляются при следующей рассылке
+SHARED_MAX_AGE = 3600
+MAX_WORKERS = 8
+
+
+class Peer(NamedTuple):
+    """Запись реестра: другой Blender со службой."""
+    pid: int
+    port: int
+    token: str
+    label: str
+    path: str
+
+
+# ------------------------- ПРОТОКОЛ -------------------------
+
+def encode(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def read_message(rfile) -> dict:
+    """Прочитать одно сообщение (строку JSON) из файлового объекта сокета."""
+    line = rfile.readline(MAX_MESSAGE + 1)
+    if not line.endswith(b"\n"):
+        raise ValueError("сообщение оборвано или слишком велико")
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("сообщение должно быть объектом JSON")
+    return message
+
+
+def send(peer: Peer, message: dict, timeout: float = DEFAULT_TIMEOUT) -> dict:
+    """Отправить запрос одному Blender и дождаться ответа."""
+    request = {**message, "protocol": PROTOCOL_VERSION, "token": peer.token}
+    with socket.create_connection((HOST, peer.port), timeout=CONNECT_TIMEOUT) as sock:
+        sock.settimeout(timeout)
+        sock.sendall(encode(request))
+        with sock.makefile("rb") as rfile:
+            return read_message(rfile)
+
+
+def broadcast(peers, message: dict, timeout: float = DEFAULT_TIMEOUT) -> list[tuple[Peer, dict]]:
+    """Разослать запрос параллельно; вернуть [(получатель, ответ)].
+
+    Недоступный получатель отвечает {"ok": False, "error": ...}; запись
+    реестра завершившегося процесса удаляется.
+    """
+    peers = list(peers)
+    if not peers:
+        return []
+
+    def deliver(peer):
+        try:
+            return send(peer, message, timeout)
+        except ConnectionRefusedError:
+            if not _pid_alive(peer.pid):
+                _remove(peer.path)
+            return {"ok": False, "error": "не отвечает"}
+        except (OSError, ValueError) as e:
+            return {"ok": False, "error": str(e) or type(e).__name__}
+
+    with ThreadPoolExecutor(max_workers=min(len(peers), MAX_WORKERS)) as pool:
+        return list(zip(peers, pool.map(deliver, peers)))
+
+
+# ------------------------- РЕЕСТР -------------------------
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError, SystemError):
+        pass
+    return True
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def list_peers(registry_dir: str, exclude_pid: int = None) -> list[Peer]:
+    """Записи реестра, кроме собственной (exclude_pid, по умолчанию — текущий процесс)."""
+    exclude_pid = os.getpid() if exclude_pid is None else exclude_pid
+    peers = []
+    try:
+        names = sorted(os.listdir(registry_dir))
+    except OSError:
+        return peers
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(registry_dir, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            peer = Peer(int(data["pid"]), int(data["port"]), str(data["token"]),
+                        str(data.get("label", "")), path)
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        if peer.pid != exclude_pid and data.get("protocol") == PROTOCOL_VERSION:
+            peers.append(peer)
+    return peers
+
+
+# ------------------------- СЛУЖБА -------------------------
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            reply = self.server.service.handle(read_message(self.rfile))
+        except Exception as e:
+            reply = {"ok": False, "error": str(e) or type(e).__name__}
+        try:
+            self.wfile.write(encode(reply))
+        except OSError:
+            pass
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = False
+
+
+class BroadcastService:
+    """Приём запросов от других Blender.
+
+    handler(request) вызывается в потоке соединения и возвращает ответ —
+    словарь или Future, который разрешит главный поток; ответ ждёт не дольше
+    timeout секунд.
+    """
+
+    def __init__(self, registry_dir: str, handler, label: str = "", timeout: float = DEFAULT_TIMEOUT):
+        self.registry_dir = registry_dir
+        self.handler = handler
+        self.label = label or f"PID {os.getpid()}"
+        self.timeout = timeout
+        self.token = secrets.token_hex(16)
+        self._server = _Server((HOST, 0), _Handler)
+        self._server.service = self
+        self.port = self._server.server_address[1]
+        self.path = os.path.join(registry_dir, f"{os.getpid()}-{self.port}.json")
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="dev-toolkit-broadcast", daemon=True)
+        self._thread.start()
+        self._register()
+
+    def stop(self):
+        _remove(self.path)
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread = None
+
+    def _register(self):
+        """Записать порт и токен в реестр (файл читает только владелец, см. описание модуля)."""
+        os.makedirs(self.registry_dir, mode=0o700, exist_ok=True)
+        if os.name == "posix":
+            # Каталог мог быть создан раньше с правами по umask
+            os.chmod(self.registry_dir, 0o700)
+        data = {"protocol": PROTOCOL_VERSION, "pid": os.getpid(), "port": self.port,
+                "token": self.token, "label": self.label}
+        # Новый файл, а не перезапись: у оставшегося .tmp права могли быть шире
+        tmp = f"{self.path}.{secrets.token_hex(4)}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def handle(self, request: dict) -> dict:
+        if request.get("protocol") != PROTOCOL_VERSION:
+            return {"ok": False, "error": f"версия протокола {request.get('protocol')} не поддерживается"}
+        if not secrets.compare_digest(str(request.get("token", "")), self.token):
+            return {"ok": False, "error": "неверный токен"}
+        if request.get("type") == "ping":
+            return {"ok": True, "label": self.label, "pid": os.getpid()}
+        reply = self.handler(request)
+        if isinstance(reply, Future):
+            try:
+                reply = reply.result(self.timeout)
+            except FutureTimeoutError:
+                reply.cancel()
+                return {"ok": False, "error": "Blender не успел обработать запрос"}
+        return reply
+
+
+# ------------------------- ОБЩИЕ АРХИВЫ -------------------------
+
+def share_archive(archive, shared_dir: str, addon_name: str) -> str:
+    """Положить архив (packaging.Archive) в общий каталог; вернуть путь.
+
+    Имя файла — хэш содержимого, поэтому одинаковый архив пишется один раз,
+    а получатели не увидят недописанный файл.
+    """
+    data = archive.getvalue()
+    os.makedirs(shared_dir, exist_ok=True)
+    path = os.path.join(shared_dir, f"{addon_name}-{hashlib.sha1(data).hexdigest()[:16]}.zip")
+    if not os.path.exists(path):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return path
+
+
+def prune_shared(shared_dir: str, max_age: float = SHARED_MAX_AGE):
+    """Удалить старые общие архивы."""
+    deadline = time.time() - max_age
+    try:
+        entries = list(os.scandir(shared_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < deadline:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def is_shared(path: str, shared_dir: str) -> bool:
+    """Лежит ли файл в общем каталоге (получатель не ставит архивы откуда попало)."""
+    try:
+        return os.path.commonpath([os.path.realpath(path), os.path.realpath(shared_dir)]) == \
+            os.path.realpath(shared_dir)
+    except ValueError:
+        return False
@@ -0,0 +1,179 @@
+"""Кэш байткода аддона для поставки .pyc вместе с исходниками.
+
+Каждый модуль компилируется в .pyc с проверкой по хэшу исходника
+(PEP 552, CHECKED_HASH) для текущей версии Python. Файлы кэша хранятся на
+диске под ключом — хэшем содержимого исходника, поэтому переживают
+перезапуск Blender, а перекомпилируются только изменившиеся модули.
+Компиляция идёт в общем пуле процессов (workers), так как compile() держит
+GIL; если пул поднять не удалось, модули компилируются в текущем процессе.
+Модуль не зависит от bpy.
+"""
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import zlib
+
+from . import workers
+from .packaging import CachedEntry, encode_bytes
+
+CACHE_TAG = sys.implementation.cache_tag
+
+_PYC_MODE = 0o100644
+# Флаги заголовка .pyc (PEP 552): байткод по хэшу исходника, хэш проверяется при импорте
+_CHECKED_HASH_FLAGS = 0b11
+
+
+def is_supported() -> bool:
+    """Можно ли поставлять байткод в этом интерпретаторе."""
+    return CACHE_TAG is not None
+
+
+def pyc_name(rel: str) -> str:
+    """Путь .pyc внутри пакета для исходника rel (как importlib.util.cache_from_source)."""
+    head, _, tail = rel.rpartition("/")
+    opt = f".opt-{sys.flags.optimize}" if sys.flags.optimize else ""
+    name = f"__pycache__/{tail[:-3]}.{CACHE_TAG}{opt}.pyc"
+    return f"{head}/{name}" if head else name
+
+
+# ------------------------- КОМПИЛЯЦИЯ -------------------------
+
+def _compile(source: str, target: str, display: str, digest: str) -> bool:
+    # Ошибку возвращаем, а не поднимаем: исключение из процесса пула может его сломать
+    try:
+        with open(source, "rb") as f:
+            data = f.read()
+    except OSError:
+        return False
+    # Файл сохранили после упаковки: .pyc под этим хэшем был бы от другого исходника
+    if hashlib.blake2b(data, digest_size=16).hexdigest() != digest:
+        return False
+    try:
+        code = compile(data, display, "exec", dont_inherit=True)
+    except (SyntaxError, ValueError):
+        return False
+    header = importlib.util.MAGIC_NUMBER + _CHECKED_HASH_FLAGS.to_bytes(4, "little")
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header + importlib.util.source_hash(data) + marshal.dumps(code))
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+def compile_many(jobs: list[tuple[str, str, str, str]]) -> list[bool]:
+    """Скомпилировать (исходник, .pyc, имя для трассировок, хэш исходника); вернуть успех по каждому.
+
+    Компилируются ровно те байты, хэш которых совпал с ожидаемым: если файл
+    успели изменить, .pyc не пишется.
+    """
+    return workers.run_many(_compile, jobs)
+
+
+# ------------------------- КЭШ -------------------------
+
+class BytecodeCache:
+    """.pyc одного аддона: на диске по хэшу исходника, в памяти — готовые записи ZIP."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.compiled = 0
+        self.hits = 0
+        self._entries: dict[str, CachedEntry] = {}
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest + ".pyc")
+
+    def records(self, arc_root: str, sources, level: int) -> list[tuple[str, CachedEntry]]:
+        """Записи .pyc для исходников (отн. путь, полный путь, запись кэша упаковки).
+
+        Модули с синтаксическими ошибками пропускаются: Python скомпилирует
+        их сам при импорте и покажет ошибку.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        jobs = []
+        for rel, path, source_entry in sources:
+            digest = source_entry.digest
+            if digest in self._entries or os.path.exists(self.path(digest)):
+                continue
+            jobs.append((path, self.path(digest), f"{arc_root}/{rel}", digest))
+        self.compiled += sum(compile_many(jobs))
+
+        records = []
+        alive = set()
+        for rel, _, source_entry in sources:
+            digest = source_entry.digest
+            entry = self._entry(rel, digest, level)
+            if entry is None:
+                continue
+            alive.add(digest)
+            records.append((f"{arc_root}/{pyc_name(rel)}", entry))
+        self._forget_missing(alive)
+        return records
+
+    def _entry(self, rel: str, digest: str, level: int) -> CachedEntry | None:
+        entry = self._entries.get(digest)
+        if entry is not None and entry.level == level:
+            self.hits += 1
+            return entry
+        target = self.path(digest)
+        try:
+            with open(target, "rb") as f:
+                raw = f.read()
+            mtime_ns = os.stat(target).st_mtime_ns
+        except OSError:
+            return None
+        method, data = encode_bytes(rel, raw, level)
+        entry = self._entries[digest] = CachedEntry(
+            size=len(raw), mtime_ns=mtime_ns, digest=digest, crc=zlib.crc32(raw),
+            method=method, level=level, data=data, mode=_PYC_MODE,
+        )
+        return entry
+
+    def _forget_missing(self, alive: set):
+        """Забыть байткод исходников, которых больше нет в аддоне (и в памяти, и на диске)."""
+        for digest in [d for d in self._entries if d not in alive]:
+            del self._entries[digest]
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".pyc") and name[:-4] not in alive:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def stats(self) -> dict:
+        return {"compiled": self.compiled, "hits": self.hits, "entries": len(self._entries)}
+
+
+_caches: dict[str, BytecodeCache] = {}
+
+
+def get_bytecode_cache(addon_name: str, root: str) -> BytecodeCache:
+    """Кэш байткода аддона в root/<тег интерпретатора>/<аддон>."""
+    directory = os.path.join(root, CACHE_TAG, addon_name)
+    cache = _caches.get(addon_name)
+    if cache is None or cache.directory != directory:
+        cache = _caches[addon_name] = BytecodeCache(directory)
+    return cache
+
+
+def find_bytecode_cache(addon_name: str) -> BytecodeCache | None:
+    """Уже созданный кэш байткода аддона (без обращения к диску)."""
+    return _caches.get(addon_name)
+
+
+def drop_bytecode_cache(addon_name: str):
+    _caches.pop(addon_name, None)
@@ -0,0 +1,76 @@
+"""Поиск аддонов в рабочем каталоге (монорепозитории).
+
+Аддоном считается каталог с __init__.py, в котором на верхнем уровне
+объявлен bl_info. Каталоги обходятся параллельно: каждый просматривается
+отдельной задачей пула, внутрь найденного аддона поиск не спускается.
+Модуль не зависит от bpy.
+"""
+
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+from . import walker
+
+DEFAULT_DEPTH = 4
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_BL_INFO = re.compile(rb"^bl_info\s*[:=]", re.MULTILINE)
+
+
+class FoundAddon(NamedTuple):
+    name: str
+    path: str
+
+
+def has_bl_info(init_path: str) -> bool:
+    """Объявлен ли в файле bl_info на верхнем уровне."""
+    try:
+        with open(init_path, "rb") as f:
+            return _BL_INFO.search(f.read()) is not None
+    except OSError:
+        return False
+
+
+def _scan_dir(path: str) -> tuple[bool, list[str]]:
+    """Просмотреть один каталог: (это аддон, подкаталоги для дальнейшего поиска)."""
+    init_path = os.path.join(path, "__init__.py")
+    if os.path.isfile(init_path) and has_bl_info(init_path):
+        return True, []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name.startswith(".") or entry.name in walker.SKIP_DIRS:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+    except OSError:
+        pass
+    return False, subdirs
+
+
+def find_addons(root: str, max_depth: int = DEFAULT_DEPTH) -> list[FoundAddon]:
+    """Найти аддоны в root не глубже max_depth уровней; результат отсортирован по пути.
+
+    Каталоги, имя которых не годится для имени модуля Python, пропускаются.
+    """
+    root = os.path.normpath(root)
+    found = []
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        pending = {pool.submit(_scan_dir, root): (root, 0)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path, depth = pending.pop(future)
+                is_addon, subdirs = future.result()
+                if is_addon:
+                    name = os.path.basename(path)
+                    if name.isidentifier():
+                        found.append(FoundAddon(name, path))
+                elif depth < max_depth:
+                    for subdir in subdirs:
+                        pending[pool.submit(_scan_dir, subdir)] = (subdir, depth + 1)
+    found.sort(key=lambda addon: addon.path)
+    return found
@@ -0,0 +1,218 @@
+"""Выборочная горячая перезагрузка изменившихся модулей аддона.
+
+По исходникам строится граф импортов внутри аддона. Перезагружаются только
+изменившиеся модули и те, что от них зависят, в топологическом порядке
+через importlib.reload, после чего заново вызывается register() пакета.
+Если выборочная перезагрузка невозможна, план не строится и вызывающая
+сторона выполняет полную перезагрузку. Модуль не зависит от bpy.
+"""
+
+import ast
+import importlib
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+
+from . import walker
+
+
+@dataclass
+class ReloadPlan:
+    """План выборочной перезагрузки аддона."""
+    addon_name: str
+    source_dir: str
+    changed_files: list[str]
+    modules: list[str]
+    fingerprints: dict = field(repr=False)
+
+
+# Отпечатки исходников на момент последней успешной загрузки аддона
+_snapshots: dict[str, dict] = {}
+
+
+# ------------------------- ОТПЕЧАТКИ -------------------------
+
+def fingerprint_tree(source_dir: str, patterns=()) -> dict[str, tuple[int, int]]:
+    """Снять (размер, mtime) всех упаковываемых файлов аддона."""
+    return {f.rel: (f.stat.st_size, f.stat.st_mtime_ns)
+            for f in walker.iter_source(source_dir, patterns)}
+
+
+def remember_state(addon_name: str, fingerprints: dict):
+    """Запомнить состояние исходников, с которым аддон успешно загружен."""
+    _snapshots[addon_name] = fingerprints
+
+
+def forget_state(addon_name: str):
+    _snapshots.pop(addon_name, None)
+
+
+def get_state(addon_name: str):
+    """Отпечатки последней успешной загрузки аддона или None."""
+    return _snapshots.get(addon_name)
+
+
+def restore_states(states: dict):
+    """Восстановить отпечатки прошлой сессии, не затирая снятые в этой."""
+    for addon_name, fingerprints in states.items():
+        _snapshots.setdefault(addon_name, fingerprints)
+
+
+def has_changed(addon_name: str, source_dir: str, patterns=()) -> bool:
+    """Изменились ли исходники с последней успешной загрузки (или её не было)."""
+    previous = _snapshots.get(addon_name)
+    return previous is None or fingerprint_tree(source_dir, patterns) != previous
+
+
+# ------------------------- ГРАФ ИМПОРТОВ -------------------------
+
+def module_name(addon_name: str, rel: str):
+    """Имя модуля для файла аддона или None, если это не .py."""
+    if not rel.endswith(".py"):
+        return None
+    parts = rel[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    return ".".join([addon_name, *parts])
+
+
+def _resolve_from(modname: str, is_package: bool, level: int, module) -> str:
+    if level == 0:
+        return module or ""
+    base = modname.split(".")
+    if not is_package:
+        base = base[:-1]
+    if level > 1:
+        base = base[:len(base) - (level - 1)]
+    if module:
+        base = base + module.split(".")
+    return ".".join(base)
+
+
+def _nearest_known(name: str, known) -> str:
+    while name and name not in known:
+        name = name.rpartition(".")[0]
+    return name
+
+
+def scan_imports(path: str, modname: str, is_package: bool, known) -> set[str]:
+    """Найти модули аддона, которые импортирует файл (включая ленивые импорты)."""
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), path)
+    deps = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            targets = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = _resolve_from(modname, is_package, node.level, node.module)
+            # from pkg import sub — зависимость от подмодуля, а не от пакета
+            targets = [f"{base}.{alias.name}" if f"{base}.{alias.name}" in known else base
+                       for alias in node.names]
+        else:
+            continue
+        for target in targets:
+            dep = _nearest_known(target, known)
+            if dep and dep != modname:
+                deps.add(dep)
+    return deps
+
+
+def build_import_graph(source_dir: str, addon_name: str, patterns=()) -> dict[str, set[str]]:
+    """Граф импортов внутри аддона: модуль -> модули аддона, от которых он зависит."""
+    files = {}
+    for path, rel, _ in walker.iter_source(source_dir, patterns):
+        name = module_name(addon_name, rel)
+        if name is not None:
+            files[name] = (path, rel.endswith("__init__.py"))
+    return {name: scan_imports(path, name, is_package, files)
+            for name, (path, is_package) in files.items()}
+
+
+def reload_order(graph: dict[str, set[str]], changed) -> list[str]:
+    """Изменившиеся модули и их зависимые в порядке перезагрузки (сначала зависимости).
+
+    При циклических импортах среди затронутых модулей поднимается ValueError.
+    """
+    dependents = {name: set() for name in graph}
+    for name, deps in graph.items():
+        for dep in deps:
+            dependents[dep].add(name)
+
+    affected = set()
+    stack = [name for name in changed if name in graph]
+    while stack:
+        name = stack.pop()
+        if name not in affected:
+            affected.add(name)
+            stack.extend(dependents[name])
+
+    pending = {name: len(graph[name] & affected) for name in affected}
+    ready = sorted(name for name, count in pending.items() if count == 0)
+    order = []
+    while ready:
+        name = ready.pop(0)
+        order.append(name)
+        for dependent in sorted(dependents[name]):
+            if dependent in pending:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    ready.append(dependent)
+    if len(order) != len(affected):
+        raise ValueError("Циклические импорты среди изменившихся модулей")
+    return order
+
+
+# ------------------------- ПЕРЕЗАГРУЗКА -------------------------
+
+def plan_reload(addon_name: str, source_dir: str, patterns=()):
+    """Построить план выборочной перезагрузки или вернуть None.
+
+    None означает, что нужна полная перезагрузка: аддон ещё не загружался
+    через Developer Toolkit, не импортирован, набор файлов изменился или
+    граф импортов не удалось построить.
+    """
+    previous = _snapshots.get(addon_name)
+    if previous is None or addon_name not in sys.modules:
+        return None
+    current = fingerprint_tree(source_dir, patterns)
+    if current.keys() != previous.keys():
+        return None
+    changed = sorted(rel for rel, fp in current.items() if previous[rel] != fp)
+
+    changed_modules = [m for m in (module_name(addon_name, rel) for rel in changed) if m]
+    try:
+        graph = build_import_graph(source_dir, addon_name, patterns)
+        order = reload_order(graph, changed_modules)
+    except (SyntaxError, ValueError):
+        return None
+    return ReloadPlan(addon_name, source_dir, changed, order, current)
+
+
+def apply_plan(plan: ReloadPlan, skip_unregister: bool = False):
+    """Выполнить план: unregister(), reload изменившихся модулей, register().
+
+    Если аддон загружен не из исходников (установка из ZIP), изменившиеся
+    файлы сначала копируются поверх установленной копии.
+    """
+    top = sys.modules[plan.addon_name]
+    installed_root = os.path.dirname(top.__file__)
+    if os.path.realpath(installed_root) != os.path.realpath(plan.source_dir):
+        for rel in plan.changed_files:
+            shutil.copyfile(os.path.join(plan.source_dir, rel), os.path.join(installed_root, rel))
+
+    if not skip_unregister:
+        unregister = getattr(top, "unregister", None)
+        if callable(unregister):
+            unregister()
+
+    importlib.invalidate_caches()
+    for name in plan.modules:
+        mod = sys.modules.get(name)
+        if mod is not None:
+            importlib.reload(mod)
+
+    register = getattr(sys.modules[plan.addon_name], "register", None)
+    if callable(register):
+        register()
+    remember_state(plan.addon_name, plan.fingerprints)
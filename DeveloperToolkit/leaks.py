@@ -0,0 +1,196 @@
+"""Диагностика утечек при многократной перезагрузке аддонов.
+
+Перед удалением модулей аддона из sys.modules на них, а также на классы и
+функции, объявленные в них, берутся слабые ссылки. После перезагрузки и
+сборки мусора всё, что пережило выгрузку, попадает в отчёт вместе с
+описанием ссылающихся объектов. Рост памяти между циклами считается по
+снимкам tracemalloc. Модуль не зависит от bpy.
+"""
+
+import gc
+import tracemalloc
+import types
+import weakref
+from dataclasses import dataclass, field
+
+TRACE_FRAMES = 1
+TOP_ALLOCATIONS = 5
+MAX_SURVIVORS = 20
+MAX_REFERRERS = 4
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+)
+
+
+@dataclass
+class Survivor:
+    """Объект выгруженной версии аддона, который остался в памяти."""
+    kind: str
+    name: str
+    cycle: int
+    referrers: list[str]
+
+
+@dataclass
+class LeakReport:
+    """Итог одного цикла перезагрузки аддона."""
+    addon_name: str
+    cycle: int
+    survivors: list[Survivor] = field(default_factory=list)
+    alive: int = 0
+    growth: int = 0
+    top_allocations: list[tuple[str, int]] = field(default_factory=list)
+
+
+# ------------------------- ССЫЛАЮЩИЕСЯ ОБЪЕКТЫ -------------------------
+
+def describe(obj, known: dict) -> str:
+    """Короткое описание объекта, который держит ссылку."""
+    label = known.get(id(obj))
+    if label:
+        return label
+    if isinstance(obj, types.ModuleType):
+        return f"модуль {obj.__name__}"
+    if isinstance(obj, dict):
+        if "__name__" in obj and "__builtins__" in obj:
+            return f"глобальные переменные модуля {obj['__name__']}"
+        for owner in gc.get_referrers(obj):
+            if isinstance(owner, type) or getattr(owner, "__dict__", None) is not obj:
+                continue
+            return f"атрибуты объекта {type(owner).__qualname__}"
+        return f"словарь ({len(obj)} ключей)"
+    if isinstance(obj, types.FunctionType):
+        return f"функция {obj.__module__}.{obj.__qualname__}"
+    if isinstance(obj, types.MethodType):
+        return f"метод {obj.__func__.__qualname__}"
+    if isinstance(obj, type):
+        return f"класс {obj.__module__}.{obj.__qualname__}"
+    if isinstance(obj, types.CellType):
+        return "ячейка замыкания"
+    if isinstance(obj, (list, tuple, set)):
+        return f"{type(obj).__name__} ({len(obj)} элементов)"
+    return type(obj).__qualname__
+
+
+def find_referrers(obj, known: dict, limit: int = MAX_REFERRERS) -> list[str]:
+    """Кто ссылается на obj (без кадров стека самой диагностики)."""
+    result = []
+    for ref in gc.get_referrers(obj):
+        if isinstance(ref, types.FrameType):
+            continue
+        # Собственные ссылки класса: __mro__ и дескрипторы __dict__/__weakref__
+        if ref is getattr(obj, "__mro__", None) or getattr(ref, "__objclass__", None) is obj:
+            continue
+        result.append(describe(ref, known))
+        if len(result) >= limit:
+            break
+    return result
+
+
+# ------------------------- ТРЕКЕР -------------------------
+
+class LeakTracker:
+    """Слабые ссылки на выгруженные версии аддонов и снимки памяти по циклам."""
+
+    def __init__(self):
+        self.active = False
+        self._started_tracing = False
+        # аддон -> [(вид, имя, цикл, weakref)]
+        self._refs: dict[str, list[tuple[str, str, int, weakref.ref]]] = {}
+        self._cycles: dict[str, int] = {}
+        self._snapshots: dict[str, tracemalloc.Snapshot] = {}
+        self.reports: dict[str, LeakReport] = {}
+
+    def enable(self):
+        self.active = True
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            self._started_tracing = True
+
+    def disable(self):
+        self.active = False
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.clear()
+
+    def clear(self):
+        self._refs.clear()
+        self._cycles.clear()
+        self._snapshots.clear()
+        self.reports.clear()
+
+    def forget(self, addon_name: str):
+        for registry in (self._refs, self._cycles, self._snapshots, self.reports):
+            registry.pop(addon_name, None)
+
+    def begin(self, addon_name: str):
+        """Начало цикла: базовый снимок памяти, если его ещё нет."""
+        if self.active and addon_name not in self._snapshots and tracemalloc.is_tracing():
+            self._snapshots[addon_name] = self._take_snapshot()
+
+    def track(self, addon_name: str, modules: dict):
+        """Запомнить выгружаемые модули аддона, их классы и функции."""
+        if not self.active:
+            return
+        cycle = self._cycles.get(addon_name, 0) + 1
+        refs = self._refs.setdefault(addon_name, [])
+        for modname, module in modules.items():
+            objects = [("модуль", modname, module)]
+            for value in list(vars(module).values()):
+                if isinstance(value, (type, types.FunctionType)) and getattr(value, "__module__", None) == modname:
+                    kind = "класс" if isinstance(value, type) else "функция"
+                    objects.append((kind, f"{modname}.{value.__qualname__}", value))
+            for kind, name, obj in objects:
+                try:
+                    refs.append((kind, name, cycle, weakref.ref(obj)))
+                except TypeError:
+                    pass
+
+    def check(self, addon_name: str, known: dict = None) -> LeakReport | None:
+        """Конец цикла: собрать мусор, найти выживших и посчитать рост памяти."""
+        if not self.active:
+            return None
+        cycle = self._cycles[addon_name] = self._cycles.get(addon_name, 0) + 1
+        gc.collect()
+        report = LeakReport(addon_name, cycle)
+        alive = []
+        survivors = []
+        for entry in self._refs.get(addon_name, ()):
+            obj = entry[3]()
+            if obj is None:
+                continue
+            alive.append(entry)
+            if len(survivors) < MAX_SURVIVORS * 5:
+                survivors.append(Survivor(entry[0], entry[1], entry[2], find_referrers(obj, known or {})))
+            del obj
+        self._refs[addon_name] = alive
+        report.alive = len(alive)
+        # Сначала те, кого держит что-то вне самого аддона: это и есть причины утечки
+        internal = (f"глобальные переменные модуля {addon_name}", f"модуль {addon_name}")
+        survivors.sort(key=lambda s: all(ref.startswith(internal) for ref in s.referrers))
+        report.survivors = survivors[:MAX_SURVIVORS]
+
+        if tracemalloc.is_tracing():
+            snapshot = self._take_snapshot()
+            previous = self._snapshots.get(addon_name)
+            if previous is not None:
+                stats = snapshot.compare_to(previous, "lineno")
+                report.growth = sum(stat.size_diff for stat in stats)
+                report.top_allocations = [
+                    (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff)
+                    for stat in stats[:TOP_ALLOCATIONS] if stat.size_diff > 0
+                ]
+            self._snapshots[addon_name] = snapshot
+
+        self.reports[addon_name] = report
+        return report
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+
+
+tracker = LeakTracker()
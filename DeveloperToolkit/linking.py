@@ -0,0 +1,100 @@
+"""Связанная установка: ссылка на исходники аддона в каталоге аддонов Blender.
+
+Вместо цикла ZIP → addon_install директория с исходниками один раз
+подключается в каталог пользовательских аддонов символической ссылкой
+(на Windows без прав на симлинки — junction). Дальнейшие перезагрузки
+обходятся без архива. Модуль не зависит от bpy.
+"""
+
+import os
+import shutil
+import stat
+
+
+def link_path(addons_dir: str, addon_name: str) -> str:
+    """Путь, по которому аддон виден Blender в каталоге аддонов."""
+    return os.path.join(addons_dir, addon_name)
+
+
+def is_link(path: str) -> bool:
+    """Является ли путь симлинком или junction (любой точкой повторного разбора Windows).
+
+    os.path.isjunction появился только в Python 3.12, поэтому junction
+    распознаётся по атрибутам файла из lstat, которые есть во всех версиях.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if stat.S_ISLNK(st.st_mode):
+        return True
+    return bool(getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except (IsADirectoryError, PermissionError):
+        # junction на Windows удаляется как пустой каталог
+        os.rmdir(path)
+
+
+def remove_path(path: str):
+    """Удалить аддон из каталога аддонов: ссылку — только саму ссылку, копию — целиком.
+
+    shutil.rmtree по ссылке или junction мог бы пройти насквозь и удалить
+    исходники, поэтому каталог удаляется рекурсивно, только если это не ссылка.
+    """
+    if is_link(path):
+        _unlink(path)
+    elif os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def is_linked(addons_dir: str, addon_name: str, source_dir: str) -> bool:
+    """Проверить, что по пути аддона Blender видит именно source_dir.
+
+    Исходники, лежащие прямо в каталоге аддонов, тоже считаются подключёнными.
+    """
+    target = link_path(addons_dir, addon_name)
+    if not os.path.exists(target):
+        return False
+    return os.path.realpath(target) == os.path.realpath(source_dir)
+
+
+def remove_link(addons_dir: str, addon_name: str) -> bool:
+    """Удалить ссылку на исходники, не трогая сами исходники.
+
+    Возвращает True, если ссылка была удалена. Обычную установленную копию
+    аддона функция не удаляет.
+    """
+    target = link_path(addons_dir, addon_name)
+    if not is_link(target):
+        return False
+    _unlink(target)
+    return True
+
+
+def ensure_link(addons_dir: str, addon_name: str, source_dir: str):
+    """Подключить исходники аддона в каталог аддонов ссылкой.
+
+    Прежняя ссылка заменяется, установленная из ZIP копия удаляется.
+    Ошибки файловой системы пробрасываются как OSError.
+    """
+    os.makedirs(addons_dir, exist_ok=True)
+    target = link_path(addons_dir, addon_name)
+    source_dir = os.path.abspath(source_dir)
+    if is_linked(addons_dir, addon_name, source_dir):
+        return
+
+    remove_path(target)
+
+    try:
+        os.symlink(source_dir, target, target_is_directory=True)
+    except OSError:
+        if os.name != "nt":
+            raise
+        import _winapi
+        _winapi.CreateJunction(source_dir, target)
@@ -0,0 +1,545 @@
+"""Упаковка исходников аддона в ZIP с инкрементальным кэшем сжатых записей.
+
+Модуль не зависит от bpy: кэш хранит уже сжатые записи архива, поэтому при
+повторной упаковке заново сжимаются только изменившиеся файлы, а архив
+собирается из готовых кусков. Крупные файлы сжимаются параллельно в пуле
+потоков (zlib отпускает GIL), несжимаемые сохраняются без deflate. Архив
+собирается в памяти и распаковывается в каталог аддонов прямо оттуда; на
+диск (во временный файл с уникальным именем) он попадает, только если не
+влезает в лимит памяти. Сжатые записи сохраняются в каталог cache_root,
+поэтому после перезапуска Blender файлы заново не сжимаются.
+"""
+
+import hashlib
+import io
+import os
+import struct
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from . import linking, walker
+
+
+# ------------------------- КОНСТАНТЫ -------------------------
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_MEMORY_CAP = 256 * 1024 * 1024
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+DEFAULT_LEVEL = 6
+
+# Уже сжатые или не ужимающиеся форматы: кладём в архив как есть
+INCOMPRESSIBLE_SUFFIXES = {
+    ".whl", ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".zst",
+    ".png", ".jpg", ".jpeg", ".webp", ".mp3", ".ogg", ".mp4",
+    ".so", ".pyd", ".dll", ".dylib",
+}
+PARALLEL_MIN_SIZE = 256 * 1024
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+_SAMPLE_SIZE = 64 * 1024
+_SAMPLE_RATIO = 0.97
+
+_HASH_CHUNK = 1024 * 1024
+_ZIP32_LIMIT = 0xFFFFFFFF
+_ZIP_MAX_ENTRIES = 0xFFFF
+
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+
+
+# ------------------------- КЭШ -------------------------
+
+@dataclass
+class CachedEntry:
+    """Сжатая запись архива вместе с отпечатком исходного файла."""
+    size: int
+    mtime_ns: int
+    digest: str
+    crc: int
+    method: int
+    level: int
+    data: bytes
+    mode: int
+
+
+def file_digest(path: str) -> str:
+    """Хэш содержимого файла."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def compress_bytes(raw: bytes, level: int = DEFAULT_LEVEL) -> bytes:
+    """Сжать данные «сырым» deflate, как этого ожидает ZIP."""
+    co = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return co.compress(raw) + co.flush()
+
+
+def is_incompressible(name: str, raw: bytes) -> bool:
+    """Угадать несжимаемый файл по расширению или по пробному сжатию куска."""
+    if os.path.splitext(name)[1].lower() in INCOMPRESSIBLE_SUFFIXES:
+        return True
+    if len(raw) < PARALLEL_MIN_SIZE:
+        return False
+    middle = len(raw) // 2
+    sample = raw[middle:middle + _SAMPLE_SIZE]
+    return len(compress_bytes(sample, 1)) > len(sample) * _SAMPLE_RATIO
+
+
+def encode_bytes(name: str, raw: bytes, level: int) -> tuple[int, bytes]:
+    """Выбрать метод хранения файла и вернуть (метод, данные записи)."""
+    if level == 0 or is_incompressible(name, raw):
+        return ZIP_STORED, raw
+    data = compress_bytes(raw, level)
+    if len(data) >= len(raw):
+        return ZIP_STORED, raw
+    return ZIP_DEFLATED, data
+
+
+class CacheBudget:
+    """Общий лимит объёма кэшей упаковки всех аддонов (LRU по всем записям).
+
+    Лимит один на процесс: сколько бы аддонов ни было в списке, сжатые
+    записи вместе занимают не больше max_bytes, а вытесняются самые давно
+    использованные записи любого аддона. Один замок защищает и порядок, и
+    записи всех кэшей, поэтому вытеснение из чужого кэша не требует
+    второго замка.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        # (кэш, отн. путь) -> размер сжатых данных; начало — давно не использованные
+        self._order: "OrderedDict[tuple[PackageCache, str], int]" = OrderedDict()
+
+    def touch(self, cache: "PackageCache", rel: str):
+        self._order.move_to_end((cache, rel))
+
+    def add(self, cache: "PackageCache", rel: str, size: int):
+        self.remove(cache, rel)
+        self._order[(cache, rel)] = size
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._order) > 1:
+            (owner, evicted), size = self._order.popitem(last=False)
+            self.total_bytes -= size
+            owner._evict(evicted)
+
+    def remove(self, cache: "PackageCache", rel: str):
+        self.total_bytes -= self._order.pop((cache, rel), 0)
+
+
+budget = CacheBudget()
+
+
+# Заголовок сжатой записи на диске: CRC-32 и размер исходного файла, метод сжатия
+_DISK_HEADER = struct.Struct("<IQB")
+
+
+class PackageCache:
+    """Кэш сжатых записей одного аддона; объём ограничен общим бюджетом (budget).
+
+    С directory записи ещё и лежат на диске по хэшу исходника: запись,
+    вытесненная из памяти или потерянная с перезапуском, подхватывается
+    оттуда без повторного сжатия.
+    """
+
+    def __init__(self, level: int = DEFAULT_LEVEL, budget: CacheBudget = budget, directory: str = None):
+        self.level = level
+        self.budget = budget
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.restored = 0
+        self.evictions = 0
+        self._entries: dict[str, CachedEntry] = {}
+        self._bytes = 0
+        self._lock = budget.lock
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def get_entry(self, path: str, rel: str, st: os.stat_result) -> CachedEntry:
+        """Вернуть сжатую запись для файла, пересжимая его только при изменении.
+
+        Совпадение размера и mtime считается попаданием без чтения файла.
+        Если они отличаются, сравнивается хэш содержимого: файл, который
+        только «потрогали» (git checkout, сохранение без правок), не сжимается
+        повторно; запись с тем же хэшем берётся и с диска (directory). Смена
+        уровня сжатия делает записи недействительными.
+        Метод безопасно вызывать из нескольких потоков.
+        """
+        level = self.level
+        with self._lock:
+            entry = self._entries.get(rel)
+            if (entry is not None and entry.level == level
+                    and entry.size == st.st_size and entry.mtime_ns == st.st_mtime_ns):
+                self.budget.touch(self, rel)
+                self.hits += 1
+                return entry
+
+        digest = file_digest(path)
+        with self._lock:
+            entry = self._entries.get(rel)
+            if entry is not None and entry.level == level and entry.digest == digest:
+                entry.size = st.st_size
+                entry.mtime_ns = st.st_mtime_ns
+                entry.mode = st.st_mode
+                self.budget.touch(self, rel)
+                self.hits += 1
+                return entry
+
+        entry = self._load(digest, level, st)
+        restored = entry is not None
+        if not restored:
+            with open(path, "rb") as f:
+                raw = f.read()
+            method, data = encode_bytes(rel, raw, level)
+            entry = CachedEntry(
+                size=len(raw),
+                mtime_ns=st.st_mtime_ns,
+                digest=digest,
+                crc=zlib.crc32(raw),
+                method=method,
+                level=level,
+                data=data,
+                mode=st.st_mode,
+            )
+            self._save(entry)
+        with self._lock:
+            if restored:
+                self.restored += 1
+            else:
+                self.misses += 1
+            self._store(rel, entry)
+        return entry
+
+    def disk_path(self, digest: str, level: int) -> str:
+        return os.path.join(self.directory, f"{digest}-{level}.bin")
+
+    def _load(self, digest: str, level: int, st: os.stat_result) -> CachedEntry | None:
+        """Сжатая запись с диска по хэшу исходника; None, если её там нет."""
+        if self.directory is None:
+            return None
+        try:
+            with open(self.disk_path(digest, level), "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        if len(blob) < _DISK_HEADER.size:
+            return None
+        crc, size, method = _DISK_HEADER.unpack_from(blob)
+        if size != st.st_size:
+            return None
+        return CachedEntry(size=size, mtime_ns=st.st_mtime_ns, digest=digest, crc=crc,
+                           method=method, level=level, data=blob[_DISK_HEADER.size:], mode=st.st_mode)
+
+    def _save(self, entry: CachedEntry):
+        """Сохранить запись на диск; ошибки записи не мешают упаковке."""
+        if self.directory is None:
+            return
+        target = self.disk_path(entry.digest, entry.level)
+        # Имя с потоком и процессом: запись целиком появляется через os.replace
+        tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(_DISK_HEADER.pack(entry.crc, entry.size, entry.method))
+                f.write(entry.data)
+            os.replace(tmp, target)
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _store(self, rel: str, entry: CachedEntry):
+        old = self._entries.pop(rel, None)
+        if old is not None:
+            self._bytes -= len(old.data)
+        self._entries[rel] = entry
+        self._bytes += len(entry.data)
+        self.budget.add(self, rel, len(entry.data))
+
+    def _evict(self, rel: str):
+        # Вызывается бюджетом под общим замком
+        self._bytes -= len(self._entries.pop(rel).data)
+        self.evictions += 1
+
+    def forget_missing(self, alive: dict):
+        """Удалить записи файлов, которых больше нет в исходниках (alive: отн. путь -> хэш).
+
+        С диска уходят и записи прежних версий файлов и других уровней сжатия.
+        """
+        with self._lock:
+            for rel in [r for r in self._entries if r not in alive]:
+                self._bytes -= len(self._entries.pop(rel).data)
+                self.budget.remove(self, rel)
+        if self.directory is None:
+            return
+        keep = {f"{digest}-{self.level}.bin" for digest in alive.values()}
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith(".bin") and name not in keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def clear(self):
+        with self._lock:
+            for rel in self._entries:
+                self.budget.remove(self, rel)
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Счётчики кэша для отображения и отладки."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "restored": self.restored,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+        }
+
+
+_caches: dict[str, PackageCache] = {}
+# Каталог сжатых записей между сессиями (задаёт тулкит при регистрации); None — только память
+cache_root: str | None = None
+
+
+def get_package_cache(addon_name: str) -> PackageCache:
+    """Вернуть (создав при необходимости) кэш упаковки аддона в cache_root/<аддон>."""
+    directory = os.path.join(cache_root, addon_name) if cache_root else None
+    cache = _caches.get(addon_name)
+    if cache is None or cache.directory != directory:
+        if cache is not None:
+            cache.clear()
+        cache = _caches[addon_name] = PackageCache(directory=directory)
+    return cache
+
+
+def drop_package_cache(addon_name: str):
+    """Забыть кэш упаковки аддона (например, при удалении из списка)."""
+    cache = _caches.pop(addon_name, None)
+    if cache is not None:
+        cache.clear()
+
+
+# ------------------------- ЗАПИСЬ ZIP -------------------------
+
+def _dos_pack(date_time) -> tuple[int, int]:
+    year, month, day, hour, minute, second = date_time[:6]
+    year = max(year, 1980)
+    dos_date = ((year - 1980) << 9) | (month << 5) | day
+    dos_time = (hour << 11) | (minute << 5) | (second // 2)
+    return dos_time, dos_date
+
+
+def _dos_datetime(mtime: float) -> tuple[int, int]:
+    return _dos_pack(time.localtime(mtime))
+
+
+def write_zip(fp, records, date_time=None, comment: bytes = b""):
+    """Записать ZIP из готовых сжатых записей.
+
+    records — последовательность (имя в архиве, CachedEntry). Используется
+    только формат ZIP32; при превышении его пределов поднимается ValueError,
+    и вызывающая сторона должна упаковать архив штатным zipfile. date_time —
+    общая дата всех записей (как у zipfile.ZipInfo) вместо mtime файлов;
+    comment — комментарий архива.
+    """
+    records = list(records)
+    if len(records) > _ZIP_MAX_ENTRIES:
+        raise ValueError("Слишком много файлов для ZIP32")
+    if len(comment) > 0xFFFF:
+        raise ValueError("Слишком длинный комментарий архива")
+    fixed = _dos_pack(date_time) if date_time else None
+    central = []
+    offset = 0
+    for arcname, entry in records:
+        if entry.size > _ZIP32_LIMIT or len(entry.data) > _ZIP32_LIMIT or offset > _ZIP32_LIMIT:
+            raise ValueError(f"Файл {arcname} не помещается в ZIP32")
+        name = arcname.encode("utf-8")
+        flags = 0x800 if not arcname.isascii() else 0
+        dos_time, dos_date = fixed or _dos_datetime(entry.mtime_ns / 1e9)
+        fp.write(_LOCAL_HEADER.pack(
+            0x04034b50, 20, flags, entry.method, dos_time, dos_date,
+            entry.crc, len(entry.data), entry.size, len(name), 0,
+        ))
+        fp.write(name)
+        fp.write(entry.data)
+        central.append(_CENTRAL_HEADER.pack(
+            0x02014b50, (3 << 8) | 20, 20, flags, entry.method, dos_time, dos_date,
+            entry.crc, len(entry.data), entry.size, len(name), 0, 0, 0, 0,
+            (entry.mode & 0xFFFF) << 16, offset,
+        ) + name)
+        offset += _LOCAL_HEADER.size + len(name) + len(entry.data)
+    cd_start = offset
+    for header in central:
+        fp.write(header)
+    cd_size = sum(len(h) for h in central)
+    if cd_start + cd_size > _ZIP32_LIMIT:
+        raise ValueError("Архив не помещается в ZIP32")
+    fp.write(_END_RECORD.pack(0x06054b50, 0, 0, len(records), len(records), cd_size, cd_start, len(comment)))
+    fp.write(comment)
+
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="dev_toolkit_zip")
+    return _executor
+
+
+def shutdown_executor():
+    """Остановить пул потоков сжатия (при выгрузке Developer Toolkit)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def collect_records(source_dir: str, arc_root: str, cache: PackageCache,
+                    patterns=(), bytecode=None) -> list[tuple[str, CachedEntry]]:
+    """Записи архива аддона из кэша, пересжав только изменившиеся файлы.
+
+    Крупные файлы обрабатываются в пуле потоков, мелкие — на месте; порядок
+    записей всегда совпадает с порядком обхода. patterns — дополнительные
+    шаблоны игнорирования аддона. bytecode — кэш байткода
+    (bytecode.BytecodeCache): если задан, рядом с модулями кладутся .pyc.
+    """
+    slots = []
+    for path, rel, st in walker.iter_source(source_dir, patterns):
+        if MAX_WORKERS > 1 and st.st_size >= PARALLEL_MIN_SIZE:
+            slot = _get_executor().submit(cache.get_entry, path, rel, st)
+        else:
+            slot = cache.get_entry(path, rel, st)
+        slots.append((rel, path, slot))
+    sources = [(rel, path, slot if isinstance(slot, CachedEntry) else slot.result())
+               for rel, path, slot in slots]
+    records = [(f"{arc_root}/{rel}", entry) for rel, _, entry in sources]
+    if bytecode is not None:
+        modules = [source for source in sources if source[0].endswith(".py")]
+        records.extend(bytecode.records(arc_root, modules, cache.level))
+    cache.forget_missing({rel: entry.digest for rel, _, entry in sources})
+    return records
+
+
+def build_archive(source_dir: str, arc_root: str, zip_path: str, cache: PackageCache,
+                  patterns=(), bytecode=None) -> int:
+    """Собрать ZIP аддона в файл zip_path; вернуть число записей (см. collect_records)."""
+    records = collect_records(source_dir, arc_root, cache, patterns, bytecode)
+    with open(zip_path, "wb") as fp:
+        write_zip(fp, records)
+    return len(records)
+
+
+# ------------------------- АРХИВ В ПАМЯТИ -------------------------
+
+class Archive:
+    """Собранный ZIP: в памяти или в файле (временном, если не влез в лимит).
+
+    owned=False — чужой файл (например, общий архив от другого Blender):
+    discard() его не удаляет.
+    """
+
+    def __init__(self, buffer: io.BytesIO = None, path: str = None, owned: bool = True):
+        self.buffer = buffer
+        self.path = path
+        self.owned = owned
+
+    @property
+    def in_memory(self) -> bool:
+        return self.buffer is not None
+
+    def open(self):
+        if self.buffer is not None:
+            self.buffer.seek(0)
+            return self.buffer
+        return open(self.path, "rb")
+
+    def getvalue(self) -> bytes:
+        """Содержимое архива целиком."""
+        if self.buffer is not None:
+            return self.buffer.getvalue()
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def discard(self):
+        """Освободить буфер или удалить временный файл."""
+        self.buffer = None
+        if self.path and self.owned:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+            self.path = None
+
+
+def temp_archive_path(arc_root: str) -> str:
+    """Уникальный временный файл для архива (без коллизий при частых перезагрузках)."""
+    fd, path = tempfile.mkstemp(prefix=f"{arc_root}_", suffix=".zip")
+    os.close(fd)
+    return path
+
+
+def archive_size(records) -> int:
+    """Размер ZIP32 из этих записей в байтах."""
+    size = _END_RECORD.size
+    for arcname, entry in records:
+        name_len = len(arcname.encode("utf-8"))
+        size += _LOCAL_HEADER.size + _CENTRAL_HEADER.size + 2 * name_len + len(entry.data)
+    return size
+
+
+def pack(source_dir: str, arc_root: str, cache: PackageCache, patterns=(), bytecode=None,
+         memory_cap: int = DEFAULT_MEMORY_CAP) -> Archive:
+    """Собрать архив аддона: в памяти, а сверх memory_cap байт — во временном файле.
+
+    Как и write_zip, поднимает ValueError, если архив не помещается в ZIP32.
+    """
+    records = collect_records(source_dir, arc_root, cache, patterns, bytecode)
+    if archive_size(records) <= memory_cap:
+        buffer = io.BytesIO()
+        write_zip(buffer, records)
+        return Archive(buffer=buffer)
+    archive = Archive(path=temp_archive_path(arc_root))
+    try:
+        with open(archive.path, "wb") as fp:
+            write_zip(fp, records)
+    except BaseException:
+        archive.discard()
+        raise
+    return archive
+
+
+def extract_archive(archive: Archive, target_dir: str, arc_root: str):
+    """Установить аддон: заменить каталог target_dir/arc_root содержимым архива."""
+    linking.remove_path(os.path.join(target_dir, arc_root))
+    # Файл открывает сам ZipFile: переданный ему объект файла он бы не закрыл
+    with zipfile.ZipFile(archive.open() if archive.in_memory else archive.path) as zf:
+        zf.extractall(target_dir)
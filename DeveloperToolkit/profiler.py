@@ -0,0 +1,189 @@
+"""Профилирование импорта и register() при включении аддона.
+
+На время профилирования в sys.meta_path ставится искатель, который замеряет
+выполнение каждого импортируемого модуля (собственное и накопленное время,
+как у -X importtime). Функция register() аддона и bpy.utils.register_class
+оборачиваются замерами. Модуль не зависит от bpy: пространство имён с
+register_class передаётся снаружи.
+"""
+
+import datetime
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+
+TOP_COUNT = 5
+
+
+@dataclass
+class ImportTiming:
+    """Импорт модуля: собственное и накопленное время (секунды), глубина вложенности."""
+    module: str
+    self_time: float
+    cumulative: float
+    depth: int
+
+
+@dataclass
+class ProfileReport:
+    """Отчёт о профилировании одного включения аддона."""
+    addon_name: str
+    started: float
+    total: float = 0.0
+    imports: list[ImportTiming] = field(default_factory=list)
+    register: float = None
+    classes: list[tuple[str, float]] = field(default_factory=list)
+
+    def top(self, n: int = TOP_COUNT) -> list[tuple[str, float]]:
+        """Самые дорогие импорты (по собственному времени), register() и классы."""
+        items = [(f"import {t.module}", t.self_time) for t in self.imports]
+        if self.register is not None:
+            items.append((f"{self.addon_name}.register()", self.register))
+        items.extend((f"register_class({name})", seconds) for name, seconds in self.classes)
+        items.sort(key=lambda item: -item[1])
+        return items[:n]
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+# Последний отчёт по каждому аддону — для панели
+last_reports: dict[str, ProfileReport] = {}
+
+_session = None
+
+
+class _Session:
+    def __init__(self, report: ProfileReport):
+        self.report = report
+        self.stack: list[float] = []
+        self.restore = []
+
+
+class _TimingFinder:
+    """Искатель-обёртка: находит спецификацию у остальных искателей и
+    подменяет exec_module у экземпляра загрузчика на замеряющий вариант."""
+
+    def __init__(self, session: _Session):
+        self.session = session
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, "find_spec", None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        # Общие загрузчики-классы (встроенные, frozen) не трогаем
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+        self._wrap(loader, fullname)
+        return spec
+
+    def _wrap(self, loader, fullname: str):
+        session = self.session
+        original = loader.exec_module
+
+        def exec_module(module):
+            start = time.perf_counter()
+            session.stack.append(0.0)
+            try:
+                original(module)
+            finally:
+                cumulative = time.perf_counter() - start
+                children = session.stack.pop()
+                if session.stack:
+                    session.stack[-1] += cumulative
+                session.report.imports.append(
+                    ImportTiming(fullname, cumulative - children, cumulative, len(session.stack)))
+                try:
+                    del loader.exec_module
+                except AttributeError:
+                    pass
+            if fullname == session.report.addon_name:
+                _wrap_register(session, module)
+
+        loader.exec_module = exec_module
+
+
+def _wrap_register(session: _Session, module):
+    original = getattr(module, "register", None)
+    if not callable(original):
+        return
+
+    def register(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original(*args, **kwargs)
+        finally:
+            session.report.register = time.perf_counter() - start
+
+    module.register = register
+    session.restore.append((module, "register", original, register))
+
+
+def _timed_register_class(original):
+    def register_class(cls):
+        session = _session
+        if session is None:
+            return original(cls)
+        start = time.perf_counter()
+        try:
+            return original(cls)
+        finally:
+            session.report.classes.append((cls.__name__, time.perf_counter() - start))
+    register_class.__wrapped__ = original
+    return register_class
+
+
+@contextmanager
+def profile(addon_name: str, utils=None):
+    """Профилировать блок кода (обычно addon_enable) для аддона addon_name.
+
+    utils — пространство имён с register_class (bpy.utils), которое на время
+    блока подменяется замеряющей обёрткой. Отчёт доступен как значение
+    контекстного менеджера и после выхода попадает в last_reports.
+    """
+    global _session
+    report = ProfileReport(addon_name, time.time())
+    session = _Session(report)
+    finder = _TimingFinder(session)
+    original_rc = getattr(utils, "register_class", None) if utils is not None else None
+    if original_rc is not None:
+        utils.register_class = _timed_register_class(original_rc)
+
+    _session = session
+    sys.meta_path.insert(0, finder)
+    start = time.perf_counter()
+    try:
+        yield report
+    finally:
+        report.total = time.perf_counter() - start
+        sys.meta_path.remove(finder)
+        _session = None
+        if original_rc is not None:
+            utils.register_class = original_rc
+        for module, name, original, wrapper in session.restore:
+            if getattr(module, name, None) is wrapper:
+                setattr(module, name, original)
+        last_reports[addon_name] = report
+
+
+def save_report(report: ProfileReport, directory: str) -> str:
+    """Сохранить полный отчёт в JSON; возвращает путь к файлу."""
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.datetime.fromtimestamp(report.started).strftime("%Y%m%d_%H%M%S_%f")
+    path = os.path.join(directory, f"{report.addon_name}_{stamp}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report.to_dict(), f, ensure_ascii=False, indent=1)
+    return path
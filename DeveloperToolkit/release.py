@@ -0,0 +1,282 @@
+"""Сборка релизных архивов аддонов без Blender.
+
+Запуск из командной строки (например, в CI):
+
+    python -m DeveloperToolkit build ПУТЬ [ПУТЬ ...] -o dist
+
+Путь — каталог аддона или рабочий каталог, в котором аддоны ищутся так же,
+как кнопкой «Найти аддоны». Файлы отбираются по тем же правилам, что и при
+перезагрузке (.gitignore, .devtoolkitignore, шаблоны --ignore). Аддоны
+собираются параллельно в пуле процессов. Архивы воспроизводимы: записи идут
+в стабильном порядке, у всех одна дата (SOURCE_DATE_EPOCH или 1980-01-01) и
+нормализованные права, поэтому одинаковые исходники дают побайтно
+одинаковый ZIP. Хэш содержимого записывается в комментарий архива; если он
+совпадает с хэшем исходников, аддон не пересобирается. Модуль не зависит
+от bpy.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from . import discovery, packaging, walker
+
+FORMAT_VERSION = 1
+DEFAULT_OUTPUT = "dist"
+# Минимальная дата формата ZIP
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+COMMENT_PREFIX = b"DeveloperToolkit content "
+
+_FILE_MODE = 0o100644
+_EXEC_MODE = 0o100755
+
+BUILT = "built"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+
+@dataclass
+class BuildJob:
+    """Что собрать: аддон, каталог результата и параметры архива."""
+    name: str
+    source_dir: str
+    output_dir: str
+    level: int = packaging.DEFAULT_LEVEL
+    patterns: tuple = ()
+    date_time: tuple = DEFAULT_DATE_TIME
+    force: bool = False
+
+    @property
+    def archive_path(self) -> str:
+        return os.path.join(self.output_dir, f"{self.name}.zip")
+
+
+@dataclass
+class BuildResult:
+    """Итог сборки одного аддона: built, skipped (архив актуален) или failed."""
+    name: str
+    status: str
+    archive: str
+    content_hash: str = ""
+    files: int = 0
+    size: int = 0
+    duration: float = 0.0
+    error: str = ""
+
+
+# ------------------------- ХЭШ СОДЕРЖИМОГО -------------------------
+
+def source_date_time() -> tuple:
+    """Дата записей: SOURCE_DATE_EPOCH (UTC), иначе 1980-01-01 00:00.
+
+    Неверное значение переменной поднимает ValueError.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH", "").strip()
+    if not epoch:
+        return DEFAULT_DATE_TIME
+    try:
+        t = time.gmtime(int(epoch))
+    except (ValueError, OverflowError, OSError):
+        raise ValueError(f"SOURCE_DATE_EPOCH={epoch!r}: ожидается число секунд") from None
+    if t.tm_year < 1980:
+        return DEFAULT_DATE_TIME
+    return (t.tm_year, t.tm_mon, t.tm_mday, t.tm_hour, t.tm_min, t.tm_sec - t.tm_sec % 2)
+
+
+def normalize_mode(st_mode: int) -> int:
+    """Права записи: только признак исполняемого файла, без владельца и umask."""
+    return _EXEC_MODE if st_mode & 0o111 else _FILE_MODE
+
+
+def content_hash(job: BuildJob, files) -> str:
+    """Хэш всего, что определяет архив: параметры сборки и (путь, права, хэш файла)."""
+    h = hashlib.sha256()
+    h.update(json.dumps([FORMAT_VERSION, job.name, job.level, list(job.date_time)]).encode("utf-8"))
+    for rel, mode, digest in files:
+        h.update(f"\n{rel}\0{mode:o}\0{digest}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def archive_hash(path: str) -> str | None:
+    """Хэш содержимого из комментария готового архива; None, если его нет."""
+    try:
+        with zipfile.ZipFile(path) as zf:
+            comment = zf.comment
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if not comment.startswith(COMMENT_PREFIX):
+        return None
+    return comment[len(COMMENT_PREFIX):].decode("ascii", "replace")
+
+
+# ------------------------- СБОРКА -------------------------
+
+def write_archive(job: BuildJob, files) -> str:
+    """Упаковать файлы аддона в job.archive_path; вернуть хэш упакованного содержимого.
+
+    Хэш считается по тем же байтам, что попали в архив, поэтому файл,
+    изменившийся во время сборки, не даст архив с чужим хэшем.
+    """
+    records = []
+    hashed = []
+    for path, rel, st in files:
+        with open(path, "rb") as f:
+            raw = f.read()
+        mode = normalize_mode(st.st_mode)
+        method, data = packaging.encode_bytes(rel, raw, job.level)
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        records.append((f"{job.name}/{rel}", packaging.CachedEntry(
+            size=len(raw), mtime_ns=0, digest=digest, crc=zlib.crc32(raw),
+            method=method, level=job.level, data=data, mode=mode,
+        )))
+        hashed.append((rel, mode, digest))
+    result_hash = content_hash(job, hashed)
+
+    target = job.archive_path
+    os.makedirs(job.output_dir, exist_ok=True)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as fp:
+            packaging.write_zip(fp, records, date_time=job.date_time,
+                                comment=COMMENT_PREFIX + result_hash.encode("ascii"))
+        os.replace(tmp, target)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return result_hash
+
+
+def build_addon(job: BuildJob) -> BuildResult:
+    """Собрать один аддон или пропустить его, если архив уже актуален."""
+    t0 = time.perf_counter()
+    result = BuildResult(job.name, FAILED, job.archive_path)
+    try:
+        files = walker.walk_source(job.source_dir, job.patterns)
+        result.files = len(files)
+        result.content_hash = content_hash(
+            job, ((rel, normalize_mode(st.st_mode), packaging.file_digest(path)) for path, rel, st in files))
+        if not job.force and archive_hash(job.archive_path) == result.content_hash:
+            result.status = SKIPPED
+        else:
+            result.content_hash = write_archive(job, files)
+            result.status = BUILT
+        result.size = os.path.getsize(job.archive_path)
+    except (OSError, ValueError) as e:
+        result.error = str(e) or type(e).__name__
+    result.duration = time.perf_counter() - t0
+    return result
+
+
+def build_all(jobs: list[BuildJob], workers: int = MAX_WORKERS) -> list[BuildResult]:
+    """Собрать аддоны в пуле процессов; результаты в порядке jobs.
+
+    Если пул поднять не удалось, аддоны собираются по очереди в текущем процессе.
+    """
+    jobs = list(jobs)
+    if workers > 1 and len(jobs) > 1:
+        try:
+            # spawn: тот же путь, что и у пула байткода, безопасен и внутри Blender
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                return list(pool.map(build_addon, jobs))
+        except Exception:
+            # Процессы недоступны (запрет песочницы, упавший пул) — собираем на месте
+            pass
+    return [build_addon(job) for job in jobs]
+
+
+def collect_jobs(paths, output_dir: str, depth: int = discovery.DEFAULT_DEPTH, **options) -> list[BuildJob]:
+    """Задания на сборку: пути аддонов как есть, рабочие каталоги — через поиск аддонов.
+
+    Два аддона с одинаковым именем дали бы один архив — это ValueError.
+    """
+    jobs = {}
+    for path in paths:
+        path = os.path.normpath(os.path.abspath(path))
+        if discovery.has_bl_info(os.path.join(path, "__init__.py")):
+            found = [discovery.FoundAddon(os.path.basename(path), path)]
+        elif os.path.isdir(path):
+            found = discovery.find_addons(path, depth)
+        else:
+            raise ValueError(f"{path}: каталог не найден")
+        for addon in found:
+            other = jobs.get(addon.name)
+            if other is not None and other.source_dir != addon.path:
+                raise ValueError(f"Аддон {addon.name} найден дважды: {other.source_dir} и {addon.path}")
+            jobs[addon.name] = BuildJob(addon.name, addon.path, output_dir, **options)
+    return sorted(jobs.values(), key=lambda job: job.name)
+
+
+# ------------------------- КОМАНДНАЯ СТРОКА -------------------------
+
+def _format_size(size: int) -> str:
+    for unit in ("Б", "КБ", "МБ"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "Б" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} ГБ"
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m DeveloperToolkit",
+                                     description="Инструменты Developer Toolkit без Blender.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="собрать релизные архивы аддонов",
+                                description="Собрать воспроизводимые ZIP аддонов для установки в Blender.")
+    build.add_argument("paths", nargs="+", metavar="ПУТЬ", help="каталог аддона или рабочий каталог с аддонами")
+    build.add_argument("-o", "--output", default=DEFAULT_OUTPUT, help="каталог архивов (по умолчанию dist)")
+    build.add_argument("-j", "--jobs", type=int, default=MAX_WORKERS, help="число процессов сборки")
+    build.add_argument("--level", type=int, default=packaging.DEFAULT_LEVEL, choices=range(10),
+                       metavar="0-9", help="уровень сжатия deflate (0 — без сжатия)")
+    build.add_argument("--depth", type=int, default=discovery.DEFAULT_DEPTH,
+                       help="глубина поиска аддонов в рабочих каталогах")
+    build.add_argument("--ignore", default="", help="дополнительные шаблоны игнорирования через запятую")
+    build.add_argument("--force", action="store_true", help="пересобрать даже актуальные архивы")
+    build.add_argument("--json", action="store_true", help="вывести отчёт в формате JSON")
+    return parser
+
+
+def main(argv=None) -> int:
+    """Точка входа python -m DeveloperToolkit; код возврата 1, если сборка не удалась."""
+    parser = _parser()
+    args = parser.parse_args(argv)
+    try:
+        jobs = collect_jobs(args.paths, os.path.abspath(args.output), args.depth, level=args.level,
+                            patterns=tuple(walker.split_patterns(args.ignore)),
+                            date_time=source_date_time(), force=args.force)
+    except ValueError as e:
+        parser.error(str(e))
+    if not jobs:
+        parser.error("аддоны не найдены")
+
+    t0 = time.perf_counter()
+    results = build_all(jobs, args.jobs)
+    elapsed = time.perf_counter() - t0
+    failed = [r for r in results if r.status == FAILED]
+
+    if args.json:
+        json.dump({"results": [asdict(r) for r in results], "duration": elapsed},
+                  sys.stdout, ensure_ascii=False, indent=2)
+        sys.stdout.write("\n")
+    else:
+        width = max(len(r.name) for r in results)
+        for r in results:
+            details = r.error if r.status == FAILED else \
+                f"{r.files} файлов, {_format_size(r.size)}, {r.duration:.2f} с"
+            print(f"{r.status:<8} {r.name:<{width}}  {details}")
+        built = sum(1 for r in results if r.status == BUILT)
+        print(f"Собрано: {built}, пропущено: {len(results) - built - len(failed)}, "
+              f"ошибок: {len(failed)} за {elapsed:.2f} с")
+    return 1 if failed else 0
@@ -0,0 +1,85 @@
+"""Защита от неудачной перезагрузки: проверка синтаксиса и откат.
+
+Перед отключением работающей версии изменившиеся .py компилируются в общем
+пуле процессов (compile() держит GIL, потоки его не ускоряют); при
+синтаксической ошибке перезагрузка не начинается. Установленная копия
+работающей версии (вместе с __pycache__, который Blender записал при
+импорте) перед установкой новой откладывается переименованием и при ошибке
+возвращается на место тем же переименованием. Модуль не зависит от bpy.
+"""
+
+import os
+import shutil
+
+from . import linking, workers
+
+
+class RolledBack(Exception):
+    """Перезагрузка не удалась, восстановлена предыдущая версия (причина — __cause__)."""
+
+
+# ------------------------- ПРОВЕРКА СИНТАКСИСА -------------------------
+
+def changed_sources(fingerprints: dict, previous: dict | None) -> list[str]:
+    """Относительные пути .py, изменившихся с прошлой успешной загрузки (все, если её не было)."""
+    previous = previous or {}
+    return [rel for rel, fp in fingerprints.items()
+            if rel.endswith(".py") and previous.get(rel) != fp]
+
+
+def _compile_file(source_dir: str, rel: str) -> str | None:
+    path = os.path.join(source_dir, *rel.split("/"))
+    try:
+        with open(path, "rb") as f:
+            compile(f.read(), path, "exec", dont_inherit=True)
+    except SyntaxError as e:
+        return f"{rel}:{e.lineno}: {e.msg}"
+    except (OSError, ValueError) as e:
+        return f"{rel}: {e}"
+    return None
+
+
+def compile_check(source_dir: str, rels) -> list[str]:
+    """Скомпилировать файлы аддона; вернуть сообщения об ошибках в порядке rels."""
+    errors = workers.run_many(_compile_file, [(source_dir, rel) for rel in rels])
+    return [error for error in errors if error]
+
+
+# ------------------------- ПОСЛЕДНЯЯ РАБОЧАЯ ВЕРСИЯ -------------------------
+
+def _move(src: str, dst: str):
+    """Переименовать каталог; между томами — копированием."""
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.move(src, dst)
+
+
+def set_aside(addons_dir: str, addon_name: str, keep_dir: str) -> str | None:
+    """Отложить установленную копию аддона в keep_dir; вернуть её новый путь.
+
+    Ссылки (связанная установка) не откладываются: это исходники, а не копия.
+    """
+    installed = os.path.join(addons_dir, addon_name)
+    if not os.path.isdir(installed) or linking.is_link(installed):
+        return None
+    os.makedirs(keep_dir, exist_ok=True)
+    aside = os.path.join(keep_dir, addon_name)
+    if os.path.lexists(aside):
+        linking.remove_path(aside)
+    _move(installed, aside)
+    return aside
+
+
+def restore(aside: str, addons_dir: str, addon_name: str):
+    """Вернуть отложенную копию на место неудачной установки."""
+    installed = os.path.join(addons_dir, addon_name)
+    if os.path.lexists(installed):
+        linking.remove_path(installed)
+    _move(aside, installed)
+
+
+def discard(aside: str | None):
+    """Удалить отложенную копию после успешной перезагрузки."""
+    if aside:
+        shutil.rmtree(aside, ignore_errors=True)
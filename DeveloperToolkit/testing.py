@@ -0,0 +1,302 @@
+"""Тесты аддона внутри уже запущенного Blender после перезагрузки.
+
+Тесты — файлы test_*.py и *_test.py в каталоге tests внутри аддона или
+рядом с ним. Для каждого файла по import-ам (ast, без выполнения) и графу
+импортов аддона строится множество модулей аддона, от которых он зависит.
+После перезагрузки запускаются только затронутые тесты: изменился модуль из
+зависимостей, сам файл теста или тест упал в прошлый раз. При первой
+загрузке и при изменении не-.py файлов аддона запускаются все тесты,
+зависящие от аддона. Тесты выполняет unittest: классы TestCase и функции
+test_* верхнего уровня. Модуль не зависит от bpy.
+"""
+
+import fnmatch
+import importlib.util
+import os
+import sys
+import time
+import unittest
+from dataclasses import dataclass, field
+
+from . import hot_reload
+
+TESTS_DIR = "tests"
+TEST_PATTERNS = ("test_*.py", "*_test.py")
+FAILED = ("failed", "error")
+
+
+@dataclass
+class TestResult:
+    """Один тест: файл, имя, исход (passed/failed/error/skipped), длительность, сообщение."""
+    file: str
+    name: str
+    outcome: str
+    duration: float
+    message: str = ""
+
+
+@dataclass
+class TestRun:
+    """Прогон тестов аддона после перезагрузки."""
+    addon_name: str
+    started: float
+    selected: int
+    total: int
+    results: list[TestResult] = field(default_factory=list)
+    duration: float = 0.0
+
+    def count(self, *outcomes: str) -> int:
+        return sum(1 for r in self.results if r.outcome in outcomes)
+
+    @property
+    def ok(self) -> bool:
+        return not self.count(*FAILED)
+
+    def failures(self) -> list[TestResult]:
+        return [r for r in self.results if r.outcome in FAILED]
+
+
+@dataclass
+class TestPlan:
+    """Какие файлы тестов запускать после перезагрузки."""
+    addon_name: str
+    tests_dir: str
+    files: list[str]
+    total: int
+    stamps: dict = field(repr=False, default_factory=dict)
+
+
+# Последний прогон по каждому аддону — для панели и повторного запуска упавших
+last_runs: dict[str, TestRun] = {}
+# (размер, mtime) файлов тестов на момент последнего прогона
+_stamps: dict[str, dict[str, tuple[int, int]]] = {}
+# Кэш зависимостей тестов: аддон -> (ключ по отпечаткам, {файл: модули})
+_dependencies: dict[str, tuple[tuple, dict]] = {}
+
+
+# ------------------------- ПОИСК -------------------------
+
+def find_tests_dir(source_dir: str) -> str | None:
+    """Каталог тестов: tests внутри аддона, иначе tests рядом с ним."""
+    for candidate in (os.path.join(source_dir, TESTS_DIR),
+                      os.path.join(os.path.dirname(os.path.normpath(source_dir)), TESTS_DIR)):
+        if os.path.isdir(candidate):
+            return candidate
+    return None
+
+
+def find_test_files(tests_dir: str) -> list[str]:
+    """Файлы тестов в каталоге (рекурсивно), отсортированные по пути."""
+    found = []
+    for root, dirs, files in os.walk(tests_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+        for name in files:
+            if any(fnmatch.fnmatch(name, pattern) for pattern in TEST_PATTERNS):
+                found.append(os.path.join(root, name))
+    found.sort()
+    return found
+
+
+def _stamp(paths) -> dict[str, tuple[int, int]]:
+    stamps = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps[path] = (st.st_size, st.st_mtime_ns)
+    return stamps
+
+
+def _test_module_name(addon_name: str, source_dir: str, path: str) -> str:
+    """Имя модуля теста: внутри аддона — его подмодуль (работают относительные импорты)."""
+    rel = os.path.relpath(path, source_dir).replace(os.sep, "/")
+    if not rel.startswith("../"):
+        return hot_reload.module_name(addon_name, rel)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return f"_dev_toolkit_test_{addon_name}_{stem}"
+
+
+# ------------------------- ВЫБОР ТЕСТОВ -------------------------
+
+def dependency_map(addon_name: str, source_dir: str, files, patterns=(), fingerprints=None,
+                   stamps=None) -> dict[str, set[str]]:
+    """{файл теста: модули аддона, от которых он зависит, включая транзитивные}.
+
+    Результат кэшируется, пока не изменились исходники аддона и файлы тестов.
+    """
+    key = (tuple(sorted((fingerprints or {}).items())), tuple(sorted((stamps or {}).items())))
+    cached = _dependencies.get(addon_name)
+    if fingerprints is not None and cached is not None and cached[0] == key:
+        return cached[1]
+
+    graph = hot_reload.build_import_graph(source_dir, addon_name, patterns)
+    known = set(graph)
+    deps = {}
+    for path in files:
+        modname = _test_module_name(addon_name, source_dir, path)
+        try:
+            direct = hot_reload.scan_imports(path, modname, False, known)
+        except (OSError, SyntaxError, ValueError):
+            # Не разбирается — пусть упадёт при запуске и покажет ошибку
+            direct = set(known)
+        closure = set()
+        stack = list(direct)
+        while stack:
+            name = stack.pop()
+            if name not in closure:
+                closure.add(name)
+                stack.extend(graph.get(name, ()))
+        deps[path] = closure
+    if fingerprints is not None:
+        _dependencies[addon_name] = (key, deps)
+    return deps
+
+
+def plan_tests(addon_name: str, source_dir: str, changed, patterns=(), fingerprints=None,
+               tests_dir: str = None) -> TestPlan | None:
+    """Выбрать тесты для прогона после перезагрузки; None, если тестов нет.
+
+    changed — относительные пути изменившихся файлов аддона или None (первая
+    загрузка, нужны все тесты).
+    """
+    tests_dir = tests_dir or find_tests_dir(source_dir)
+    if not tests_dir:
+        return None
+    files = find_test_files(tests_dir)
+    if not files:
+        return None
+    stamps = _stamp(files)
+    deps = dependency_map(addon_name, source_dir, files, patterns, fingerprints, stamps)
+    inside = os.path.normpath(source_dir) + os.sep
+    relevant = [path for path in files if deps[path] or path.startswith(inside)]
+
+    if changed is None or any(not rel.endswith(".py") for rel in changed):
+        selected = relevant
+    else:
+        changed_modules = {hot_reload.module_name(addon_name, rel) for rel in changed}
+        previous = _stamps.get(addon_name, {})
+        last = last_runs.get(addon_name)
+        failing = {r.file for r in last.failures()} if last else set()
+        selected = [path for path in relevant
+                    if deps[path] & changed_modules or stamps[path] != previous.get(path)
+                    or path in failing]
+    return TestPlan(addon_name, tests_dir, selected, len(relevant), stamps)
+
+
+# ------------------------- ЗАПУСК -------------------------
+
+class _Result(unittest.TestResult):
+    """Результат unittest с длительностью каждого теста."""
+
+    def __init__(self, file: str, modname: str):
+        super().__init__()
+        self.file = file
+        self.modname = modname
+        self.records: list[TestResult] = []
+        self._t0 = None
+
+    def startTest(self, test):
+        super().startTest(test)
+        self._t0 = time.perf_counter()
+
+    def stopTest(self, test):
+        super().stopTest(test)
+        self._t0 = None
+
+    def _add(self, test, outcome: str, message: str = ""):
+        duration = time.perf_counter() - self._t0 if self._t0 is not None else 0.0
+        name = test.id()
+        if isinstance(test, unittest.FunctionTestCase):
+            name = f"{self.modname}.{name}"
+        self.records.append(TestResult(self.file, name, outcome, duration, message))
+
+    def _describe(self, err, test) -> str:
+        lines = [line for line in self._exc_info_to_string(err, test).splitlines() if line.strip()]
+        return lines[-1].strip() if lines else ""
+
+    def addSuccess(self, test):
+        super().addSuccess(test)
+        self._add(test, "passed")
+
+    def addFailure(self, test, err):
+        super().addFailure(test, err)
+        self._add(test, "failed", self._describe(err, test))
+
+    def addError(self, test, err):
+        super().addError(test, err)
+        self._add(test, "error", self._describe(err, test))
+
+    def addSkip(self, test, reason):
+        super().addSkip(test, reason)
+        self._add(test, "skipped", reason)
+
+    def addExpectedFailure(self, test, err):
+        super().addExpectedFailure(test, err)
+        self._add(test, "passed")
+
+    def addUnexpectedSuccess(self, test):
+        super().addUnexpectedSuccess(test)
+        self._add(test, "failed", "неожиданный успех (expectedFailure)")
+
+
+def _load_suite(module) -> unittest.TestSuite:
+    """Тесты модуля: классы TestCase и функции test_* верхнего уровня."""
+    suite = unittest.defaultTestLoader.loadTestsFromModule(module)
+    for name, value in vars(module).items():
+        if name.startswith("test") and callable(value) and not isinstance(value, type) \
+                and getattr(value, "__module__", None) == module.__name__:
+            suite.addTest(unittest.FunctionTestCase(value))
+    return suite
+
+
+def _run_file(addon_name: str, source_dir: str, path: str) -> list[TestResult]:
+    modname = _test_module_name(addon_name, source_dir, path)
+    spec = importlib.util.spec_from_file_location(modname, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[modname] = module
+    try:
+        spec.loader.exec_module(module)
+    except (Exception, SystemExit) as e:
+        return [TestResult(path, modname, "error", 0.0, f"{type(e).__name__}: {e}")]
+    result = _Result(path, modname)
+    _load_suite(module).run(result)
+    return result.records
+
+
+def run_tests(plan: TestPlan, source_dir: str) -> TestRun:
+    """Выполнить выбранные тесты в текущем процессе и запомнить прогон.
+
+    Модули тестов и их помощники из каталога тестов импортируются заново
+    при каждом прогоне, чтобы видеть перезагруженный аддон.
+    """
+    run = TestRun(plan.addon_name, time.time(), len(plan.files), plan.total)
+    t0 = time.perf_counter()
+    before = set(sys.modules)
+    tests_root = os.path.normpath(plan.tests_dir)
+    # Помощники рядом с тестами (from helpers import ...)
+    sys.path.insert(0, tests_root)
+    try:
+        for path in plan.files:
+            run.results.extend(_run_file(plan.addon_name, source_dir, path))
+    finally:
+        try:
+            sys.path.remove(tests_root)
+        except ValueError:
+            pass
+        for name in set(sys.modules) - before:
+            module_file = getattr(sys.modules[name], "__file__", None) or ""
+            if name.startswith("_dev_toolkit_test_") or \
+                    os.path.normpath(module_file).startswith(tests_root + os.sep):
+                sys.modules.pop(name, None)
+    run.duration = time.perf_counter() - t0
+
+    stamps = _stamps.setdefault(plan.addon_name, {})
+    stamps.update(plan.stamps)
+    last_runs[plan.addon_name] = run
+    return run
+
+
+def forget(addon_name: str):
+    for registry in (last_runs, _stamps, _dependencies):
+        registry.pop(addon_name, None)
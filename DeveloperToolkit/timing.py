@@ -0,0 +1,161 @@
+"""Замер фаз перезагрузки аддонов и экспорт в формате Chrome Trace.
+
+Каждая перезагрузка записывается как набор фаз с точным временем
+(perf_counter_ns). Последние записи хранятся в кольцевом буфере для каждого
+аддона; по ним считаются p50/p95. Экспорт открывается в chrome://tracing
+или Perfetto. Модуль не зависит от bpy.
+"""
+
+import json
+import os
+import platform
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+
+HISTORY_SIZE = 50
+
+
+@dataclass
+class PhaseTiming:
+    """Одна фаза: имя, смещение от начала перезагрузки и длительность (секунды)."""
+    name: str
+    offset: float
+    duration: float
+
+
+@dataclass
+class ReloadRecord:
+    """Замер одной перезагрузки аддона."""
+    addon_name: str
+    started: float
+    phases: list[PhaseTiming] = field(default_factory=list)
+    total: float = 0.0
+    ok: bool = True
+
+
+class ReloadTimer:
+    """Секундомер одной перезагрузки с разбивкой по фазам."""
+
+    def __init__(self, addon_name: str):
+        self.record = ReloadRecord(addon_name, time.time())
+        self._t0 = time.perf_counter_ns()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Замерить фазу; время записывается и при исключении."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.record.phases.append(PhaseTiming(name, (start - self._t0) / 1e9, (end - start) / 1e9))
+
+    def finish(self, ok: bool = True) -> ReloadRecord:
+        self.record.total = (time.perf_counter_ns() - self._t0) / 1e9
+        self.record.ok = ok
+        return self.record
+
+
+def percentile(values, q: float) -> float:
+    """Перцентиль с линейной интерполяцией; q в диапазоне 0..100."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class TimingHistory:
+    """Кольцевые буферы замеров по аддонам."""
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.size = size
+        self._records: dict[str, deque] = {}
+
+    def add(self, record: ReloadRecord):
+        buf = self._records.get(record.addon_name)
+        if buf is None:
+            buf = self._records[record.addon_name] = deque(maxlen=self.size)
+        buf.append(record)
+
+    def records(self, addon_name: str = None) -> list[ReloadRecord]:
+        """Записи одного аддона или всех аддонов по времени начала."""
+        if addon_name is not None:
+            return list(self._records.get(addon_name, ()))
+        return sorted((r for buf in self._records.values() for r in buf), key=lambda r: r.started)
+
+    def forget(self, addon_name: str):
+        self._records.pop(addon_name, None)
+
+    def summary(self, addon_name: str) -> dict:
+        """p50/p95 общего времени и каждой фазы по успешным перезагрузкам.
+
+        Возвращает {"count": n, "total": (p50, p95), "phases": {имя: (p50, p95)}}
+        или пустой словарь, если замеров нет.
+        """
+        ok = [r for r in self.records(addon_name) if r.ok]
+        if not ok:
+            return {}
+        per_phase: dict[str, list[float]] = {}
+        for record in ok:
+            for ph in record.phases:
+                per_phase.setdefault(ph.name, []).append(ph.duration)
+        totals = [r.total for r in ok]
+        return {
+            "count": len(ok),
+            "total": (percentile(totals, 50), percentile(totals, 95)),
+            "phases": {name: (percentile(v, 50), percentile(v, 95)) for name, v in per_phase.items()},
+        }
+
+
+history = TimingHistory()
+
+
+# ------------------------- ЭКСПОРТ -------------------------
+
+def chrome_trace(records) -> dict:
+    """Собрать документ Chrome Trace (JSON Object Format) из замеров.
+
+    Каждый аддон получает свою «нить» в треке, перезагрузка целиком и её
+    фазы — события типа X (complete) с временем в микросекундах.
+    """
+    pid = os.getpid()
+    tids: dict[str, int] = {}
+    events = []
+    for record in records:
+        tid = tids.get(record.addon_name)
+        if tid is None:
+            tid = tids[record.addon_name] = len(tids) + 1
+            events.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                           "args": {"name": record.addon_name}})
+        base = record.started * 1e6
+        events.append({"ph": "X", "name": "reload", "cat": "reload", "pid": pid, "tid": tid,
+                       "ts": base, "dur": record.total * 1e6,
+                       "args": {"addon": record.addon_name, "ok": record.ok}})
+        for ph in record.phases:
+            events.append({"ph": "X", "name": ph.name, "cat": "phase", "pid": pid, "tid": tid,
+                           "ts": base + ph.offset * 1e6, "dur": ph.duration * 1e6})
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {
+            "machine": platform.node(),
+            "platform": platform.platform(),
+            "python": sys.version.split()[0],
+        },
+    }
+
+
+def export_chrome_trace(path: str, records, extra: dict = None):
+    """Записать замеры в файл Chrome Trace; extra дополняет otherData."""
+    doc = chrome_trace(records)
+    if extra:
+        doc["otherData"].update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(doc, f, ensure_ascii=False, indent=1)
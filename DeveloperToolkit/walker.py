@@ -0,0 +1,177 @@
+"""Обход исходников аддона с отсечением игнорируемых каталогов.
+
+Каталоги, попадающие под правила, отбрасываются до спуска в них, поэтому
+.git, .venv, node_modules и сборочные каталоги не обходятся вовсе. Правила
+собираются из .gitignore (включая вложенные), файла .devtoolkitignore в
+корне аддона и шаблонов, заданных для аддона в списке. Синтаксис шаблонов —
+как у .gitignore. Модуль не зависит от bpy.
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+
+# ------------------------- КОНСТАНТЫ -------------------------
+
+IGNORE_FILE = ".devtoolkitignore"
+
+# Каталоги, которые никогда не попадают в аддон
+SKIP_DIRS = {
+    "__pycache__", ".git", ".hg", ".svn",
+    ".venv", "venv", "node_modules",
+    ".mypy_cache", ".pytest_cache", ".ruff_cache", ".tox",
+}
+SKIP_SUFFIXES = {".pyc", ".tmp"}
+
+
+class SourceFile(NamedTuple):
+    """Файл аддона: абсолютный путь, путь внутри аддона (через /) и stat."""
+    path: str
+    rel: str
+    stat: os.stat_result
+
+
+# ------------------------- ПРАВИЛА -------------------------
+
+def _translate(pattern: str) -> str:
+    """Перевести glob-шаблон .gitignore в регулярное выражение."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = pattern.find("]", i + 1)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def split_patterns(text: str) -> list[str]:
+    """Разобрать шаблоны, заданные строкой через запятую."""
+    return [p.strip() for p in (text or "").split(",") if p.strip()]
+
+
+class IgnoreRules:
+    """Скомпилированный набор правил игнорирования; последнее совпадение побеждает."""
+
+    def __init__(self):
+        self._rules = []
+
+    def add_patterns(self, lines, base: str = ""):
+        """Добавить шаблоны, действующие относительно каталога base (путь через /)."""
+        prefix = base + "/" if base else ""
+        for line in lines:
+            line = line.rstrip("\n").rstrip()
+            if not line or line.startswith("#"):
+                continue
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = _translate(line)
+            if not anchored:
+                regex = "(?:.*/)?" + regex
+            self._rules.append((prefix, re.compile(regex + r"\Z"), negate, dir_only))
+
+    def add_file(self, path: str, base: str = "") -> bool:
+        """Добавить правила из файла; False, если файла нет."""
+        try:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                self.add_patterns(f.readlines(), base)
+        except OSError:
+            return False
+        return True
+
+    def match(self, rel: str, is_dir: bool) -> bool:
+        """Игнорируется ли путь rel (относительно корня аддона)."""
+        ignored = False
+        for prefix, regex, negate, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if prefix and not rel.startswith(prefix):
+                continue
+            if regex.match(rel[len(prefix):]):
+                ignored = not negate
+        return ignored
+
+
+def load_rules(source_dir: str, patterns=()) -> IgnoreRules:
+    """Собрать правила корня аддона: .gitignore, .devtoolkitignore, шаблоны аддона."""
+    rules = IgnoreRules()
+    rules.add_file(os.path.join(source_dir, ".gitignore"))
+    rules.add_file(os.path.join(source_dir, IGNORE_FILE))
+    rules.add_patterns(patterns)
+    return rules
+
+
+# ------------------------- ОБХОД -------------------------
+
+def iter_source(source_dir: str, patterns=()):
+    """Лениво обойти исходники аддона, выдавая SourceFile в стабильном порядке.
+
+    Вложенные .gitignore подхватываются при входе в каталог. Ошибки доступа
+    к отдельным файлам и каталогам пропускаются.
+    """
+    rules = load_rules(source_dir, patterns)
+    stack = [(source_dir, "")]
+    while stack:
+        top, prefix = stack.pop()
+        if prefix:
+            rules.add_file(os.path.join(top, ".gitignore"), prefix.rstrip("/"))
+        try:
+            with os.scandir(top) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            rel = prefix + entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIP_DIRS and not rules.match(rel, True):
+                        subdirs.append((entry.path, rel + "/"))
+                    continue
+                if os.path.splitext(entry.name)[1] in SKIP_SUFFIXES:
+                    continue
+                if rel == IGNORE_FILE or rules.match(rel, False):
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            yield SourceFile(entry.path, rel, st)
+        stack.extend(reversed(subdirs))
+
+
+def walk_source(source_dir: str, patterns=()) -> list[SourceFile]:
+    """Список файлов аддона для упаковки вместе с их stat."""
+    return list(iter_source(source_dir, patterns))
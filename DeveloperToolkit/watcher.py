@@ -0,0 +1,59 @@
+"""Наблюдение за исходниками аддонов по снимкам stat с антидребезгом.
+
+Обход дерева (по тем же правилам, что и упаковка) идёт порциями: каждый
+вызов poll() продвигает сканирование не дольше отведённого бюджета и
+продолжает с того же места на следующем тике, поэтому даже большие деревья
+не подвешивают интерфейс. Модуль не зависит от bpy; poll() вызывает таймер
+_watch_tick из __init__.py.
+"""
+
+import time
+
+from . import walker
+
+
+class TreeWatcher:
+    """Инкрементальный наблюдатель за одним деревом исходников."""
+
+    def __init__(self, source_dir: str, patterns=(), debounce: float = 0.5):
+        self.source_dir = source_dir
+        self.patterns = tuple(patterns)
+        self.debounce = debounce
+        self._snapshot = None
+        self._scan = None
+        self._partial = {}
+        self._dirty = False
+        self._last_change = 0.0
+
+    def poll(self, deadline: float) -> bool:
+        """Продвинуть обход до момента deadline (time.perf_counter()).
+
+        Время сверяется после каждого файла (perf_counter много дешевле stat),
+        так что тик выходит за бюджет не больше чем на один файл на
+        наблюдателя; хотя бы один файл обходится всегда, чтобы наблюдатели в
+        конце очереди тоже продвигались.
+
+        Возвращает True, когда изменения обнаружены и после последнего из них
+        прошло не меньше debounce секунд — то есть пора перезагружать.
+        """
+        if self._scan is None:
+            self._scan = walker.iter_source(self.source_dir, self.patterns)
+            self._partial = {}
+        for _, rel, st in self._scan:
+            self._partial[rel] = (st.st_size, st.st_mtime_ns)
+            if time.perf_counter() >= deadline:
+                break
+        else:
+            self._finish_pass()
+
+        if self._dirty and time.perf_counter() - self._last_change >= self.debounce:
+            self._dirty = False
+            return True
+        return False
+
+    def _finish_pass(self):
+        if self._snapshot is not None and self._partial != self._snapshot:
+            self._dirty = True
+            self._last_change = time.perf_counter()
+        self._snapshot = self._partial
+        self._scan = None
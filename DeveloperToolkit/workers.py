@@ -0,0 +1,65 @@
+"""Общий пул процессов для задач движка, упирающихся в процессор.
+
+compile() держит GIL, поэтому потоки его не ускоряют. Процессы запускаются
+через spawn: форк процесса Blender со всеми его потоками небезопасен.
+Дочерний интерпретатор импортирует пакет заново, без bpy, поэтому задания —
+функции верхнего уровня модулей движка. Если пул поднять не удалось,
+задания выполняются в текущем процессе. Модуль не зависит от bpy.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+# Меньше этого числа заданий дешевле выполнить на месте, чем будить процессы
+PROCESS_MIN_JOBS = 8
+
+_pool = None
+_pool_broken = False
+
+
+def _get_pool():
+    global _pool
+    if _pool is None and not _pool_broken:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS,
+                                    mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+
+def shutdown_pool():
+    """Остановить пул (при выгрузке Developer Toolkit)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True, cancel_futures=True)
+        _pool = None
+
+
+def run_in_pool(func, jobs) -> list | None:
+    """Выполнить func(*job) для каждого задания в пуле процессов; None, если пул недоступен.
+
+    func не поднимает исключений, а возвращает результат: исключение из
+    процесса пула (тем более не восстановимое pickle) ломает пул.
+    """
+    global _pool_broken
+    try:
+        pool = _get_pool()
+        if pool is None:
+            return None
+        futures = [pool.submit(func, *job) for job in jobs]
+        return [future.result() for future in futures]
+    except Exception:
+        # Процессы недоступны (нет интерпретатора, запрет песочницы) — дальше только на месте
+        _pool_broken = True
+        shutdown_pool()
+        return None
+
+
+def run_many(func, jobs) -> list:
+    """func(*job) для каждого задания: много заданий — в пуле, иначе и без пула — на месте."""
+    jobs = list(jobs)
+    if len(jobs) >= PROCESS_MIN_JOBS:
+        results = run_in_pool(func, jobs)
+        if results is not None:
+            return results
+    return [func(*job) for job in jobs]
@@ -0,0 +1,166 @@
+"""Постоянное хранилище рабочего пространства (SQLite).
+
+Хранит между сессиями Blender и независимо от .blend: список отслеживаемых
+аддонов, отпечатки исходников (размер, mtime) на момент последней успешной
+загрузки и историю замеров перезагрузок. Если модуль sqlite3 недоступен или
+файл базы повреждён, хранилище не открывается и тулкит работает как раньше,
+только в памяти. Модуль не зависит от bpy.
+"""
+
+import json
+import os
+
+try:
+    import sqlite3
+except ImportError:  # в некоторых сборках Python нет _sqlite3
+    sqlite3 = None
+
+from . import timing
+
+SCHEMA_VERSION = 1
+
+# Поля элемента списка аддонов, которые сохраняются в хранилище
+ADDON_FIELDS = ("name", "path", "auto_reload", "ignore_patterns", "install_mode", "last_reload")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS addons (
+    position INTEGER NOT NULL,
+    name TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    auto_reload INTEGER NOT NULL,
+    ignore_patterns TEXT NOT NULL,
+    install_mode TEXT NOT NULL,
+    last_reload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS manifests (
+    addon TEXT NOT NULL,
+    rel TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    PRIMARY KEY (addon, rel)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    addon TEXT NOT NULL,
+    started REAL NOT NULL,
+    total REAL NOT NULL,
+    ok INTEGER NOT NULL,
+    phases TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_addon ON history (addon, id);
+"""
+
+
+class WorkspaceStore:
+    """Файл рабочего пространства: аддоны, отпечатки исходников, история замеров."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Базу могут открыть несколько запущенных Blender сразу: WAL и ожидание блокировки
+        self._conn = sqlite3.connect(path, timeout=2.0)
+        try:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(f"Схема {version} новее поддерживаемой ({SCHEMA_VERSION})")
+            with self._conn:
+                self._conn.executescript(_SCHEMA)
+                self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.Error:
+            self._conn.close()
+            raise
+
+    def close(self):
+        self._conn.close()
+
+    # ---- аддоны ----
+
+    def load_addons(self) -> list[dict]:
+        """Отслеживаемые аддоны в порядке списка."""
+        cursor = self._conn.execute(
+            f"SELECT {', '.join(ADDON_FIELDS)} FROM addons ORDER BY position")
+        rows = [dict(zip(ADDON_FIELDS, row)) for row in cursor]
+        for row in rows:
+            row["auto_reload"] = bool(row["auto_reload"])
+        return rows
+
+    def save_addons(self, addons: list[dict]):
+        """Заменить список аддонов целиком."""
+        with self._conn:
+            self._conn.execute("DELETE FROM addons")
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO addons (position, {', '.join(ADDON_FIELDS)}) "
+                f"VALUES (?{', ?' * len(ADDON_FIELDS)})",
+                [(position, *(row[name] for name in ADDON_FIELDS)) for position, row in enumerate(addons)],
+            )
+
+    # ---- отпечатки ----
+
+    def load_manifests(self) -> dict[str, dict[str, tuple[int, int]]]:
+        """{аддон: {относительный путь: (размер, mtime_ns)}}."""
+        manifests: dict[str, dict] = {}
+        for addon, rel, size, mtime_ns in self._conn.execute(
+                "SELECT addon, rel, size, mtime_ns FROM manifests"):
+            manifests.setdefault(addon, {})[rel] = (size, mtime_ns)
+        return manifests
+
+    def save_manifest(self, addon: str, fingerprints: dict | None):
+        """Сохранить отпечатки аддона; None удаляет их."""
+        with self._conn:
+            self._conn.execute("DELETE FROM manifests WHERE addon = ?", (addon,))
+            if fingerprints:
+                self._conn.executemany(
+                    "INSERT INTO manifests (addon, rel, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                    [(addon, rel, size, mtime_ns) for rel, (size, mtime_ns) in fingerprints.items()],
+                )
+
+    # ---- история ----
+
+    def load_history(self, size: int = timing.HISTORY_SIZE) -> list[timing.ReloadRecord]:
+        """Последние size замеров каждого аддона по времени начала."""
+        cursor = self._conn.execute(
+            "SELECT addon, started, total, ok, phases FROM history h WHERE id IN ("
+            " SELECT id FROM history WHERE addon = h.addon ORDER BY id DESC LIMIT ?"
+            ") ORDER BY started", (size,))
+        records = []
+        for addon, started, total, ok, phases in cursor:
+            records.append(timing.ReloadRecord(
+                addon, started,
+                [timing.PhaseTiming(*phase) for phase in json.loads(phases)],
+                total, bool(ok),
+            ))
+        return records
+
+    def add_records(self, records, size: int = timing.HISTORY_SIZE):
+        """Дописать замеры и оставить не больше size последних на аддон."""
+        if not records:
+            return
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO history (addon, started, total, ok, phases) VALUES (?, ?, ?, ?, ?)",
+                [(r.addon_name, r.started, r.total, int(r.ok),
+                  json.dumps([(p.name, p.offset, p.duration) for p in r.phases]))
+                 for r in records],
+            )
+            for addon in {r.addon_name for r in records}:
+                self._conn.execute(
+                    "DELETE FROM history WHERE addon = ? AND id NOT IN ("
+                    " SELECT id FROM history WHERE addon = ? ORDER BY id DESC LIMIT ?)",
+                    (addon, addon, size))
+
+    def forget(self, addon: str):
+        """Удалить аддон из списка вместе с его отпечатками и историей."""
+        with self._conn:
+            self._conn.execute("DELETE FROM addons WHERE name = ?", (addon,))
+            self._conn.execute("DELETE FROM manifests WHERE addon = ?", (addon,))
+            self._conn.execute("DELETE FROM history WHERE addon = ?", (addon,))
+
+
+def open_store(directory: str, filename: str = "workspace.sqlite3") -> WorkspaceStore | None:
+    """Открыть хранилище в directory; None, если SQLite недоступен или база испорчена."""
+    if sqlite3 is None:
+        return None
+    try:
+        return WorkspaceStore(os.path.join(directory, filename))
+    except sqlite3.Error:
+        return None
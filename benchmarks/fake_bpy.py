@@ -0,0 +1,225 @@
+"""Лёгкая замена модулей bpy и addon_utils для запуска Developer Toolkit без Blender.
+
+Реализовано ровно то, что нужно тулкиту: свойства возвращают описания со
+значениями по умолчанию, операторы preferences.* включают и выключают
+аддоны, импортируя модули из каталога аддонов, таймеры и обработчики —
+заглушки.
+Всё пишется во временный корень, реальные каталоги Blender не трогаются.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+
+class Prop:
+    """Описание свойства, возвращаемое bpy.props.*Property."""
+
+    def __init__(self, kind: str, **kwargs):
+        self.kind = kind
+        self.kwargs = kwargs
+
+    @property
+    def default(self):
+        if "default" in self.kwargs:
+            return self.kwargs["default"]
+        if self.kind == "EnumProperty":
+            return self.kwargs["items"][0][0]
+        if self.kind == "CollectionProperty":
+            return Collection(self.kwargs["type"])
+        if self.kind == "PointerProperty":
+            return make_instance(self.kwargs["type"])
+        return {"StringProperty": "", "BoolProperty": False,
+                "IntProperty": 0, "FloatProperty": 0.0}.get(self.kind)
+
+
+def make_instance(cls, **values):
+    """Создать «экземпляр» PropertyGroup/оператора со значениями свойств по умолчанию."""
+    obj = cls.__new__(cls)
+    for klass in reversed(cls.__mro__):
+        for name, value in getattr(klass, "__annotations__", {}).items():
+            if isinstance(value, Prop):
+                object.__setattr__(obj, name, value.default)
+    for name, value in values.items():
+        object.__setattr__(obj, name, value)
+    return obj
+
+
+class Collection(list):
+    """CollectionProperty: список с add()/remove()."""
+
+    def __init__(self, item_type):
+        super().__init__()
+        self.item_type = item_type
+
+    def add(self):
+        item = make_instance(self.item_type)
+        self.append(item)
+        return item
+
+    def remove(self, index: int):
+        del self[index]
+
+
+class FakeBlender:
+    """Состояние поддельного Blender: каталоги, настройки, журнал вызовов."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.addons_dir = os.path.join(root, "scripts", "addons")
+        self.config_dir = os.path.join(root, "config")
+        os.makedirs(self.addons_dir, exist_ok=True)
+        self.calls: list[str] = []
+        self.enabled: dict[str, object] = {}
+        self.timers: dict = {}
+        self.bpy = None
+
+    # ---- preferences.* ----
+
+    def addon_enable(self, module: str):
+        self.calls.append("addon_enable")
+        importlib.invalidate_caches()
+        mod = importlib.import_module(module)
+        mod.register()
+        self.enabled[module] = types.SimpleNamespace(module=module)
+        return {'FINISHED'}
+
+    def addon_disable(self, module: str):
+        self.calls.append("addon_disable")
+        mod = sys.modules.get(module)
+        if mod is not None and module in self.enabled:
+            mod.unregister()
+        self.enabled.pop(module, None)
+        return {'FINISHED'}
+
+    def user_resource(self, resource_type: str, path: str = "", create: bool = False):
+        base = self.addons_dir if path == "addons" and resource_type == 'SCRIPTS' else None
+        if base is None:
+            base = os.path.join(self.config_dir if resource_type == 'CONFIG' else self.root, path)
+        if create:
+            os.makedirs(base, exist_ok=True)
+        return base
+
+
+def install(root: str) -> FakeBlender:
+    """Подменить bpy и addon_utils в sys.modules; вернуть состояние поддельного Blender."""
+    fake = FakeBlender(root)
+    if fake.addons_dir not in sys.path:
+        sys.path.insert(0, fake.addons_dir)
+
+    bpy = types.ModuleType("bpy")
+    props = types.ModuleType("bpy.props")
+    for kind in ("StringProperty", "BoolProperty", "IntProperty", "FloatProperty",
+                 "EnumProperty", "PointerProperty", "CollectionProperty"):
+        setattr(props, kind, (lambda kind: lambda **kw: Prop(kind, **kw))(kind))
+
+    bpy_types = types.ModuleType("bpy.types")
+
+    class Operator:
+        def report(self, level, message):
+            self.reports.append((next(iter(level)), message))
+
+    bpy_types.Operator = Operator
+    for name in ("Panel", "PropertyGroup", "UIList", "Menu", "AddonPreferences"):
+        setattr(bpy_types, name, type(name, (), {}))
+    bpy_types.Scene = type("Scene", (), {})
+    bpy_types.WindowManager = type("WindowManager", (), {})
+
+    app = types.ModuleType("bpy.app")
+    handlers = types.ModuleType("bpy.app.handlers")
+    handlers.persistent = lambda func: func
+    handlers.load_post = []
+    handlers.undo_post = []
+    handlers.redo_post = []
+    app.handlers = handlers
+    app.version = (4, 4, 0)
+    app.version_string = "4.4.0 (stand-in)"
+    app.timers = types.SimpleNamespace(
+        register=lambda func, first_interval=0.0, persistent=False: fake.timers.__setitem__(func, first_interval),
+        unregister=lambda func: fake.timers.pop(func, None),
+        is_registered=lambda func: func in fake.timers,
+    )
+
+    bpy.props = props
+    bpy.types = bpy_types
+    bpy.app = app
+    bpy.utils = types.SimpleNamespace(
+        register_class=lambda cls: None,
+        unregister_class=lambda cls: None,
+        user_resource=fake.user_resource,
+    )
+    bpy.path = types.SimpleNamespace(ensure_ext=lambda path, ext: path if path.endswith(ext) else path + ext)
+    bpy.data = types.SimpleNamespace(filepath="", is_dirty=False)
+
+    def save_mainfile():
+        fake.calls.append("save_mainfile")
+        return {'FINISHED'}
+
+    def console_clear(*args, **kwargs):
+        raise RuntimeError("Нет консоли в headless-режиме")
+
+    bpy.ops = types.SimpleNamespace(
+        preferences=types.SimpleNamespace(
+            addon_enable=fake.addon_enable,
+            addon_disable=fake.addon_disable,
+        ),
+        wm=types.SimpleNamespace(save_mainfile=save_mainfile),
+        console=types.SimpleNamespace(clear=console_clear),
+        dev=types.SimpleNamespace(),
+    )
+    bpy.context = types.SimpleNamespace(
+        window_manager=None,
+        window=None,
+        scene=None,
+        preferences=types.SimpleNamespace(addons=fake.enabled),
+    )
+
+    addon_utils = types.ModuleType("addon_utils")
+    addon_utils.modules_refresh = lambda: None
+
+    sys.modules.update({
+        "bpy": bpy,
+        "bpy.props": props,
+        "bpy.types": bpy_types,
+        "bpy.app": app,
+        "bpy.app.handlers": handlers,
+        "addon_utils": addon_utils,
+    })
+    fake.bpy = bpy
+    return fake
+
+
+def make_scene(toolkit):
+    """Сцена со свойствами Developer Toolkit (как после register())."""
+    scene = types.SimpleNamespace()
+    scene.as_pointer = lambda: id(scene)
+    scene.dev_toolkit_settings = make_instance(toolkit.AddonDevToolkitSettings)
+    scene.dev_toolkit_addons = Collection(toolkit.AddonItem)
+    scene.dev_toolkit_addon_index = 0
+    return scene
+
+
+def run_operator(op_class, context, **values):
+    """Выполнить execute() оператора; вернуть (результат, сообщения report)."""
+    op = make_instance(op_class, reports=[])
+    for name, value in values.items():
+        object.__setattr__(op, name, value)
+    result = op.execute(context)
+    return result, op.reports
+
+
+def bind_operators(toolkit, context):
+    """Сделать операторы тулкита доступными как bpy.ops.<категория>.<имя>."""
+    bpy = sys.modules["bpy"]
+    for cls in toolkit.classes:
+        idname = getattr(cls, "bl_idname", "")
+        if "." not in idname or not hasattr(cls, "execute"):
+            continue
+        category, name = idname.split(".", 1)
+        namespace = getattr(bpy.ops, category, None)
+        if namespace is None:
+            namespace = types.SimpleNamespace()
+            setattr(bpy.ops, category, namespace)
+        setattr(namespace, name,
+                (lambda cls: lambda **values: run_operator(cls, context, **values)[0])(cls))
@@ -0,0 +1,220 @@
+"""Бенчмарки Developer Toolkit без Blender.
+
+Генерирует синтетический аддон, подменяет bpy лёгкой заменой (fake_bpy) и
+замеряет validate_addon_path, create_zip (холодный и тёплый кэш),
+сборку архива в памяти (pack_archive), проверку компиляции в пуле процессов
+(compile_check), clean_addon_modules, полный DEV_OT_ReloadAddon.execute в режимах ZIP и
+ссылки, а также поиск аддонов в монорепозитории и поиск/фильтрацию в
+списке из --tracked аддонов. Результаты пишутся в JSON; при наличии базового файла медианы
+сравниваются с ним, и превышение порога считается регрессией (код выхода 1).
+
+Пример:
+    python benchmarks/run.py --files 400 --depth 4 --output bench.json
+    python benchmarks/run.py --baseline bench.json --threshold 0.15
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+import fake_bpy  # noqa: E402
+import synthetic  # noqa: E402
+
+ADDON_NAME = "dev_toolkit_bench_addon"
+
+
+def measure(func, repeat: int, setup=None, inner: int = 1) -> dict:
+    """Прогнать func repeat раз (setup перед каждым прогоном не замеряется)."""
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(inner):
+            func()
+        samples.append((time.perf_counter() - start) / inner)
+    return {
+        "runs": repeat,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+    }
+
+
+def purge_addon_modules():
+    for name in [n for n in sys.modules if n == ADDON_NAME or n.startswith(ADDON_NAME + ".")]:
+        del sys.modules[name]
+
+
+def run_benchmarks(args, root: str) -> dict:
+    fake = fake_bpy.install(os.path.join(root, "blender"))
+    import DeveloperToolkit as toolkit
+    from DeveloperToolkit import packaging, rollback, walker, workers
+
+    params = synthetic.TreeParams(args.files, args.depth, args.size, args.incompressible, args.seed)
+    addon_dir = synthetic.generate_addon(os.path.join(root, "src"), ADDON_NAME, params)
+
+    context = fake.bpy.context
+    context.scene = fake_bpy.make_scene(toolkit)
+    context.scene.dev_toolkit_settings.clear_console = False
+    fake_bpy.bind_operators(toolkit, context)
+    item = context.scene.dev_toolkit_addons.add()
+    item.name = ADDON_NAME
+    item.path = addon_dir
+
+    op = fake_bpy.make_instance(toolkit.DEV_OT_ReloadAddon, reports=[])
+    zip_path = os.path.join(root, "bench.zip")
+    results = {}
+
+    results["validate_addon_path"] = measure(
+        lambda: toolkit.validate_addon_path(addon_dir), args.repeat, inner=1000)
+
+    results["create_zip_cold"] = measure(
+        lambda: op.create_zip(addon_dir, ADDON_NAME, zip_path), args.repeat,
+        setup=lambda: packaging.drop_package_cache(ADDON_NAME))
+
+    op.create_zip(addon_dir, ADDON_NAME, zip_path)
+    touched = max(1, args.files // 50)
+    results["create_zip_warm"] = measure(
+        lambda: op.create_zip(addon_dir, ADDON_NAME, zip_path), args.repeat,
+        setup=lambda: synthetic.touch_files(addon_dir, touched, seed=time.perf_counter_ns()))
+
+    results["pack_archive_warm"] = measure(
+        lambda: toolkit.AddonReloader.pack_archive(addon_dir, ADDON_NAME).discard(), args.repeat,
+        setup=lambda: synthetic.touch_files(addon_dir, touched, seed=time.perf_counter_ns()))
+
+    # Без пула задания молча выполняются на месте, и замеры тихо деградируют: здесь это ошибка
+    rels = [rel for _, rel, _ in walker.iter_source(addon_dir) if rel.endswith(".py")]
+    jobs = [(addon_dir, rel) for rel in rels]
+    pooled = workers.run_in_pool(rollback._compile_file, jobs)
+    if pooled is None:
+        raise RuntimeError("Пул процессов не поднялся: compile_check и байткод выполнялись бы на месте")
+    if pooled != [rollback._compile_file(*job) for job in jobs]:
+        raise RuntimeError("Пул процессов вернул не те результаты, что выполнение на месте")
+    results["compile_check"] = measure(lambda: rollback.compile_check(addon_dir, rels), args.repeat)
+
+    def import_addon():
+        purge_addon_modules()
+        __import__(ADDON_NAME)
+
+    sys.path.insert(0, os.path.dirname(addon_dir))
+    results["clean_addon_modules"] = measure(
+        lambda: op.clean_addon_modules(ADDON_NAME), args.repeat, setup=import_addon)
+    sys.path.remove(os.path.dirname(addon_dir))
+    purge_addon_modules()
+
+    def reload():
+        result, reports = fake_bpy.run_operator(toolkit.DEV_OT_ReloadAddon, context, addon_index=0)
+        if result != {'FINISHED'}:
+            raise RuntimeError(f"Перезагрузка не удалась: {reports}")
+
+    item.install_mode = 'ZIP'
+    results["reload_execute_zip"] = measure(reload, args.repeat)
+    item.install_mode = 'LINK'
+    results["reload_execute_link"] = measure(reload, args.repeat)
+
+    workspace = os.path.join(root, "workspace")
+    synthetic.generate_workspace(workspace, args.tracked)
+    results["discover_addons"] = measure(
+        lambda: toolkit.discovery.find_addons(workspace), args.repeat)
+    result, reports = fake_bpy.run_operator(toolkit.DEV_OT_DiscoverAddons, context, directory=workspace)
+    if result != {'FINISHED'}:
+        raise RuntimeError(f"Поиск аддонов не удался: {reports}")
+
+    names = [addon.name for addon in context.scene.dev_toolkit_addons]
+    results["find_addon_item"] = measure(
+        lambda: [toolkit.find_addon_item(context, name) for name in names], args.repeat)
+    ui_list = fake_bpy.make_instance(toolkit.DEV_UL_AddonsList, filter_name="addon_1",
+                                     bitflag_filter_item=1 << 30, use_filter_sort_alpha=True)
+    results["ui_filter_items"] = measure(
+        lambda: ui_list.filter_items(context, context.scene, "dev_toolkit_addons"), args.repeat,
+        setup=toolkit.invalidate_addon_index)
+
+    return {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "machine": platform.node(),
+            "platform": platform.platform(),
+            "python": sys.version.split()[0],
+            "cpu_count": os.cpu_count(),
+        },
+        "params": {**vars(params), "tracked": args.tracked},
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Сравнить медианы с базой; вернуть список регрессий и напечатать таблицу."""
+    regressions = []
+    base_results = baseline.get("results", {})
+    print(f"{'бенчмарк':<24}{'медиана, мс':>14}{'база, мс':>12}{'изменение':>12}")
+    for name, stats in current["results"].items():
+        median = stats["median"] * 1000
+        base = base_results.get(name)
+        if base is None:
+            print(f"{name:<24}{median:>14.3f}{'—':>12}{'':>12}")
+            continue
+        base_median = base["median"] * 1000
+        change = median / base_median - 1 if base_median else 0.0
+        mark = ""
+        if change > threshold:
+            mark = "  РЕГРЕССИЯ"
+            regressions.append(name)
+        print(f"{name:<24}{median:>14.3f}{base_median:>12.3f}{change:>+11.1%}{mark}")
+    if base_results and current.get("params") != baseline.get("params"):
+        print("Внимание: параметры дерева отличаются от базовых, сравнение неточное.")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200, help="число файлов в аддоне")
+    parser.add_argument("--depth", type=int, default=3, help="глубина вложенных пакетов")
+    parser.add_argument("--size", type=int, default=4096, help="размер файла, байт")
+    parser.add_argument("--incompressible", type=float, default=0.1, help="доля несжимаемых файлов")
+    parser.add_argument("--tracked", type=int, default=500, help="число аддонов в монорепозитории")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5, help="число прогонов каждого бенчмарка")
+    parser.add_argument("--output", help="куда записать результаты (JSON)")
+    parser.add_argument("--baseline", help="базовые результаты для сравнения (JSON)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="допустимый рост медианы относительно базы (0.2 = 20%%)")
+    parser.add_argument("--keep", action="store_true", help="не удалять временный каталог")
+    args = parser.parse_args(argv)
+
+    root = tempfile.mkdtemp(prefix="dev_toolkit_bench_")
+    try:
+        current = run_benchmarks(args, root)
+    finally:
+        if args.keep:
+            print(f"Временные файлы: {root}")
+        else:
+            shutil.rmtree(root, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=1)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"Регрессии: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Генератор синтетических деревьев аддонов для бенчмарков."""
+
+import os
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class TreeParams:
+    """Параметры синтетического аддона."""
+    files: int = 200
+    depth: int = 3
+    file_size: int = 4096
+    incompressible: float = 0.1
+    seed: int = 0
+
+
+_BODY = '''
+
+def func_{n}(value, scale=1.0):
+    """Synthetic function {n}."""
+    total = 0
+    for i in range(int(value)):
+        total += (i * {n}) % 7
+    return total * scale
+'''
+
+
+def _python_source(n: int, size: int) -> str:
+    text = ""
+    k = 0
+    while len(text) < size:
+        text += _BODY.format(n=n * 1000 + k)
+        k += 1
+    return text
+
+
+def generate_addon(root: str, name: str, params: TreeParams) -> str:
+    """Создать пакет аддона name в root и вернуть путь к нему.
+
+    Файлы раскладываются по вложенным пакетам глубиной до params.depth;
+    каждый пакет импортирует свои модули и подпакеты, так что включение
+    аддона импортирует всё дерево. Доля params.incompressible файлов —
+    случайные бинарные данные (.bin), остальные — модули Python.
+    """
+    rng = random.Random(params.seed)
+    addon_dir = os.path.join(root, name)
+    packages = [""]
+    for level in range(1, params.depth):
+        packages.append("/".join(f"pkg{i}" for i in range(1, level + 1)))
+
+    modules: dict[str, list[str]] = {pkg: [] for pkg in packages}
+    binaries = int(params.files * params.incompressible)
+    for n in range(params.files - binaries):
+        modules[packages[n % len(packages)]].append(f"mod_{n}")
+
+    for index, pkg in enumerate(packages):
+        pkg_dir = os.path.join(addon_dir, pkg) if pkg else addon_dir
+        os.makedirs(pkg_dir, exist_ok=True)
+        children = list(modules[pkg])
+        if index + 1 < len(packages):
+            children.append(packages[index + 1].rsplit("/", 1)[-1])
+        init = "".join(f"from . import {child}\n" for child in children)
+        if not pkg:
+            init = "bl_info = {'name': %r, 'version': (1, 0, 0), 'blender': (4, 4, 0)}\n" % name + init
+            init += "\nREGISTERED = []\n\n\ndef register():\n    REGISTERED.append(1)\n\n\ndef unregister():\n    REGISTERED.clear()\n"
+        with open(os.path.join(pkg_dir, "__init__.py"), "w", encoding="utf-8") as f:
+            f.write(init)
+        for n, module in enumerate(modules[pkg]):
+            with open(os.path.join(pkg_dir, module + ".py"), "w", encoding="utf-8") as f:
+                f.write(_python_source(index * 10000 + n, params.file_size))
+
+    data_dir = os.path.join(addon_dir, "data")
+    os.makedirs(data_dir, exist_ok=True)
+    for n in range(binaries):
+        with open(os.path.join(data_dir, f"blob_{n}.bin"), "wb") as f:
+            f.write(rng.randbytes(params.file_size))
+    return addon_dir
+
+
+def generate_workspace(root: str, count: int, group_size: int = 25) -> list[str]:
+    """Создать монорепозиторий из count минимальных аддонов, разложенных по группам."""
+    paths = []
+    for n in range(count):
+        addon_dir = os.path.join(root, f"group_{n // group_size}", f"ws_addon_{n}")
+        os.makedirs(addon_dir, exist_ok=True)
+        with open(os.path.join(addon_dir, "__init__.py"), "w", encoding="utf-8") as f:
+            f.write("bl_info = {'name': 'ws_addon_%d', 'blender': (4, 4, 0)}\n\n\n"
+                    "def register():\n    pass\n\n\ndef unregister():\n    pass\n" % n)
+        paths.append(addon_dir)
+    return paths
+
+
+def touch_files(addon_dir: str, count: int, seed: int = 0) -> list[str]:
+    """Изменить содержимое count модулей аддона (для тёплых прогонов)."""
+    rng = random.Random(seed)
+    candidates = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _, names in os.walk(addon_dir)
+        for name in names if name.startswith("mod_") and name.endswith(".py")
+    )
+    chosen = rng.sample(candidates, min(count, len(candidates)))
+    for path in chosen:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"\nTOUCHED_{rng.randrange(1 << 30)} = True\n")
+    return chosen
@@ -0,0 +1,64 @@
+"""Порядок перезагрузки пакета: зависимости между аддонами по их импортам."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from DeveloperToolkit import addon_graph
+
+
+class ReloadOrderTest(unittest.TestCase):
+    def test_dependencies_first(self):
+        graph = {"app": {"core", "ui"}, "ui": {"core"}, "core": set()}
+        self.assertEqual(addon_graph.reload_order(graph, ["app", "ui", "core"]), ["core", "ui", "app"])
+
+    def test_independent_addons_keep_requested_order(self):
+        graph = {"b": set(), "a": set(), "c": set()}
+        self.assertEqual(addon_graph.reload_order(graph, ["b", "c", "a", "b"]), ["b", "c", "a"])
+
+    def test_unselected_dependencies_are_ignored(self):
+        graph = {"app": {"core"}, "core": set()}
+        self.assertEqual(addon_graph.reload_order(graph, ["app"]), ["app"])
+
+    def test_cycle_goes_last_in_requested_order(self):
+        graph = {"x": {"y"}, "y": {"x"}, "base": set(), "top": {"base"}}
+        self.assertEqual(addon_graph.reload_order(graph, ["y", "top", "x", "base"]), ["base", "top", "y", "x"])
+
+    def test_downstream_is_transitive(self):
+        graph = {"app": {"ui"}, "ui": {"core"}, "core": set(), "other": set()}
+        self.assertEqual(addon_graph.downstream(graph, ["core"]), {"core", "ui", "app"})
+        self.assertEqual(addon_graph.downstream(graph, ["other"]), {"other"})
+
+
+class BuildAddonGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def addon(self, name: str, files: dict, patterns=()) -> tuple:
+        for rel, text in files.items():
+            path = os.path.join(self.root, name, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return os.path.join(self.root, name), list(patterns)
+
+    def test_imports_of_tracked_addons(self):
+        addons = {
+            "core": self.addon("core", {"__init__.py": "import os\nfrom . import util\n"}),
+            "ui": self.addon("ui", {"__init__.py": "import core.util\n", "panel.py": "import ui\n"}),
+            "app": self.addon("app", {
+                "__init__.py": "from ui import panel\n",
+                "lazy.py": "def f():\n    import core\n",
+                "broken.py": "import (\n",
+                "vendor/skip.py": "import other\n",
+            }, patterns=["vendor/"]),
+        }
+        graph = addon_graph.build_addon_graph(addons)
+        self.assertEqual(graph, {"core": set(), "ui": {"core"}, "app": {"ui", "core"}})
+        self.assertEqual(addon_graph.reload_order(graph, ["app", "core", "ui"]), ["core", "ui", "app"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+""".pyc в архиве: проверка по хэшу исходника и гонка с сохранением файла."""
+
+import importlib.util
+import marshal
+import os
+import py_compile
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from DeveloperToolkit import bytecode, packaging
+
+SOURCE = "# -*- coding: utf-8 -*-\nTEXT = 'привет'\n\ndef f():\n    return TEXT\n"
+
+
+@unittest.skipUnless(bytecode.is_supported(), "интерпретатор без кэша байткода")
+class BytecodeCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.src = os.path.join(self.root, "mod.py")
+        self.write(SOURCE)
+        self.cache = bytecode.BytecodeCache(os.path.join(self.root, "cache"))
+
+    def write(self, text: str):
+        with open(self.src, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def records(self, digest: str) -> list:
+        return self.cache.records("demo", [("mod.py", self.src, SimpleNamespace(digest=digest))],
+                                  packaging.DEFAULT_LEVEL)
+
+    def test_matches_py_compile(self):
+        target = os.path.join(self.root, "ours.pyc")
+        reference = os.path.join(self.root, "reference.pyc")
+        self.assertTrue(bytecode._compile(self.src, target, "demo/mod.py", packaging.file_digest(self.src)))
+        py_compile.compile(self.src, cfile=reference, dfile="demo/mod.py", doraise=True,
+                           invalidation_mode=py_compile.PycInvalidationMode.CHECKED_HASH)
+        with open(target, "rb") as a, open(reference, "rb") as b:
+            self.assertEqual(a.read(), b.read())
+
+    def test_records_hold_checked_hash_pyc(self):
+        records = self.records(packaging.file_digest(self.src))
+        self.assertEqual([name for name, _ in records], [f"demo/{bytecode.pyc_name('mod.py')}"])
+        with open(self.cache.path(packaging.file_digest(self.src)), "rb") as f:
+            pyc = f.read()
+        with open(self.src, "rb") as f:
+            self.assertEqual(pyc[8:16], importlib.util.source_hash(f.read()))
+        namespace = {}
+        exec(marshal.loads(pyc[16:]), namespace)
+        self.assertEqual(namespace["f"](), "привет")
+
+    def test_file_saved_after_packaging_gets_no_pyc(self):
+        # Хэш снят с прежней версии, а к компиляции файл уже другой
+        stale = packaging.file_digest(self.src)
+        self.write(SOURCE + "EXTRA = 1\n")
+        self.assertEqual(self.records(stale), [])
+        self.assertEqual(os.listdir(self.cache.directory), [])
+        self.assertEqual(self.cache.stats()["compiled"], 0)
+
+    def test_syntax_error_is_skipped(self):
+        self.write("def (:\n")
+        self.assertEqual(self.records(packaging.file_digest(self.src)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
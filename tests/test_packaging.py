@@ -0,0 +1,135 @@
+"""Упаковка: ZIP из кэша сжатых записей и воспроизводимые релизные архивы.
+
+Запуск из корня репозитория: python -m unittest discover -s tests
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from DeveloperToolkit import packaging, release
+
+
+def write_files(root: str, files: dict):
+    for rel, data in files.items():
+        path = os.path.join(root, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+SOURCES = {
+    "__init__.py": b"bl_info = {'name': 'Demo'}\n" + b"X = 1\n" * 200,
+    "ops/__init__.py": b"",
+    "ops/run.py": "# -*- coding: utf-8 -*-\nTEXT = 'привет'\n".encode("utf-8"),
+    "icons/logo.png": bytes(range(256)) * 8,
+}
+
+
+class ZipRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.src = os.path.join(self.root, "demo")
+        write_files(self.src, SOURCES)
+
+    def pack(self, cache):
+        buffer = io.BytesIO()
+        packaging.write_zip(buffer, packaging.collect_records(self.src, "demo", cache))
+        return buffer.getvalue()
+
+    def test_round_trip(self):
+        data = self.pack(packaging.PackageCache(budget=packaging.CacheBudget()))
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual(sorted(zf.namelist()), sorted(f"demo/{rel}" for rel in SOURCES))
+            for rel, raw in SOURCES.items():
+                self.assertEqual(zf.read(f"demo/{rel}"), raw)
+            self.assertEqual(zf.getinfo("demo/icons/logo.png").compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.getinfo("demo/__init__.py").compress_type, zipfile.ZIP_DEFLATED)
+
+    def test_warm_cache_gives_same_archive(self):
+        cache = packaging.PackageCache(budget=packaging.CacheBudget())
+        cold = self.pack(cache)
+        warm = self.pack(cache)
+        self.assertEqual(cold, warm)
+        self.assertEqual(cache.stats()["misses"], len(SOURCES))
+        self.assertEqual(cache.stats()["hits"], len(SOURCES))
+
+    def test_changed_file_is_recompressed(self):
+        cache = packaging.PackageCache(budget=packaging.CacheBudget())
+        self.pack(cache)
+        write_files(self.src, {"ops/run.py": b"TEXT = 'changed'\n"})
+        data = self.pack(cache)
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            self.assertEqual(zf.read("demo/ops/run.py"), b"TEXT = 'changed'\n")
+        self.assertEqual(cache.stats()["misses"], len(SOURCES) + 1)
+
+    def test_entries_restored_from_disk(self):
+        directory = os.path.join(self.root, "cache")
+        first = self.pack(packaging.PackageCache(budget=packaging.CacheBudget(), directory=directory))
+        # Новый кэш с тем же каталогом — как после перезапуска Blender
+        cache = packaging.PackageCache(budget=packaging.CacheBudget(), directory=directory)
+        self.assertEqual(self.pack(cache), first)
+        self.assertEqual(cache.stats()["restored"], len(SOURCES))
+        self.assertEqual(cache.stats()["misses"], 0)
+
+        os.remove(os.path.join(self.src, "icons", "logo.png"))
+        self.pack(cache)
+        self.assertEqual(len(os.listdir(directory)), len(SOURCES) - 1)
+
+    def test_budget_evicts_across_caches(self):
+        budget = packaging.CacheBudget(max_bytes=1)
+        first = packaging.PackageCache(budget=budget)
+        second = packaging.PackageCache(budget=budget)
+        self.pack(first)
+        self.pack(second)
+        self.assertLessEqual(budget.total_bytes, max(len(e.data) for e in second._entries.values()))
+        self.assertGreater(first.stats()["evictions"], 0)
+
+
+class ReleaseBuildTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.src = os.path.join(self.root, "demo")
+        write_files(self.src, SOURCES)
+
+    def build(self, output: str, **options) -> release.BuildResult:
+        return release.build_addon(release.BuildJob("demo", self.src, os.path.join(self.root, output), **options))
+
+    def read(self, result: release.BuildResult) -> bytes:
+        with open(result.archive, "rb") as f:
+            return f.read()
+
+    def test_builds_are_byte_identical(self):
+        first = self.build("a")
+        # Другое время изменения файлов не должно влиять на архив
+        for rel in SOURCES:
+            os.utime(os.path.join(self.src, *rel.split("/")), (1_000_000_000, 1_000_000_000))
+        second = self.build("b")
+        self.assertEqual((first.status, second.status), (release.BUILT, release.BUILT))
+        self.assertEqual(self.read(first), self.read(second))
+        self.assertEqual(release.archive_hash(first.archive), first.content_hash)
+        with zipfile.ZipFile(first.archive) as zf:
+            self.assertIsNone(zf.testzip())
+            self.assertEqual({info.date_time for info in zf.infolist()}, {release.DEFAULT_DATE_TIME})
+
+    def test_unchanged_addon_is_skipped(self):
+        self.assertEqual(self.build("dist").status, release.BUILT)
+        self.assertEqual(self.build("dist").status, release.SKIPPED)
+        self.assertEqual(self.build("dist", force=True).status, release.BUILT)
+
+    def test_edit_changes_content_hash(self):
+        first = self.build("dist")
+        write_files(self.src, {"ops/run.py": b"TEXT = 'changed'\n"})
+        second = self.build("dist")
+        self.assertEqual(second.status, release.BUILT)
+        self.assertNotEqual(first.content_hash, second.content_hash)
+
+
+if __name__ == "__main__":
+    unittest.main()
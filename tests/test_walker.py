@@ -0,0 +1,112 @@
+"""Отбор файлов аддона: правила .gitignore, .devtoolkitignore и шаблоны аддона."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from DeveloperToolkit import walker
+
+
+def rules(*lines) -> walker.IgnoreRules:
+    result = walker.IgnoreRules()
+    result.add_patterns(lines)
+    return result
+
+
+class IgnoreRulesTest(unittest.TestCase):
+    def test_unanchored_pattern_matches_at_any_depth(self):
+        r = rules("*.log")
+        self.assertTrue(r.match("debug.log", False))
+        self.assertTrue(r.match("a/b/debug.log", False))
+        self.assertFalse(r.match("debug.log.txt", False))
+
+    def test_anchored_pattern_matches_from_root_only(self):
+        r = rules("/notes.txt", "docs/*.md")
+        self.assertTrue(r.match("notes.txt", False))
+        self.assertFalse(r.match("sub/notes.txt", False))
+        self.assertTrue(r.match("docs/index.md", False))
+        self.assertFalse(r.match("docs/api/index.md", False))
+
+    def test_directory_only_pattern(self):
+        r = rules("build/")
+        self.assertTrue(r.match("build", True))
+        self.assertTrue(r.match("pkg/build", True))
+        self.assertFalse(r.match("build", False))
+
+    def test_double_star(self):
+        r = rules("**/generated", "assets/**/*.blend1")
+        self.assertTrue(r.match("generated", True))
+        self.assertTrue(r.match("a/b/generated", True))
+        self.assertTrue(r.match("assets/x/y/scene.blend1", False))
+        self.assertFalse(r.match("scene.blend1", False))
+
+    def test_last_match_wins(self):
+        r = rules("*.log", "!keep.log")
+        self.assertTrue(r.match("other.log", False))
+        self.assertFalse(r.match("keep.log", False))
+        self.assertTrue(rules("!keep.log", "*.log").match("keep.log", False))
+
+    def test_character_class_and_escape(self):
+        r = rules("file[0-9].py", "[!a]*.tmp2", r"\#literal")
+        self.assertTrue(r.match("file3.py", False))
+        self.assertFalse(r.match("filex.py", False))
+        self.assertTrue(r.match("b.tmp2", False))
+        self.assertFalse(r.match("a.tmp2", False))
+        self.assertTrue(r.match("#literal", False))
+
+    def test_comments_and_blank_lines(self):
+        r = rules("# *.py", "", "   ")
+        self.assertFalse(r.match("main.py", False))
+
+    def test_base_limits_nested_rules(self):
+        r = walker.IgnoreRules()
+        r.add_patterns(["*.dat"], base="sub")
+        self.assertTrue(r.match("sub/x.dat", False))
+        self.assertFalse(r.match("x.dat", False))
+
+    def test_split_patterns(self):
+        self.assertEqual(walker.split_patterns(" *.log, build/ ,,tmp "), ["*.log", "build/", "tmp"])
+        self.assertEqual(walker.split_patterns(""), [])
+
+
+class IterSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def write(self, rel: str, data: str = ""):
+        path = os.path.join(self.root, *rel.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(data)
+
+    def rels(self, patterns=()) -> list[str]:
+        return [rel for _, rel, _ in walker.iter_source(self.root, patterns)]
+
+    def test_rules_from_all_sources(self):
+        self.write("__init__.py")
+        self.write(".gitignore", "*.log\nbuild/\n")
+        self.write(walker.IGNORE_FILE, "secret.txt\n")
+        self.write("a.log")
+        self.write("secret.txt")
+        self.write("build/out.py")
+        self.write("pkg/.gitignore", "local.py\n")
+        self.write("pkg/local.py")
+        self.write("pkg/mod.py")
+        self.write("local.py")
+        self.write("data/big.bin")
+        self.write("__pycache__/x.pyc")
+        self.write(".git/HEAD")
+        self.assertEqual(self.rels(["data/"]),
+                         [".gitignore", "__init__.py", "local.py", "pkg/.gitignore", "pkg/mod.py"])
+
+    def test_order_is_stable(self):
+        # Файлы каталога идут раньше его подкаталогов, те и другие — по имени
+        for rel in ("b.py", "a/z.py", "a/b.py", "c/d/e.py"):
+            self.write(rel)
+        self.assertEqual(self.rels(), ["b.py", "a/b.py", "a/z.py", "c/d/e.py"])
+
+
+if __name__ == "__main__":
+    unittest.main()